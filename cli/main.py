@@ -7,6 +7,7 @@ Commands:
     preview     Quick render and open
     watch       Watch script and re-render on changes
     from-spec   Render from YAML specification
+    validate-layouts  Check page layouts from JSONL in parallel
     templates   List and show available templates
 """
 
@@ -14,6 +15,7 @@ import os
 import platform
 import subprocess
 import sys
+import warnings
 from pathlib import Path
 from typing import Optional
 
@@ -505,13 +507,20 @@ def from_spec(
     spec_file: Path = typer.Argument(..., help="YAML spec file"),
     output: Optional[Path] = typer.Option(None, "--output", "-o", help="Output path"),
     open_file: bool = typer.Option(False, "--open", help="Open after rendering"),
+    validate: bool = typer.Option(True, "--validate/--no-validate", help="Check layout while rendering"),
+    strict: bool = typer.Option(False, "--strict", help="Fail on layout issues instead of warning"),
+    font_index: bool = typer.Option(False, "--font-index", help="Resolve font names through the cached font index"),
 ):
     """
     Render from YAML specification file.
 
+    Layout issues (elements off the page or overlapping on a layer) are
+    printed as warnings; --strict makes them fail the render.
+
     Example:
         drawbot from-spec poster.yaml
         drawbot from-spec poster.yaml --output my_poster.pdf --open
+        drawbot from-spec poster.yaml --strict
     """
     try:
         from .spec import render_from_spec
@@ -528,7 +537,13 @@ def from_spec(
     console.print(f"[blue]Rendering spec:[/blue] {spec_file.name}")
 
     try:
-        out_path = render_from_spec(spec_file, output)
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            out_path = render_from_spec(
+                spec_file, output, validate=validate, strict=strict, font_index=font_index
+            )
+        for warning in caught:
+            console.print(f"[yellow]Warning:[/yellow] {warning.message}")
         console.print(f"[green]Saved:[/green] {out_path}")
 
         if open_file:
@@ -539,5 +554,69 @@ def from_spec(
         raise typer.Exit(1)
 
 
+@app.command("validate-layouts")
+def validate_layouts_cmd(
+    pages_file: Path = typer.Argument(..., help="JSONL file of page element lists ('-' for stdin)"),
+    report: Optional[Path] = typer.Option(None, "--report", "-r", help="Write JSONL report here (default: stdout)"),
+    workers: Optional[int] = typer.Option(None, "--workers", "-j", help="Worker processes (default: CPU count)"),
+    page_height: Optional[float] = typer.Option(None, "--page-height", help="Default page height"),
+    page_width: Optional[float] = typer.Option(None, "--page-width", help="Default page width"),
+    chunksize: int = typer.Option(64, "--chunksize", help="Pages per worker task"),
+):
+    """
+    Validate page layouts in bulk.
+
+    Each line is a page: a list of elements, or an object with "elements"
+    and optional "page", "page_height" and "page_width". Writes one compact
+    JSON result per page (fits, issues, per-page ms) followed by a summary
+    line, and exits with status 1 if any page fails.
+
+    Example:
+        drawbot validate-layouts pages.jsonl --page-height 792 --page-width 612
+        drawbot validate-layouts pages.jsonl -r report.jsonl -j 8
+    """
+    import json
+    import time
+
+    sys.path.insert(0, str(LIB_DIR))
+    from drawbot_design_system import validate_layouts
+
+    if str(pages_file) != "-" and not pages_file.exists():
+        console.print(f"[red]Error:[/red] Pages file not found: {pages_file}")
+        raise typer.Exit(1)
+
+    status = Console(stderr=True) if report is None else console
+    source = sys.stdin if str(pages_file) == "-" else pages_file.open()
+    out = sys.stdout if report is None else report.open("w")
+
+    pages = failed = 0
+    page_ms = 0.0
+    start = time.perf_counter()
+    try:
+        lines = (line for line in source if line.strip())
+        for result in validate_layouts(lines, page_height, page_width, workers, chunksize):
+            pages += 1
+            failed += not result["fits"]
+            page_ms += result["ms"]
+            out.write(json.dumps(result, separators=(",", ":")) + "\n")
+
+        wall_ms = (time.perf_counter() - start) * 1000
+        summary = {"pages": pages, "failed": failed, "page_ms": round(page_ms, 3), "wall_ms": round(wall_ms, 3)}
+        out.write(json.dumps({"summary": summary}, separators=(",", ":")) + "\n")
+    except Exception as e:
+        status.print(f"[red]Error:[/red] {e}")
+        raise typer.Exit(1)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+
+    color = "red" if failed else "green"
+    status.print(f"[{color}]{failed} of {pages} pages failed[/{color}] ({wall_ms:.0f} ms)")
+    if failed:
+        raise typer.Exit(1)
+
+
 if __name__ == "__main__":
     app()
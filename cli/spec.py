@@ -27,6 +27,7 @@ Allows declarative poster definitions:
 
 import re
 import sys
+import warnings
 from pathlib import Path
 from typing import Any, Dict, List, Literal, Optional, Tuple, Union
 
@@ -198,6 +199,32 @@ def interpolate_variables(text: str, variables: Dict[str, Any]) -> str:
     return re.sub(r"\$\{([^}]+)\}", replacer, text)
 
 
+# -----------------------------------------------------------------------------
+# Font Resolution
+# -----------------------------------------------------------------------------
+
+
+def resolve_font(name: str) -> str:
+    """
+    Resolve a font name to a file path through the persistent font index.
+
+    Falls back to the name itself (resolved by DrawBot) when the font isn't
+    indexed or is a later face of a collection, which a path can't select.
+    Used by render_from_spec(font_index=True) only: the first use scans the
+    font directories, and a name shared by several files resolves to the
+    first by path, which may differ from DrawBot's choice.
+    """
+    from drawbot_design_system import get_font_index
+
+    try:
+        record = get_font_index().lookup(name)
+    except Exception:
+        return name
+    if record is None or record.font_number != 0:
+        return name
+    return record.path
+
+
 # -----------------------------------------------------------------------------
 # Spec Loader
 # -----------------------------------------------------------------------------
@@ -232,14 +259,27 @@ def render_from_spec(
     spec_path: Path,
     output_path: Optional[Path] = None,
     overrides: Optional[Dict[str, Any]] = None,
+    validate: bool = True,
+    strict: bool = False,
+    font_index: bool = False,
 ) -> Path:
     """
     Render a poster from YAML specification.
 
+    Elements are checked as they are placed (see LayoutTracker): an element
+    that leaves the page or overlaps another on its layer issues a warning,
+    or with strict=True stops the render with LayoutError before anything
+    is saved. Elements may set `name` (for messages) and `layer` (null to
+    skip overlap checks).
+
     Args:
         spec_path: Path to YAML spec file
         output_path: Optional output path override
         overrides: Optional variable overrides (--set key=value)
+        validate: Check layout while rendering
+        strict: Raise LayoutError on layout issues instead of warning
+        font_index: Resolve font names through the persistent font index
+            (see resolve_font) instead of leaving them to DrawBot
 
     Returns:
         Path to rendered file
@@ -248,14 +288,16 @@ def render_from_spec(
 
     from drawbot_design_system import (
         BOOK_SCALE,
+        DEFAULT_LAYERS,
         MAGAZINE_SCALE,
         POSTER_SCALE,
         REPORT_SCALE,
+        LayoutTracker,
         draw_wrapped_text,
         get_output_path,
         setup_poster_page,
     )
-    from drawbot_grid import Grid
+    from drawbot_grid import FrozenGrid
 
     spec = load_spec(spec_path, overrides)
 
@@ -285,15 +327,24 @@ def render_from_spec(
     if spec.page.margins != 72:
         MARGIN = spec.page.margins
 
-    # Setup grid
-    grid = Grid.from_margins(
+    # Setup grid (frozen: every element looks up positions and spans)
+    grid = FrozenGrid.from_margins(
         (-MARGIN, -MARGIN, -MARGIN, -MARGIN),
         column_subdivisions=spec.grid.columns,
         row_subdivisions=spec.grid.rows,
     )
 
+    tracker = LayoutTracker(WIDTH, HEIGHT, strict=strict) if validate else None
+
+    def track(kind, x, y, w, h):
+        if tracker is not None:
+            name = elem_data.get("name") or f"{kind} #{index}"
+            layer = elem_data.get("layer", DEFAULT_LAYERS.get(kind, "content"))
+            for issue in tracker.place(kind, x, y, w, h, name=name, layer=layer):
+                warnings.warn(issue, stacklevel=2)
+
     # Render elements
-    for elem_data in spec.elements:
+    for index, elem_data in enumerate(spec.elements):
         elem_type = elem_data.get("type")
 
         if elem_type == "rect":
@@ -301,6 +352,7 @@ def render_from_spec(
             col, row, col_span, row_span = elem.grid
             x, y = grid[(col, row)]
             w, h = grid * (col_span, row_span)
+            track("rect", x, y, w, h)
 
             if elem.fill:
                 db.fill(*parse_color(elem.fill))
@@ -323,6 +375,7 @@ def render_from_spec(
             col, row, col_span, row_span = elem.grid
             x, y = grid[(col, row)]
             w, h = grid * (col_span, row_span)
+            track("oval", x, y, w, h)
 
             if elem.fill:
                 db.fill(*parse_color(elem.fill))
@@ -356,28 +409,34 @@ def render_from_spec(
                 if elem.style in ("title", "h1", "h2", "h3")
                 else spec.typography.body_font
             )
+            if font_index:
+                font = resolve_font(font)
             size = elem.size or style_sizes.get(elem.style, scale.body)
 
             db.font(font)
             db.fontSize(size)
 
             if elem.wrap:
+                track("text", x, y, w, h)
                 draw_wrapped_text(content, x, y + h, w, h, font, size)
             else:
                 # Simple text placement
+                text_w, _ = db.textSize(content)
                 if elem.align == "center":
-                    text_w, _ = db.textSize(content)
                     x = x + (w - text_w) / 2
                 elif elem.align == "right":
-                    text_w, _ = db.textSize(content)
                     x = x + w - text_w
 
+                # Checked as the row box, narrowed to the measured width
+                track("text", x, y, text_w, h)
+
                 db.text(content, (x, y + h - size))
 
         elif elem_type == "line":
             elem = LineElement(**elem_data)
             x1, y1 = grid[(elem.start[0], elem.start[1])]
             x2, y2 = grid[(elem.end[0], elem.end[1])]
+            track("line", min(x1, x2), min(y1, y2), abs(x2 - x1), abs(y2 - y1))
 
             db.stroke(*parse_color(elem.stroke))
             db.strokeWidth(elem.stroke_width)
@@ -395,6 +454,7 @@ def render_from_spec(
                 img_path = spec_path.parent / img_path
 
             if img_path.exists():
+                track("image", x, y, w, h)
                 with db.savedState():
                     if elem.opacity < 1.0:
                         db.opacity(elem.opacity)
@@ -20,6 +20,9 @@ from .drawbot_design_system import (
     BOOK_SCALE,
     REPORT_SCALE,
     create_typography_scale,
+    ScaleTable,
+    SCALE_STEPS,
+    NAMED_SCALES,
     # Scale ratios
     MINOR_SECOND,
     MAJOR_SECOND,
@@ -32,16 +35,51 @@ from .drawbot_design_system import (
     get_text_metrics,
     wrap_text_to_width,
     draw_wrapped_text,
+    WrappedText,
+    Hyphenator,
+    clear_font_caches,
+    wrap_many,
+    IncrementalWrapper,
+    fit_text_to_box,
+    TextFlow,
+    FlowPage,
+    # Measurement backends
+    DrawBotBackend,
+    FontToolsBackend,
+    HarfBuzzBackend,
+    set_measurement_backend,
+    get_measurement_backend,
+    # Font index
+    FontIndex,
+    FontRecord,
+    get_font_index,
     # Layout
     validate_layout_fit,
+    find_layout_issues,
+    find_overlaps,
+    LayoutTracker,
+    LayoutError,
+    validate_layouts,
     setup_poster_page,
     # Helpers
     get_spacing_for_context,
     get_color_palette,
+    # Color harmony
+    generate_color_palette,
+    generate_color_palettes,
+    check_contrast_ratio,
+    contrast_matrix,
+    find_accessible_pairs,
+    # Text outlines
+    outline_text,
+    draw_outlined_text,
+    OutlinedText,
 )
 
 from .drawbot_grid import (
     Grid,
+    FrozenGrid,
+    GridArea,
     ColumnGrid,
     RowGrid,
     BaselineGrid,
@@ -52,12 +90,21 @@ __all__ = [
     # Design system
     'REPO_ROOT', 'OUTPUT_DIR', 'get_output_path',
     'TypographyScale', 'POSTER_SCALE', 'MAGAZINE_SCALE', 'BOOK_SCALE', 'REPORT_SCALE',
-    'create_typography_scale',
+    'create_typography_scale', 'ScaleTable', 'SCALE_STEPS', 'NAMED_SCALES',
     'MINOR_SECOND', 'MAJOR_SECOND', 'MINOR_THIRD', 'MAJOR_THIRD',
     'PERFECT_FOURTH', 'PERFECT_FIFTH', 'GOLDEN_RATIO',
-    'get_text_metrics', 'wrap_text_to_width', 'draw_wrapped_text',
-    'validate_layout_fit', 'setup_poster_page',
+    'get_text_metrics', 'wrap_text_to_width', 'draw_wrapped_text', 'WrappedText', 'Hyphenator',
+    'clear_font_caches', 'wrap_many', 'IncrementalWrapper', 'fit_text_to_box',
+    'TextFlow', 'FlowPage',
+    'DrawBotBackend', 'FontToolsBackend', 'HarfBuzzBackend',
+    'set_measurement_backend', 'get_measurement_backend',
+    'FontIndex', 'FontRecord', 'get_font_index',
+    'validate_layout_fit', 'find_layout_issues', 'find_overlaps',
+    'LayoutTracker', 'LayoutError', 'validate_layouts', 'setup_poster_page',
     'get_spacing_for_context', 'get_color_palette',
+    'generate_color_palette', 'generate_color_palettes',
+    'check_contrast_ratio', 'contrast_matrix', 'find_accessible_pairs',
+    'outline_text', 'draw_outlined_text', 'OutlinedText',
     # Grid
-    'Grid', 'ColumnGrid', 'RowGrid', 'BaselineGrid', 'create_page_grid',
+    'Grid', 'FrozenGrid', 'GridArea', 'ColumnGrid', 'RowGrid', 'BaselineGrid', 'create_page_grid',
 ]
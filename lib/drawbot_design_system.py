@@ -18,9 +18,19 @@ Usage:
     )
 """
 
+import math
+import os
+import re
+import sys
+from array import array
+from bisect import bisect_right
 from pathlib import Path
-from typing import Tuple, List, Optional, Dict, Any
+from typing import Tuple, List, Optional, Dict, Any, Iterable, Iterator, Callable
+from collections import OrderedDict
 from dataclasses import dataclass
+from functools import lru_cache
+
+from fontTools.pens.basePen import BasePen
 
 # Lazy import drawBot to allow core-only installs that don't use drawing functions
 _db = None
@@ -52,24 +62,36 @@ __all__ = [
     'REPO_ROOT', 'OUTPUT_DIR', 'get_output_path',
     # Typography scales
     'TypographyScale', 'POSTER_SCALE', 'MAGAZINE_SCALE', 'BOOK_SCALE', 'REPORT_SCALE',
-    'create_typography_scale',
+    'create_typography_scale', 'ScaleTable', 'SCALE_STEPS', 'NAMED_SCALES',
     # Scale ratios
     'MINOR_SECOND', 'MAJOR_SECOND', 'MINOR_THIRD', 'MAJOR_THIRD',
     'PERFECT_FOURTH', 'PERFECT_FIFTH', 'GOLDEN_RATIO',
     # Text functions
-    'get_text_metrics', 'wrap_text_to_width', 'draw_wrapped_text',
+    'get_text_metrics', 'wrap_text_to_width', 'draw_wrapped_text', 'WrappedText', 'Hyphenator',
+    'clear_font_caches', 'wrap_many', 'IncrementalWrapper', 'fit_text_to_box',
+    'TextFlow', 'FlowPage',
+    # Measurement backends
+    'DrawBotBackend', 'FontToolsBackend', 'HarfBuzzBackend', 'set_measurement_backend', 'get_measurement_backend',
+    # Font index
+    'FontIndex', 'FontRecord', 'get_font_index',
     # Layout
-    'validate_layout_fit', 'setup_poster_page',
+    'validate_layout_fit', 'find_layout_issues', 'find_overlaps',
+    'LayoutTracker', 'LayoutError', 'DEFAULT_LAYERS', 'validate_layouts', 'setup_poster_page',
     # Helpers
     'get_spacing_for_context', 'get_color_palette',
     # Color harmony
     'generate_color_palette', 'hex_to_rgb', 'rgb_to_hex', 'check_contrast_ratio',
-    'get_accessible_text_color', 'adjust_lightness',
+    'get_accessible_text_color', 'adjust_lightness', 'HARMONIES', 'PALETTE_ROLES',
+    'generate_color_palettes', 'adjust_lightness_array', 'rotate_hue_array',
+    'rgb_to_hls_array', 'hls_to_rgb_array',
+    'contrast_matrix', 'find_accessible_pairs', 'relative_luminance_array', 'WCAG_LEVELS',
     # OpenType & Variable Fonts
     'set_opentype_features', 'get_available_opentype_features',
     'set_font_variation', 'get_font_variation_axes',
     # Print production
     'setup_print_page', 'validate_print_ready', 'PRINT_PRESETS',
+    # Text outlines
+    'outline_text', 'draw_outlined_text', 'OutlinedText',
 ]
 
 # ==================== PATH MANAGEMENT ====================
@@ -130,42 +152,970 @@ MAGAZINE_SCALE = create_typography_scale(11, MAJOR_THIRD)      # Base 11pt, rati
 BOOK_SCALE = create_typography_scale(11, MINOR_THIRD)          # Base 11pt, ratio 1.2
 REPORT_SCALE = create_typography_scale(12, MAJOR_THIRD)        # Base 12pt, ratio 1.25
 
+# Scale steps from smallest to largest (ScaleTable column order)
+SCALE_STEPS = ('caption', 'body', 'h3', 'h2', 'h1', 'title')
+
+NAMED_SCALES = {
+    'poster': POSTER_SCALE,
+    'magazine': MAGAZINE_SCALE,
+    'book': BOOK_SCALE,
+    'report': REPORT_SCALE,
+}
+
+def _get_numpy():
+    """Lazy-load numpy, with clear error if not installed."""
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError(
+            "numpy is required for vectorized lookups but is not installed.\n"
+            "Install with: uv sync --extra fast\n"
+            "Or: pip install numpy"
+        )
+    return numpy
+
+class ScaleTable:
+    """
+    Precomputed sizes, leadings and metrics for every step of several scales.
+
+    Values are stored in contiguous (scales x steps) numpy arrays, so styling
+    thousands of runs is one fancy-indexing operation instead of attribute
+    lookups and leading() calls per run.
+
+    Usage:
+        table = ScaleTable(font="Helvetica")
+        rows, cols = table.codes(["poster", "book"], ["title", "body"])
+        table.sizes[rows, cols]          # array([91.125, 11.])
+        table.lookup(["book"] * 1000, steps)['leading']
+
+    Args:
+        scales: Mapping of names to TypographyScale (default: NAMED_SCALES)
+        font: Font for metrics (ascender, descender, cap/x-height and
+            baseline offset); metric arrays are omitted without it
+        leading_ratio: Leading as a multiple of size
+
+    Attributes:
+        sizes, leadings: Arrays indexed [scale, step]
+        ascenders, descenders, cap_heights, x_heights, baseline_offsets:
+            Metric arrays (only when a font is given). baseline_offsets is
+            the drop from the top of a text box to its first baseline, as
+            used by draw_wrapped_text().
+    """
+
+    def __init__(
+        self,
+        scales: Optional[Dict[str, TypographyScale]] = None,
+        font: Optional[str] = None,
+        leading_ratio: float = 1.5
+    ):
+        np = _get_numpy()
+        scales = dict(NAMED_SCALES if scales is None else scales)
+        if not scales:
+            raise ValueError("ScaleTable needs at least one scale")
+
+        self.font = font
+        self.leading_ratio = leading_ratio
+        self.scale_names = tuple(scales)
+        self.scale_index = {name: row for row, name in enumerate(self.scale_names)}
+        self.step_index = {step: col for col, step in enumerate(SCALE_STEPS)}
+
+        self.sizes = np.array(
+            [[getattr(scale, step) for step in SCALE_STEPS] for scale in scales.values()],
+            dtype=np.float64
+        )
+        self.leadings = self.sizes * leading_ratio
+        self.ratios = np.array([scale.ratio for scale in scales.values()], dtype=np.float64)
+
+        self._arrays = {'size': self.sizes, 'leading': self.leadings}
+        if font is not None:
+            metrics = [[_font_metrics(font, size) for size in row] for row in self.sizes.tolist()]
+            for field, key in (('ascender', 'ascenders'), ('descender', 'descenders'),
+                               ('cap_height', 'cap_heights'), ('x_height', 'x_heights')):
+                values = np.array([[m[field] for m in row] for row in metrics], dtype=np.float64)
+                setattr(self, key, values)
+                self._arrays[field] = values
+            self.baseline_offsets = self.ascenders.copy()
+            self._arrays['baseline_offset'] = self.baseline_offsets
+
+        for values in self._arrays.values():
+            values.flags.writeable = False
+
+    @classmethod
+    def from_ratios(cls, base: float, ratios: Dict[str, float], **kwargs) -> "ScaleTable":
+        """Build a table of custom scales sharing one base size, e.g. {'tight': 1.125}."""
+        scales = {name: create_typography_scale(base, ratio) for name, ratio in ratios.items()}
+        return cls(scales, **kwargs)
+
+    def codes(self, scales: Iterable[str], steps: Iterable[str]):
+        """Row and column index arrays for parallel sequences of scale and step names."""
+        np = _get_numpy()
+        try:
+            rows = np.fromiter((self.scale_index[name] for name in scales), dtype=np.intp)
+            cols = np.fromiter((self.step_index[step] for step in steps), dtype=np.intp)
+        except KeyError as e:
+            raise ValueError(f"Unknown scale or step: {e.args[0]!r}") from None
+        if rows.shape != cols.shape:
+            raise ValueError(f"Got {len(rows)} scales but {len(cols)} steps")
+        return rows, cols
+
+    def lookup(self, scales: Iterable[str], steps: Iterable[str]) -> Dict[str, Any]:
+        """Every precomputed field for many runs at once: {field: array}."""
+        rows, cols = self.codes(scales, steps)
+        return {field: values[rows, cols] for field, values in self._arrays.items()}
+
+    def get(self, scale: str, step: str) -> Dict[str, float]:
+        """Precomputed fields for a single scale step."""
+        row, col = self.scale_index[scale], self.step_index[step]
+        return {field: float(values[row, col]) for field, values in self._arrays.items()}
+
+# ==================== MEASUREMENT BACKENDS ====================
+
+# Maximum number of shaped runs HarfBuzzBackend keeps
+SHAPE_CACHE_SIZE = 20000
+
+
+def _get_harfbuzz():
+    """Lazy-load uharfbuzz, with clear error if not installed."""
+    try:
+        import uharfbuzz
+    except ImportError:
+        raise ImportError(
+            "uharfbuzz is required for shaping-aware measurement but is not installed.\n"
+            "Install with: uv sync --extra shaping\n"
+            "Or: pip install uharfbuzz"
+        )
+    return uharfbuzz
+
+
+class DrawBotBackend:
+    """
+    Measure text through DrawBot (the default).
+
+    Requires DrawBot's macOS backend. Each query makes the measured style
+    DrawBot's current font and size.
+    """
+
+    headless = False
+
+    def char_width(
+        self, font: str, size: float, char: str, variations: Tuple[Tuple[str, float], ...] = ()
+    ) -> float:
+        db.font(font)
+        db.fontSize(size)
+        if variations:
+            db.fontVariations(**dict(variations))
+        width, _ = db.textSize(char)
+        return width
+
+    def text_size(self, text: str, font: str, size: float) -> Tuple[float, float]:
+        db.font(font)
+        db.fontSize(size)
+        return db.textSize(text)
+
+    def kerning(self, font: str) -> Optional["_KerningPairs"]:
+        """
+        Kerning for the font file DrawBot resolves the name to, if any.
+
+        For collections (.ttc) the face is matched by name; when it can't
+        be identified no kerning is returned rather than another face's.
+        """
+        db.font(font)
+        try:
+            path = db.fontFilePath()
+        except Exception:
+            return None
+        if not path:
+            return None
+        font_number = _face_index(str(path), font)
+        if font_number is None:
+            return None
+        return _kerning_pairs(str(path), font_number)
+
+    def font_metrics(self, font: str, size: float) -> Dict[str, float]:
+        db.font(font)
+        db.fontSize(size)
+        return {
+            'ascender': db.fontAscender(),
+            'descender': db.fontDescender(),  # Should be negative
+            'line_height': db.fontLineHeight(),
+            'x_height': db.fontXHeight(),
+            'cap_height': db.fontCapHeight(),
+        }
+
+    def variation_axes(self, font: str) -> Dict[str, Dict[str, float]]:
+        db.font(font)
+        return db.listFontVariations()
+
+
+class _FontTables:
+    """
+    Tables pre-parsed from one font file: cmap, hmtx advances, kerning and
+    vertical metrics, all in font units. Kept in memory so measuring never
+    touches the file again.
+    """
+
+    def __init__(self, path: str, font_number: int = 0):
+        from fontTools.ttLib import TTFont
+
+        font = TTFont(path, lazy=True, fontNumber=font_number)
+        self.path = path
+        self.font_number = font_number
+        self.units_per_em = font['head'].unitsPerEm
+        self.cmap = font.getBestCmap() or {}
+        self.glyph_advances = {name: metrics[0] for name, metrics in font['hmtx'].metrics.items()}
+        self.default_advance = self.glyph_advances.get('.notdef', self.units_per_em // 2)
+        self.kerning = _KerningPairs(font)
+
+        hhea = font['hhea']
+        os2 = font['OS/2'] if 'OS/2' in font else None
+        use_typo = os2 is not None and bool(os2.fsSelection & (1 << 7))
+        if use_typo:
+            self.ascender = os2.sTypoAscender
+            self.descender = os2.sTypoDescender
+            line_gap = os2.sTypoLineGap
+        else:
+            self.ascender = hhea.ascent
+            self.descender = hhea.descent
+            line_gap = hhea.lineGap
+        self.line_height = self.ascender - self.descender + line_gap
+
+        self.x_height = getattr(os2, 'sxHeight', 0) or self.units_per_em * 0.5
+        self.cap_height = getattr(os2, 'sCapHeight', 0) or self.units_per_em * 0.7
+
+        # The (lazy) TTFont stays open for instancing and outlines
+        self._font = font
+        self._glyph_ids: Optional[Dict[str, int]] = None
+        self._glyph_sets: Dict[tuple, Any] = {}
+        self.axes: Dict[str, Tuple[float, float, float]] = {}
+        if 'fvar' in font:
+            self.axes = {
+                axis.axisTag: (axis.minValue, axis.defaultValue, axis.maxValue)
+                for axis in font['fvar'].axes
+            }
+
+    @property
+    def glyph_order(self) -> List[str]:
+        return self._font.getGlyphOrder()
+
+    @property
+    def glyph_ids(self) -> Dict[str, int]:
+        if self._glyph_ids is None:
+            self._glyph_ids = self._font.getReverseGlyphMap()
+        return self._glyph_ids
+
+    def glyph_set(self, location: Tuple[Tuple[str, float], ...] = ()):
+        """fontTools glyph set at a (normalized) axis location."""
+        glyph_set = self._glyph_sets.get(location)
+        if glyph_set is None:
+            if len(self._glyph_sets) >= 16:
+                self._glyph_sets.clear()
+            glyph_set = self._font.getGlyphSet(location=dict(location) or None, normalized=False)
+            self._glyph_sets[location] = glyph_set
+        return glyph_set
+
+    def location(self, variations: Tuple[Tuple[str, float], ...]) -> Tuple[Tuple[str, float], ...]:
+        """
+        Normalize an axis location for this font: unknown axes are dropped,
+        values clamped to the axis range, and default values omitted, so
+        equivalent locations share one cached instance.
+        """
+        location = []
+        for tag, value in variations:
+            if tag not in self.axes:
+                continue
+            minimum, default, maximum = self.axes[tag]
+            value = min(max(value, minimum), maximum)
+            if value != default:
+                location.append((tag, value))
+        return tuple(location)
+
+    def instance_advances(self, location: Tuple[Tuple[str, float], ...]) -> Dict[str, int]:
+        """Advances of every mapped glyph at a (normalized) axis location."""
+        from fontTools.pens.basePen import NullPen
+
+        glyph_set = self.glyph_set(location)
+        has_hvar = 'HVAR' in self._font
+        advances = {}
+        for glyph in set(self.cmap.values()) | {'.notdef'}:
+            if glyph not in glyph_set:
+                continue
+            instance = glyph_set[glyph]
+            if not has_hvar:
+                instance.draw(NullPen())  # gvar advances come from phantom points
+            advances[glyph] = round(instance.width)
+        return advances
+
+    def advance(self, char: str, location: Tuple[Tuple[str, float], ...] = ()) -> int:
+        """Advance of a character in font units (.notdef if unmapped)."""
+        advances = self.glyph_advances
+        default = self.default_advance
+        if location:
+            advances = _instance_cache.get(((self.path, self.font_number), location),
+                                           self.instance_advances)
+            default = advances.get('.notdef', default)
+        glyph = self.cmap.get(ord(char))
+        if glyph is None:
+            return default
+        return advances.get(glyph, default)
+
+
+@lru_cache(maxsize=32)
+def _font_tables(path: str, font_number: int = 0) -> _FontTables:
+    return _FontTables(path, font_number)
+
+
+def _is_collection(path: str) -> bool:
+    try:
+        with open(path, 'rb') as f:
+            return f.read(4) == b'ttcf'
+    except OSError:
+        return False
+
+
+@lru_cache(maxsize=256)
+def _face_index(path: str, name: str) -> Optional[int]:
+    """
+    Index of the face called `name` inside a font file.
+
+    Single-face files are always face 0. In collections (.ttc/.otc) the
+    name is matched like FontIndex names (full, PostScript or
+    'Family Style'); None if no face matches.
+    """
+    if not _is_collection(path):
+        return 0
+    from fontTools.ttLib import TTCollection
+
+    key = _font_key(name)
+    try:
+        fonts = TTCollection(path, lazy=True).fonts
+    except Exception:
+        return None
+    for number, font in enumerate(fonts):
+        try:
+            record = FontIndex._read_face(font, path, number)
+        except Exception:
+            continue
+        if key in {_font_key(n) for n in _face_names(record)}:
+            return number
+    return None
+
+
+# Memory budget for per-location variable-font advance tables
+INSTANCE_CACHE_BYTES = 16 * 1024 * 1024
+
+class _InstanceCache:
+    """
+    LRU cache of variable-font instance advance tables, bounded by memory.
+
+    Each entry is the advance table of one font at one axis location.
+    Posters that sweep an axis across many runs create many locations, so
+    entries are evicted by their estimated size rather than their count.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._entries: "OrderedDict[tuple, Tuple[Dict[str, int], int]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: tuple, build: Callable[[Any], Dict[str, int]]) -> Dict[str, int]:
+        """Return the cached table for key, building it with build(key[1])."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            return entry[0]
+
+        advances = build(key[1])
+        cost = sys.getsizeof(advances) + 32 * len(advances)
+        self._entries[key] = (advances, cost)
+        self.bytes += cost
+        while self.bytes > self.max_bytes and len(self._entries) > 1:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.bytes -= evicted
+        return advances
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.bytes = 0
+
+
+_instance_cache = _InstanceCache(INSTANCE_CACHE_BYTES)
+
+
+class FontToolsBackend:
+    """
+    Measure text straight from font files with fontTools, without DrawBot.
+
+    Reads hmtx, kern/GPOS and OS/2 once per file, so typography functions
+    run headless (e.g. on Linux render machines) and without AppKit overhead.
+    OpenType substitutions (ligatures, alternates) are not applied.
+
+    Usage:
+        set_measurement_backend(FontToolsBackend({
+            "Helvetica": "/fonts/Helvetica.ttf",
+            "Helvetica Bold": "/fonts/Helvetica-Bold.ttf",
+        }))
+        lines = wrap_text_to_width(text, 300, "Helvetica", 12)
+
+    Args:
+        fonts: Mapping of font names to font file paths. Names that are
+            themselves paths to existing files are used directly.
+        resolver: Optional callable mapping a font name to a path (or None),
+            consulted for names missing from `fonts`.
+    """
+
+    headless = True
+
+    def __init__(
+        self,
+        fonts: Optional[Dict[str, str]] = None,
+        resolver: Optional[Callable[[str], Optional[str]]] = None
+    ):
+        self.fonts = {name: str(path) for name, path in (fonts or {}).items()}
+        self.resolver = resolver
+
+    def font_path(self, font: str) -> str:
+        """Resolve a font name or path to a font file path."""
+        if font in self.fonts:
+            return self.fonts[font]
+        if self.resolver is not None:
+            path = self.resolver(font)
+            if path:
+                return str(path)
+        if Path(font).is_file():
+            return font
+        raise ValueError(
+            f"Cannot resolve font '{font}' for headless measurement. "
+            f"Pass a font file path or register it with FontToolsBackend(fonts={{...}})"
+        )
+
+    def font_face(self, font: str) -> Tuple[str, int]:
+        """
+        Resolve a font name to (file path, face index).
+
+        Faces inside collections are matched by name; a collection mapped
+        under a name none of its faces carry (or given as a bare path)
+        uses its first face.
+        """
+        path = self.font_path(font)
+        return path, _face_index(path, font) or 0
+
+    def tables(self, font: str) -> _FontTables:
+        return _font_tables(*self.font_face(font))
+
+    def char_width(
+        self, font: str, size: float, char: str, variations: Tuple[Tuple[str, float], ...] = ()
+    ) -> float:
+        tables = self.tables(font)
+        location = tables.location(variations) if variations else ()
+        return tables.advance(char, location) * size / tables.units_per_em
+
+    def text_size(self, text: str, font: str, size: float) -> Tuple[float, float]:
+        tables = self.tables(font)
+        width = _advance_table(font, size).measure(text)
+        return width, tables.line_height * size / tables.units_per_em
+
+    def kerning(self, font: str) -> Optional["_KerningPairs"]:
+        return self.tables(font).kerning
+
+    def font_metrics(self, font: str, size: float) -> Dict[str, float]:
+        tables = self.tables(font)
+        scale = size / tables.units_per_em
+        return {
+            'ascender': tables.ascender * scale,
+            'descender': tables.descender * scale,
+            'line_height': tables.line_height * scale,
+            'x_height': tables.x_height * scale,
+            'cap_height': tables.cap_height * scale,
+        }
+
+    def variation_axes(self, font: str) -> Dict[str, Dict[str, float]]:
+        return {
+            tag: {'minValue': minimum, 'defaultValue': default, 'maxValue': maximum}
+            for tag, (minimum, default, maximum) in self.tables(font).axes.items()
+        }
+
+
+class HarfBuzzBackend(FontToolsBackend):
+    """
+    Shaping-aware measurement with HarfBuzz (uharfbuzz).
+
+    Runs are shaped with the OpenType features from set_opentype_features()
+    and the axis location from set_font_variation(), so ligatures, tabular
+    figures and variable-font widths measure the way they render. Shaped
+    widths are cached in font units per (font, text, features, location),
+    so repeated strings such as table cells are shaped once for all sizes.
+    Font metrics and name resolution work as in FontToolsBackend.
+
+    Usage:
+        set_measurement_backend(HarfBuzzBackend({"Inter": "/fonts/Inter.ttf"}))
+        set_opentype_features(['tnum'])
+
+    Args:
+        fonts, resolver: As for FontToolsBackend
+        cache_size: Maximum number of shaped runs kept
+    """
+
+    def __init__(
+        self,
+        fonts: Optional[Dict[str, str]] = None,
+        resolver: Optional[Callable[[str], Optional[str]]] = None,
+        cache_size: int = SHAPE_CACHE_SIZE
+    ):
+        super().__init__(fonts, resolver)
+        _get_harfbuzz()
+        self.cache_size = cache_size
+        self._runs: "OrderedDict[tuple, int]" = OrderedDict()
+        self._hb_fonts: Dict[tuple, Any] = {}
+
+    def __getstate__(self):
+        # HarfBuzz objects can't be pickled (e.g. for wrap_many workers)
+        state = self.__dict__.copy()
+        state['_runs'] = OrderedDict()
+        state['_hb_fonts'] = {}
+        return state
+
+    def kerning(self, font: str) -> Optional["_KerningPairs"]:
+        return None  # Applied while shaping
+
+    def _hb_font(self, path: str, font_number: int, variations: Tuple[Tuple[str, float], ...]):
+        key = (path, font_number, variations)
+        hb_font = self._hb_fonts.get(key)
+        if hb_font is None:
+            hb = _get_harfbuzz()
+            face = hb.Face(hb.Blob.from_file_path(path), font_number)
+            hb_font = hb.Font(face)
+            if variations:
+                hb_font.set_variations(dict(variations))
+            self._hb_fonts[key] = hb_font
+        return hb_font
+
+    def shape(
+        self,
+        font: str,
+        text: str,
+        features: Tuple[Tuple[str, bool], ...] = (),
+        variations: Tuple[Tuple[str, float], ...] = ()
+    ) -> int:
+        """Advance of a shaped run in font units (cached)."""
+        path, font_number = self.font_face(font)
+        if variations:
+            variations = _font_tables(path, font_number).location(variations)
+        key = (path, font_number, text, features, variations)
+        runs = self._runs
+        units = runs.get(key)
+        if units is not None:
+            runs.move_to_end(key)
+            return units
+
+        hb = _get_harfbuzz()
+        buffer = hb.Buffer()
+        buffer.add_str(text)
+        buffer.guess_segment_properties()
+        hb.shape(self._hb_font(path, font_number, variations), buffer, dict(features))
+        units = sum(position.x_advance for position in buffer.glyph_positions)
+
+        runs[key] = units
+        if len(runs) > self.cache_size:
+            runs.popitem(last=False)
+        return units
+
+    def char_width(
+        self, font: str, size: float, char: str, variations: Tuple[Tuple[str, float], ...] = ()
+    ) -> float:
+        # Same active features as run_width(), so per-character advances
+        # (long-word breaking, space width) agree with shaped runs
+        features = _features_key()
+        return self.shape(font, char, features, variations) * size / self.tables(font).units_per_em
+
+    def run_width(
+        self,
+        font: str,
+        size: float,
+        text: str,
+        features: Tuple[Tuple[str, bool], ...],
+        variations: Tuple[Tuple[str, float], ...]
+    ) -> float:
+        return self.shape(font, text, features, variations) * size / self.tables(font).units_per_em
+
+
+_backend = DrawBotBackend()
+
+
+def set_measurement_backend(backend) -> None:
+    """
+    Choose how text is measured: DrawBotBackend() or FontToolsBackend(...).
+
+    Drawing still goes through DrawBot; only measurement (metrics, wrapping,
+    line fitting) uses the backend. Clears the font caches.
+    """
+    global _backend
+    _backend = backend
+    clear_font_caches()
+
+
+def get_measurement_backend():
+    """Get the active measurement backend."""
+    return _backend
+
+
+def _set_drawbot_style(font: str, size: float) -> None:
+    """
+    Make a style DrawBot's current font and size, as the text functions
+    always have, so text drawn next uses the measured style. Skipped for
+    headless backends, which run without DrawBot.
+    """
+    if not getattr(_backend, 'headless', False):
+        db.font(font)
+        db.fontSize(size)
+
+# ==================== FONT INDEX ====================
+
+FONT_EXTENSIONS = ('.ttf', '.otf', '.ttc', '.otc')
+
+def _default_font_dirs() -> List[Path]:
+    """System and user font directories for the current platform."""
+    home = Path.home()
+    if sys.platform == 'darwin':
+        dirs = [Path('/System/Library/Fonts'), Path('/Library/Fonts'), home / 'Library/Fonts']
+    elif sys.platform == 'win32':
+        dirs = [Path(os.environ.get('WINDIR', 'C:/Windows')) / 'Fonts',
+                home / 'AppData/Local/Microsoft/Windows/Fonts']
+    else:
+        dirs = [Path('/usr/share/fonts'), Path('/usr/local/share/fonts'),
+                home / '.local/share/fonts', home / '.fonts']
+    return dirs
+
+def _default_index_path() -> Path:
+    cache_home = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(cache_home) / 'drawbot-redux' / 'fonts.sqlite3'
+
+def _font_key(name: str) -> str:
+    """Normalize a font name for lookup: 'Helvetica-Bold' == 'helvetica bold'."""
+    return re.sub(r'[\s\-_]', '', name).lower()
+
+
+def _face_names(record: "FontRecord") -> set:
+    """Names a face answers to: full, PostScript, 'Family Style' (and family if regular)."""
+    names = {record.full_name, record.postscript_name, f"{record.family} {record.style}"}
+    if record.style.lower() in ('regular', 'roman', 'book', 'normal'):
+        names.add(record.family)
+    return {name for name in names if name}
+
+
+@dataclass
+class FontRecord:
+    """One indexed font face: names, file location and vertical metrics (font units)."""
+    family: str
+    style: str
+    full_name: str
+    postscript_name: str
+    path: str
+    font_number: int
+    units_per_em: int
+    ascender: int
+    descender: int
+    cap_height: int
+    x_height: int
+
+
+class FontIndex:
+    """
+    Persistent index of installed fonts for resolving names to files.
+
+    Font directories are scanned once and every face's names, path and
+    metrics are stored in SQLite alongside each file's mtime. Later runs
+    (including new processes) resolve names with a single keyed lookup;
+    only files whose mtime changed are parsed again. Lookups never rescan
+    the directories: call refresh() to pick up newly installed fonts.
+    When several files share a name, the first by path wins, which need not
+    be the file DrawBot would pick.
+
+    Usage:
+        index = get_font_index()
+        index.resolve("Helvetica Bold")  # -> '/System/Library/Fonts/Helvetica.ttc'
+
+        # Headless measurement by font name
+        set_measurement_backend(FontToolsBackend(resolver=index.resolve))
+
+    Args:
+        directories: Font directories to index (defaults to the platform's
+            system and user font directories)
+        path: SQLite file for the index (defaults to ~/.cache/drawbot-redux/)
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS files (
+            path TEXT PRIMARY KEY, mtime REAL NOT NULL, size INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS faces (
+            path TEXT NOT NULL, font_number INTEGER NOT NULL,
+            family TEXT, style TEXT, full_name TEXT, postscript_name TEXT,
+            units_per_em INTEGER, ascender INTEGER, descender INTEGER,
+            cap_height INTEGER, x_height INTEGER,
+            PRIMARY KEY (path, font_number)
+        );
+        CREATE TABLE IF NOT EXISTS names (
+            key TEXT NOT NULL, path TEXT NOT NULL, font_number INTEGER NOT NULL,
+            PRIMARY KEY (key, path, font_number)
+        );
+    """
+
+    def __init__(self, directories: Optional[Iterable[str]] = None, path: Optional[str] = None):
+        import sqlite3
+
+        self.directories = [Path(d) for d in (directories if directories is not None else _default_font_dirs())]
+        self.path = Path(path) if path else _default_index_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path))
+        self._db.executescript(self._SCHEMA)
+        self._memo: Dict[str, Optional[FontRecord]] = {}
+        if not self._db.execute("SELECT 1 FROM files LIMIT 1").fetchone():
+            self.refresh()
+
+    def __getstate__(self):
+        # SQLite connections can't be pickled (e.g. a resolver sent to
+        # wrap_many workers); the copy reopens the same index file
+        return {'directories': self.directories, 'path': self.path}
+
+    def __setstate__(self, state):
+        self.__init__(state['directories'], state['path'])
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM faces").fetchone()[0]
+
+    def close(self) -> None:
+        self._db.close()
+
+    def _font_files(self) -> Iterator[Tuple[str, os.stat_result]]:
+        for directory in self.directories:
+            if not directory.is_dir():
+                continue
+            for root, _, files in os.walk(directory):
+                for name in files:
+                    if name.lower().endswith(FONT_EXTENSIONS):
+                        path = os.path.join(root, name)
+                        try:
+                            yield path, os.stat(path)
+                        except OSError:
+                            continue
+
+    def refresh(self) -> int:
+        """
+        Bring the index up to date with the font directories.
+
+        Only new or modified files (by mtime and size) are parsed; removed
+        files are dropped. Returns the number of files parsed.
+        """
+        known = {path: (mtime, size) for path, mtime, size in self._db.execute("SELECT path, mtime, size FROM files")}
+        seen = set()
+        parsed = 0
+        with self._db:
+            for path, stat in self._font_files():
+                seen.add(path)
+                if known.get(path) == (stat.st_mtime, stat.st_size):
+                    continue
+                self._index_file(path, stat)
+                parsed += 1
+            for path in known.keys() - seen:
+                self._forget(path)
+        self._memo.clear()
+        return parsed
+
+    def _forget(self, path: str) -> None:
+        for table in ('files', 'faces', 'names'):
+            self._db.execute(f"DELETE FROM {table} WHERE path = ?", (path,))
+
+    def _index_file(self, path: str, stat: os.stat_result) -> None:
+        from fontTools.ttLib import TTCollection, TTFont
+
+        self._forget(path)
+        self._db.execute("INSERT INTO files VALUES (?, ?, ?)", (path, stat.st_mtime, stat.st_size))
+        try:
+            if path.lower().endswith(('.ttc', '.otc')):
+                fonts = TTCollection(path, lazy=True).fonts
+            else:
+                fonts = [TTFont(path, lazy=True)]
+        except Exception:
+            return  # Unreadable files stay recorded so they aren't retried every run
+
+        for number, font in enumerate(fonts):
+            try:
+                record = self._read_face(font, path, number)
+            except Exception:
+                continue
+            self._db.execute(
+                "INSERT INTO faces VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (path, number, record.family, record.style, record.full_name, record.postscript_name,
+                 record.units_per_em, record.ascender, record.descender, record.cap_height, record.x_height)
+            )
+            for name in _face_names(record):
+                if name:
+                    self._db.execute(
+                        "INSERT OR IGNORE INTO names VALUES (?, ?, ?)", (_font_key(name), path, number)
+                    )
+
+    @staticmethod
+    def _read_face(font, path: str, number: int) -> FontRecord:
+        name_table = font['name']
+
+        def name(*ids: int) -> str:
+            for name_id in ids:
+                value = name_table.getDebugName(name_id)
+                if value:
+                    return value
+            return ''
+
+        os2 = font['OS/2'] if 'OS/2' in font else None
+        hhea = font['hhea']
+        units_per_em = font['head'].unitsPerEm
+        return FontRecord(
+            family=name(16, 1),
+            style=name(17, 2) or 'Regular',
+            full_name=name(4),
+            postscript_name=name(6),
+            path=path,
+            font_number=number,
+            units_per_em=units_per_em,
+            ascender=hhea.ascent,
+            descender=hhea.descent,
+            cap_height=getattr(os2, 'sCapHeight', 0) or round(units_per_em * 0.7),
+            x_height=getattr(os2, 'sxHeight', 0) or round(units_per_em * 0.5),
+        )
+
+    def lookup(self, name: str) -> Optional[FontRecord]:
+        """
+        Find the face for a font name (full name, PostScript name, or
+        'Family Style'). Re-reads the matched file if it changed since it
+        was indexed; unknown names return None until refresh() finds them.
+        """
+        if name in self._memo:
+            return self._memo[name]
+
+        record = self._query(name)
+        if record is not None and not self._is_current(record.path):
+            self._reindex(record.path)
+            record = self._query(name)
+
+        self._memo[name] = record
+        return record
+
+    def _is_current(self, path: str) -> bool:
+        row = self._db.execute("SELECT mtime, size FROM files WHERE path = ?", (path,)).fetchone()
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        return row is not None and tuple(row) == (stat.st_mtime, stat.st_size)
+
+    def _reindex(self, path: str) -> None:
+        with self._db:
+            try:
+                self._index_file(path, os.stat(path))
+            except OSError:
+                self._forget(path)
+
+    def _query(self, name: str) -> Optional[FontRecord]:
+        row = self._db.execute(
+            "SELECT f.family, f.style, f.full_name, f.postscript_name, f.path, f.font_number, "
+            "f.units_per_em, f.ascender, f.descender, f.cap_height, f.x_height "
+            "FROM names n JOIN faces f ON f.path = n.path AND f.font_number = n.font_number "
+            "WHERE n.key = ? ORDER BY n.path, n.font_number LIMIT 1", (_font_key(name),)
+        ).fetchone()
+        return FontRecord(*row) if row else None
+
+    def resolve(self, name: str) -> Optional[str]:
+        """Font file path for a name, or None (usable as a FontToolsBackend resolver)."""
+        record = self.lookup(name)
+        return record.path if record else None
+
+    def families(self) -> List[str]:
+        """All indexed family names, sorted."""
+        return [row[0] for row in self._db.execute("SELECT DISTINCT family FROM faces ORDER BY family")]
+
+
+_font_index: Optional[FontIndex] = None
+
+def get_font_index() -> FontIndex:
+    """
+    Get the shared font index, opening it on first use.
+
+    Set DRAWBOT_FONT_DIRS (os.pathsep-separated) to index specific
+    directories instead of the system ones.
+    """
+    global _font_index
+    if _font_index is None:
+        configured = os.environ.get('DRAWBOT_FONT_DIRS')
+        _font_index = FontIndex(configured.split(os.pathsep) if configured else None)
+    return _font_index
+
 # ==================== TEXT METRICS ====================
 
-def get_text_metrics(text: str, font: str, size: float) -> dict:
-    """Get real text metrics from DrawBot (not approximations)"""
-    db.font(font)
-    db.fontSize(size)
+# Maximum number of (font, size, variations) styles whose metrics are kept
+METRICS_CACHE_SIZE = 256
+
+# Style state set through set_opentype_features() / set_font_variation().
+# Both change glyph shapes and widths, so they are part of the cache keys.
+_active_features: Dict[str, bool] = {}
+_active_variations: Dict[str, float] = {}
+
+
+def _variations_key() -> Tuple[Tuple[str, float], ...]:
+    return tuple(sorted(_active_variations.items()))
+
+
+def _features_key() -> Tuple[Tuple[str, bool], ...]:
+    return tuple(sorted(_active_features.items()))
 
-    # Get actual dimensions
-    width, height = db.textSize(text)
 
-    # Get font metrics
+@lru_cache(maxsize=METRICS_CACHE_SIZE)
+def _cached_font_metrics(font: str, size: float, variations: Tuple[Tuple[str, float], ...]) -> Dict[str, float]:
     try:
-        ascender = db.fontAscender()
-        descender = db.fontDescender()  # Should be negative
-        line_height = db.fontLineHeight()
-        x_height = db.fontXHeight()
-        cap_height = db.fontCapHeight()
+        return _backend.font_metrics(font, size)
     except Exception as e:
         # Fallback if metrics not available
         # Log warning so issues don't go unnoticed
         import warnings
         warnings.warn(f"Could not get font metrics for '{font}' at {size}pt: {e}")
-        ascender = size * 0.8
-        descender = -size * 0.2  # Descender should be negative (below baseline)
-        line_height = size * 1.2
-        x_height = size * 0.5
-        cap_height = size * 0.7
+        return {
+            'ascender': size * 0.8,
+            'descender': -size * 0.2,  # Descender should be negative (below baseline)
+            'line_height': size * 1.2,
+            'x_height': size * 0.5,
+            'cap_height': size * 0.7,
+        }
+
+
+def _font_metrics(font: str, size: float) -> Dict[str, float]:
+    """
+    Font-wide metrics for a style, queried from the backend once per process.
+
+    Keyed by (font, size, active variations). The returned dict is shared
+    by the cache and must not be modified.
+    """
+    return _cached_font_metrics(font, size, _variations_key())
+
+
+def get_text_metrics(text: str, font: str, size: float) -> dict:
+    """
+    Get real text metrics from the measurement backend (not approximations)
+
+    Ascender, descender, line height, x-height and cap height are cached per
+    style; only the text's own width and height are measured on each call.
+    Call clear_font_caches() if fonts change on disk.
+    """
+    _set_drawbot_style(font, size)
+    metrics = _font_metrics(font, size)
+
+    # Get actual dimensions
+    width, height = _backend.text_size(text, font, size)
 
     return {
         'width': width,
         'height': height,
-        'ascender': ascender,
-        'descender': descender,
-        'line_height': line_height,
-        'x_height': x_height,
-        'cap_height': cap_height
+        **metrics
     }
 
 def calculate_chars_per_line(width_in_points: float, font: str, size: float) -> int:
@@ -176,54 +1126,272 @@ def calculate_chars_per_line(width_in_points: float, font: str, size: float) ->
     - Optimal: 60-70 characters per line
     - Ideal: 60-65 characters
     """
-    db.font(font)
-    db.fontSize(size)
+    _set_drawbot_style(font, size)
 
     # Use 'm' as average character width
-    avg_char_width, _ = db.textSize("m")
+    avg_char_width = _advance_table(font, size).advance("m")
 
     # Calculate how many fit
     chars_per_line = int(width_in_points / avg_char_width)
 
     return chars_per_line
 
+# ==================== GLYPH ADVANCE CACHE ====================
+
+# Maximum number of (font, size, features, variations) advance tables kept in memory
+ADVANCE_CACHE_SIZE = 64
+
+class _KerningPairs:
+    """
+    Pair kerning read once from a font (fontTools TTFont).
+
+    Reads the legacy 'kern' table (format 0) and GPOS pair adjustment
+    lookups (formats 1 and 2, including extension lookups). Values are
+    returned in font units; lookups are memoized per character pair.
+    """
+
+    def __init__(self, font):
+        self.units_per_em = font['head'].unitsPerEm
+        self._cmap = font.getBestCmap() or {}
+        self._pairs: Dict[Tuple[str, str], int] = {}
+        self._class_subtables = []
+        self._memo: Dict[Tuple[str, str], int] = {}
+
+        if 'GPOS' in font:
+            self._read_gpos(font['GPOS'].table)
+        elif 'kern' in font:
+            for subtable in font['kern'].kernTables:
+                if getattr(subtable, 'format', None) == 0:
+                    for pair, value in subtable.kernTable.items():
+                        self._pairs.setdefault(pair, value)
+
+    def _read_gpos(self, gpos) -> None:
+        if not gpos.LookupList:
+            return
+        for lookup in gpos.LookupList.Lookup:
+            for subtable in lookup.SubTable:
+                if lookup.LookupType == 9:
+                    if subtable.ExtensionLookupType != 2:
+                        continue
+                    subtable = subtable.ExtSubTable
+                elif lookup.LookupType != 2:
+                    continue
+
+                if subtable.Format == 1:
+                    for first, pair_set in zip(subtable.Coverage.glyphs, subtable.PairSet):
+                        for record in pair_set.PairValueRecord:
+                            value = getattr(record.Value1, 'XAdvance', 0) or 0
+                            if value:
+                                self._pairs.setdefault((first, record.SecondGlyph), value)
+                elif subtable.Format == 2:
+                    self._class_subtables.append((
+                        set(subtable.Coverage.glyphs),
+                        subtable.ClassDef1.classDefs if subtable.ClassDef1 else {},
+                        subtable.ClassDef2.classDefs if subtable.ClassDef2 else {},
+                        subtable.Class1Record,
+                    ))
+
+    def pair(self, left: str, right: str) -> int:
+        """Kerning between two characters, in font units."""
+        key = (left, right)
+        value = self._memo.get(key)
+        if value is not None:
+            return value
+
+        value = 0
+        left_glyph = self._cmap.get(ord(left))
+        right_glyph = self._cmap.get(ord(right))
+        if left_glyph and right_glyph:
+            glyph_pair = (left_glyph, right_glyph)
+            if glyph_pair in self._pairs:
+                value = self._pairs[glyph_pair]
+            else:
+                for coverage, class1, class2, records in self._class_subtables:
+                    if left_glyph not in coverage:
+                        continue
+                    record = records[class1.get(left_glyph, 0)].Class2Record[class2.get(right_glyph, 0)]
+                    value = getattr(record.Value1, 'XAdvance', 0) or 0
+                    break
+
+        self._memo[key] = value
+        return value
+
+
+@lru_cache(maxsize=16)
+def _kerning_pairs(path: str, font_number: int = 0) -> Optional[_KerningPairs]:
+    """Load kerning for a font face once per process (None if unreadable)."""
+    from fontTools.ttLib import TTFont
+
+    try:
+        return _KerningPairs(TTFont(path, lazy=True, fontNumber=font_number))
+    except Exception:
+        return None
+
+
+class _AdvanceTable:
+    """
+    Advance widths for one (font, size, features, variations) style.
+
+    Each character is measured with the backend once; word widths are the
+    sum of cached advances plus kerning pairs. Backends that shape text
+    (HarfBuzzBackend) measure whole runs instead.
+    """
+
+    def __init__(
+        self,
+        font: str,
+        size: float,
+        backend,
+        kerning: Optional[_KerningPairs],
+        features: Tuple[Tuple[str, bool], ...] = (),
+        variations: Tuple[Tuple[str, float], ...] = ()
+    ):
+        self.font = font
+        self.size = size
+        self.features = features
+        self.variations = variations
+        self.advances: Dict[str, float] = {}
+        self._backend = backend
+        self._kerning = kerning
+        self._kern_scale = size / kerning.units_per_em if kerning else 0.0
+        self._run_width = getattr(backend, 'run_width', None)
+
+    def advance(self, char: str) -> float:
+        """Advance width of a single character in points."""
+        width = self.advances.get(char)
+        if width is None:
+            width = self._backend.char_width(self.font, self.size, char, self.variations)
+            self.advances[char] = width
+        return width
+
+    def measure(self, text: str) -> float:
+        """Width of a run of text: cached advances plus pair kerning."""
+        if self._run_width is not None:
+            return self._run_width(self.font, self.size, text, self.features, self.variations)
+
+        advances = self.advances
+        width = 0.0
+        for char in text:
+            advance = advances.get(char)
+            width += advance if advance is not None else self.advance(char)
+
+        if self._kerning and len(text) > 1:
+            pair = self._kerning.pair
+            kerning = sum(pair(left, right) for left, right in zip(text, text[1:]))
+            width += kerning * self._kern_scale
+
+        return width
+
+    def prefix_widths(self, text: str) -> Tuple[List[float], List[float]]:
+        """
+        Prefix sums of advances for slicing a run without re-measuring.
+
+        Returns (prefix, kerns) where prefix[i] is the width of text[:i] and
+        kerns[i] is the kerning between text[i - 1] and text[i]. The width of
+        text[i:j] is prefix[j] - prefix[i] - kerns[i].
+        """
+        prefix = [0.0]
+        kerns = [0.0]
+        running = 0.0
+        previous = None
+        for char in text:
+            kern = 0.0
+            if self._kerning and previous is not None:
+                kern = self._kerning.pair(previous, char) * self._kern_scale
+            running += self.advance(char) + kern
+            prefix.append(running)
+            kerns.append(kern)
+            previous = char
+        kerns[0] = 0.0
+        return prefix, kerns
+
+
+@lru_cache(maxsize=ADVANCE_CACHE_SIZE)
+def _cached_advance_table(
+    font: str,
+    size: float,
+    features: Tuple[Tuple[str, bool], ...],
+    variations: Tuple[Tuple[str, float], ...]
+) -> _AdvanceTable:
+    return _AdvanceTable(font, size, _backend, _backend.kerning(font), features, variations)
+
+
+def _advance_table(font: str, size: float) -> _AdvanceTable:
+    """
+    Get the LRU-cached advance table for a style.
+
+    Keyed by (font, size, active OpenType features, active variations).
+    """
+    return _cached_advance_table(font, size, _features_key(), _variations_key())
+
+
+def clear_font_caches() -> None:
+    """
+    Drop all cached font metrics, advance widths and kerning.
+
+    Call this when font files change on disk (e.g. while iterating on a
+    font in watch mode) so the next measurement reads them again.
+    """
+    _cached_font_metrics.cache_clear()
+    _cached_advance_table.cache_clear()
+    _kerning_pairs.cache_clear()
+    _font_tables.cache_clear()
+    _face_index.cache_clear()
+    _instance_cache.clear()
+    _cached_variation_axes.cache_clear()
+    _glyph_outline.cache_clear()
+
 # ==================== TEXT WRAPPING ====================
 
 def wrap_text_to_width(
     text: str,
     width_in_points: float,
     font: str,
-    size: float
+    size: float,
+    hyphenator: Optional["Hyphenator"] = None,
+    algorithm: str = "greedy"
 ) -> List[str]:
     """
     Wrap text based on ACTUAL visual width in points.
 
-    Measures each word with DrawBot to ensure accurate line breaks.
+    Word widths are summed from cached glyph advances and kerning pairs, so
+    each distinct character is measured with DrawBot only once per style.
     Handles variable-width fonts correctly (unlike character-count methods).
+    Leaves the style set in DrawBot, like the other text functions.
 
     Args:
         text: Text to wrap
         width_in_points: Maximum line width in points
         font: Font name
         size: Font size in points
+        hyphenator: Optional Hyphenator used to break words wider than the line
+        algorithm: "greedy" (first-fit) or "optimal" (Knuth-Plass total-fit,
+            evens out the rag across the whole paragraph)
 
     Returns:
         List of wrapped lines
     """
-    db.font(font)
-    db.fontSize(size)
+    if algorithm not in WRAP_ALGORITHMS:
+        raise ValueError(f"Unknown wrap algorithm: {algorithm}. Use: {', '.join(WRAP_ALGORITHMS)}")
+
+    _set_drawbot_style(font, size)
 
     words = text.split()
     if not words:
         return []
 
+    advances = _advance_table(font, size)
+
+    if algorithm == "optimal":
+        return _wrap_optimal(words, advances, width_in_points, font, size, hyphenator)
+
     lines = []
     current_line_words = []
     current_line_width = 0.0
-    space_width, _ = db.textSize(" ")
+    space_width = advances.advance(" ")
 
     for word in words:
-        word_width, _ = db.textSize(word)
+        word_width = advances.measure(word)
 
         # Calculate width if we add this word
         if current_line_words:
@@ -240,139 +1408,1293 @@ def wrap_text_to_width(
             if current_line_words:
                 lines.append(" ".join(current_line_words))
 
-            # Handle words wider than the box (long URLs, etc.)
-            if word_width > width_in_points:
-                # Break the word into multiple chunks
-                chunks = _break_long_word(word, width_in_points, font, size)
-                # Add all but the last chunk as separate lines
-                for chunk in chunks[:-1]:
-                    lines.append(chunk)
-                # Start new line with final chunk (may continue with more words)
-                if chunks:
-                    last_chunk = chunks[-1]
-                    last_width, _ = db.textSize(last_chunk)
-                    current_line_words = [last_chunk]
-                    current_line_width = last_width
-                else:
-                    current_line_words = []
-                    current_line_width = 0.0
-            else:
-                current_line_words = [word]
-                current_line_width = word_width
+            # Handle words wider than the box (long URLs, etc.)
+            if word_width > width_in_points:
+                # Break the word into multiple chunks
+                chunks = _break_long_word(word, width_in_points, font, size, hyphenator)
+                # Add all but the last chunk as separate lines
+                for chunk in chunks[:-1]:
+                    lines.append(chunk)
+                # Start new line with final chunk (may continue with more words)
+                if chunks:
+                    last_chunk = chunks[-1]
+                    last_width = advances.measure(last_chunk)
+                    current_line_words = [last_chunk]
+                    current_line_width = last_width
+                else:
+                    current_line_words = []
+                    current_line_width = 0.0
+            else:
+                current_line_words = [word]
+                current_line_width = word_width
+
+    # Don't forget the last line
+    if current_line_words:
+        lines.append(" ".join(current_line_words))
+
+    return lines
+
+
+# ==================== OPTIMAL LINE BREAKING ====================
+
+WRAP_ALGORITHMS = ("greedy", "optimal")
+
+# Upper bound on candidate breakpoints kept alive by the Knuth-Plass breaker
+_MAX_ACTIVE_BREAKS = 64
+
+# Fixed cost per line, so the breaker doesn't add lines to shave raggedness
+_LINE_PENALTY = 10
+
+
+def _knuth_plass_breaks(
+    widths: List[float],
+    space_width: float,
+    max_width: float,
+    forced: List[bool],
+    max_active: int = _MAX_ACTIVE_BREAKS
+) -> List[int]:
+    """
+    Total-fit line breaking (Knuth-Plass) over measured items.
+
+    Minimizes the sum of squared (line penalty + badness) over all lines,
+    where badness grows with the cube of each line's unused width. The last
+    line is free. A breakpoint is deactivated once the line from it overflows,
+    and at most max_active breakpoints are kept, so the cost stays close to
+    linear in the number of items.
+
+    Args:
+        widths: Width of each item (word or word chunk)
+        space_width: Width of the space between items
+        max_width: Line width
+        forced: forced[i] is True if a line must end after item i
+
+    Returns:
+        Exclusive end index of each line
+    """
+    count = len(widths)
+    prefix = [0.0]
+    for width in widths:
+        prefix.append(prefix[-1] + width)
+
+    best = [math.inf] * (count + 1)
+    previous = [0] * (count + 1)
+    best[0] = 0.0
+    active = [0]
+
+    for end in range(1, count + 1):
+        is_last = end == count
+        still_active = []
+
+        for start in active:
+            line_width = prefix[end] - prefix[start] + (end - start - 1) * space_width
+            if line_width > max_width and end - start > 1:
+                continue  # Only gets wider from here on
+
+            still_active.append(start)
+            if is_last:
+                badness = 0.0
+            else:
+                slack = max(max_width - line_width, 0.0) / max_width if max_width > 0 else 0.0
+                badness = 100 * slack ** 3
+            demerits = best[start] + (_LINE_PENALTY + badness) ** 2
+
+            if demerits < best[end]:
+                best[end] = demerits
+                previous[end] = start
+
+        if forced[end - 1]:
+            active = [end]
+        else:
+            if len(still_active) >= max_active:
+                still_active.sort(key=best.__getitem__)
+                still_active = still_active[:max_active - 1]
+            still_active.append(end)
+            active = still_active
+
+    breaks = []
+    end = count
+    while end > 0:
+        breaks.append(end)
+        end = previous[end]
+    breaks.reverse()
+    return breaks
+
+
+def _wrap_optimal(
+    words: List[str],
+    advances: "_AdvanceTable",
+    width_in_points: float,
+    font: str,
+    size: float,
+    hyphenator: Optional["Hyphenator"]
+) -> List[str]:
+    """Wrap pre-split words with the Knuth-Plass breaker."""
+    items = []
+    widths = []
+    forced = []
+
+    for word in words:
+        word_width = advances.measure(word)
+        if word_width > width_in_points:
+            # Over-wide words become full-line chunks with forced breaks
+            chunks = _break_long_word(word, width_in_points, font, size, hyphenator)
+            for i, chunk in enumerate(chunks):
+                items.append(chunk)
+                widths.append(advances.measure(chunk))
+                forced.append(i < len(chunks) - 1)
+        else:
+            items.append(word)
+            widths.append(word_width)
+            forced.append(False)
+
+    breaks = _knuth_plass_breaks(widths, advances.advance(" "), width_in_points, forced)
+
+    lines = []
+    start = 0
+    for end in breaks:
+        lines.append(" ".join(items[start:end]))
+        start = end
+    return lines
+
+
+def _break_long_word(
+    word: str,
+    max_width: float,
+    font: str,
+    size: float,
+    hyphenator: Optional["Hyphenator"] = None
+) -> List[str]:
+    """
+    Break a word that's too wide for the column into multiple chunks.
+
+    Break points are found by bisecting prefix sums of cached advances, so
+    each chunk costs O(log n) comparisons instead of one measurement per
+    candidate length. With a hyphenator, chunks end at the last valid
+    hyphenation point that fits, falling back to a character break.
+
+    Returns a list of chunks, each fitting within max_width (with hyphens added
+    to all but the last chunk).
+    """
+    if not word:
+        return [""]
+
+    advances = _advance_table(font, size)
+    hyphen_width = advances.advance("-")
+    available = max_width - hyphen_width
+
+    prefix, kerns = advances.prefix_widths(word)
+    hyphen_points = hyphenator.positions(word) if hyphenator else []
+
+    chunks = []
+    start = 0
+    end = len(word)
+
+    while start < end:
+        # Width of word[start:i] is prefix[i] - offset
+        offset = prefix[start] + kerns[start]
+
+        # Check if remainder fits without hyphen
+        if prefix[end] - offset <= max_width:
+            chunks.append(word[start:])
+            break
+
+        # Longest prefix that fits with a hyphen
+        limit = bisect_right(prefix, offset + available, start + 1, end + 1) - 1
+
+        if hyphen_points:
+            point = bisect_right(hyphen_points, limit) - 1
+            if point >= 0 and hyphen_points[point] > start:
+                limit = hyphen_points[point]
+
+        # Fallback: take at least one character to avoid infinite loop
+        limit = max(limit, start + 1)
+
+        chunks.append(word[start:limit] + "-")
+        start = limit
+
+    return chunks if chunks else [""]
+
+
+class Hyphenator:
+    """
+    Liang (TeX) pattern hyphenation for breaking long words.
+
+    Usage:
+        hyphenator = Hyphenator.from_file("hyph-de-1996.pat.txt")
+        hyphenator.hyphenate("donaudampfschiff")  # ['do', 'nau', 'dampf', 'schiff']
+        wrap_text_to_width(text, 200, "Helvetica", 12, hyphenator=hyphenator)
+
+    Args:
+        patterns: Liang patterns, e.g. ['hy3ph', 'he2n', '.ex5am']
+        exceptions: Explicitly hyphenated words, e.g. ['ta-ble']
+        left_min: Minimum letters before the first hyphen
+        right_min: Minimum letters after the last hyphen
+    """
+
+    def __init__(
+        self,
+        patterns: Iterable[str],
+        exceptions: Iterable[str] = (),
+        left_min: int = 2,
+        right_min: int = 3
+    ):
+        self.left_min = left_min
+        self.right_min = right_min
+        self._patterns: Dict[str, Tuple[int, ...]] = {}
+        self._exceptions: Dict[str, List[int]] = {}
+        self._max_length = 0
+        self._memo: Dict[str, List[int]] = {}
+
+        for pattern in patterns:
+            letters = re.sub(r"\d", "", pattern)
+            points = [0] * (len(letters) + 1)
+            position = 0
+            for char in pattern:
+                if char.isdigit():
+                    points[position] = int(char)
+                else:
+                    position += 1
+            self._patterns[letters] = tuple(points)
+            self._max_length = max(self._max_length, len(letters))
+
+        for exception in exceptions:
+            parts = exception.split("-")
+            positions = []
+            offset = 0
+            for part in parts[:-1]:
+                offset += len(part)
+                positions.append(offset)
+            self._exceptions["".join(parts).lower()] = positions
+
+    @classmethod
+    def from_file(cls, path, **kwargs) -> "Hyphenator":
+        """
+        Load patterns from a TeX pattern file.
+
+        Accepts plain whitespace-separated patterns or files with
+        \\patterns{...} and \\hyphenation{...} blocks; '%' starts a comment.
+        """
+        content = Path(path).read_text(encoding="utf-8")
+        content = re.sub(r"%.*", "", content)
+
+        patterns_block = re.search(r"\\patterns\s*\{(.*?)\}", content, re.S)
+        exceptions_block = re.search(r"\\hyphenation\s*\{(.*?)\}", content, re.S)
+
+        patterns = (patterns_block.group(1) if patterns_block else content).split()
+        exceptions = exceptions_block.group(1).split() if exceptions_block else []
+        return cls(patterns, exceptions, **kwargs)
+
+    def positions(self, word: str) -> List[int]:
+        """Sorted character offsets where the word may be hyphenated."""
+        memo = self._memo.get(word)
+        if memo is not None:
+            return memo
+
+        lowered = word.lower()
+        if lowered in self._exceptions:
+            positions = self._exceptions[lowered]
+        else:
+            padded = f".{lowered}."
+            points = [0] * (len(padded) + 1)
+            for i in range(len(padded)):
+                for j in range(i + 1, min(len(padded), i + self._max_length) + 1):
+                    pattern = self._patterns.get(padded[i:j])
+                    if pattern:
+                        for k, point in enumerate(pattern):
+                            if point > points[i + k]:
+                                points[i + k] = point
+            # points[i + 1] is the value before word[i] (offset by the leading '.')
+            positions = [
+                i for i in range(1, len(word))
+                if points[i + 1] % 2 == 1
+            ]
+
+        positions = [
+            i for i in positions
+            if self.left_min <= i <= len(word) - self.right_min
+        ]
+        self._memo[word] = positions
+        return positions
+
+    def hyphenate(self, word: str) -> List[str]:
+        """Split a word into syllables at valid hyphenation points."""
+        pieces = []
+        start = 0
+        for position in self.positions(word):
+            pieces.append(word[start:position])
+            start = position
+        pieces.append(word[start:])
+        return pieces
+
+class WrappedText(float):
+    """
+    Result of draw_wrapped_text.
+
+    A float subclass whose value is the final y position, so it is a
+    drop-in replacement for the plain float draw_wrapped_text used to
+    return (y - 20, y < 100, max(y, 10), round(y) all work), with the
+    layout report as extra attributes:
+
+        y: Baseline position after the last line drawn
+        lines: Lines drawn
+        overflow_lines: Lines that didn't fit in the box
+        overflow_offset: Character offset in text where overflow starts
+        height: Height of the drawn block (top to last descender)
+        required_height: Height the whole text would need
+        overflow_text: text[overflow_offset:], ready for the next frame
+    """
+
+    def __new__(
+        cls,
+        y: float,
+        lines: List[str],
+        overflow_lines: List[str],
+        overflow_offset: Optional[int],
+        height: float,
+        required_height: float,
+        overflow_text: str = ""
+    ):
+        result = super().__new__(cls, y)
+        result.lines = lines
+        result.overflow_lines = overflow_lines
+        result.overflow_offset = overflow_offset
+        result.height = height
+        result.required_height = required_height
+        result.overflow_text = overflow_text
+        return result
+
+    def __getnewargs__(self):
+        return (float(self), self.lines, self.overflow_lines, self.overflow_offset,
+                self.height, self.required_height, self.overflow_text)
+
+    @property
+    def y(self) -> float:
+        return float(self)
+
+    @property
+    def overflowed(self) -> bool:
+        return bool(self.overflow_lines)
+
+    def __repr__(self) -> str:
+        return (
+            f"WrappedText(y={float(self)!r}, lines={self.lines!r}, "
+            f"overflow_lines={self.overflow_lines!r}, overflow_offset={self.overflow_offset!r}, "
+            f"height={self.height!r}, required_height={self.required_height!r}, "
+            f"overflow_text={self.overflow_text!r})"
+        )
+
+
+def _line_offsets(text: str, lines: List[str]) -> List[int]:
+    """
+    Character offset in text where each wrapped line starts.
+
+    Walks the original text alongside the lines, skipping the whitespace
+    wrapping collapsed and the hyphens added to broken words.
+    """
+    offsets = []
+    position = 0
+    for line in lines:
+        while position < len(text) and text[position].isspace():
+            position += 1
+        offsets.append(position)
+        for piece in line.split(" "):
+            while position < len(text) and text[position].isspace():
+                position += 1
+            if text.startswith(piece, position):
+                position += len(piece)
+            else:
+                # Chunk of a broken word: the hyphen isn't in the source text
+                position += len(piece) - 1
+    return offsets
+
+
+def _block_height(
+    metrics: Dict[str, float],
+    line_count: int,
+    line_spacing: float,
+    first_baseline_drop: Optional[float] = None
+) -> float:
+    """
+    Height from the top of a text box to the descender of its last line.
+
+    first_baseline_drop is the distance from the top to the first baseline
+    (the ascender unless lines are snapped to a baseline grid).
+    """
+    if line_count == 0:
+        return 0.0
+    if first_baseline_drop is None:
+        first_baseline_drop = metrics['ascender']
+    return first_baseline_drop - metrics['descender'] + (line_count - 1) * line_spacing
+
+
+# Tolerance for comparing accumulated baselines with grid lines
+_BASELINE_EPSILON = 1e-6
+
+def _grid_line_spacing(baseline_grid, line_spacing: float) -> float:
+    """Line spacing rounded up to a whole number of baseline grid lines."""
+    grid_line = baseline_grid.line_height
+    return max(1, math.ceil(line_spacing / grid_line - _BASELINE_EPSILON)) * grid_line
+
+
+def draw_wrapped_text(
+    text: str,
+    x: float,
+    y: float,
+    width: float,
+    height: float,
+    font: str,
+    size: float,
+    leading_ratio: float = 1.5,
+    align: str = "left",
+    algorithm: str = "greedy",
+    wrapper: Optional["IncrementalWrapper"] = None,
+    baseline_grid=None
+) -> WrappedText:
+    """
+    Draw wrapped text with proper metrics and report what fit.
+
+    Args:
+        text: Text to draw
+        x, y: Top-left corner of text box
+        width, height: Box dimensions
+        font, size: Typography settings
+        leading_ratio: Line spacing ratio (default 1.5x from docs)
+        align: "left", "right", "center"
+        algorithm: Line breaking, "greedy" or "optimal" (see wrap_text_to_width)
+        wrapper: Optional IncrementalWrapper for the same width, font and size;
+            keeps line breaks between calls so edits only re-flow nearby lines
+            (greedy only: combining it with algorithm="optimal" is an error)
+        baseline_grid: Optional BaselineGrid to snap lines to. The first
+            baseline goes on the first grid line below the ascender, and the
+            leading is rounded up to whole grid lines, so text in different
+            columns shares baselines. Lines below the grid's last line overflow.
+
+    Returns:
+        WrappedText with the final y position (baseline after the last line
+        drawn), the lines drawn and overflowed, the character offset where
+        overflow starts and the measured block height. Continue overflowing
+        text in another frame with result.overflow_text.
+    """
+    # Get real metrics (cached per style)
+    metrics = _font_metrics(font, size)
+    line_spacing = size * leading_ratio
+
+    # Wrap text to width
+    if wrapper is not None:
+        if algorithm != "greedy":
+            raise ValueError(f"IncrementalWrapper breaks lines greedily; can't use algorithm='{algorithm}'")
+        if (wrapper.width, wrapper.font, wrapper.size) != (width, font, size):
+            raise ValueError("IncrementalWrapper was created for a different width, font or size")
+        lines = wrapper.wrap(text)
+    else:
+        lines = wrap_text_to_width(text, width, font, size, algorithm=algorithm)
+    advances = _advance_table(font, size)
+
+    db.font(font)
+    db.fontSize(size)
+
+    # Start from top, move down
+    current_y = y - metrics['ascender']  # Position first baseline
+    lowest_baseline = -math.inf
+
+    if baseline_grid is not None:
+        line_spacing = _grid_line_spacing(baseline_grid, line_spacing)
+        lowest_baseline = baseline_grid.bottom - _BASELINE_EPSILON
+        snapped = baseline_grid.closest_line_below_coordinate(current_y)
+        current_y = snapped if snapped is not None else baseline_grid.bottom - line_spacing
+
+    first_baseline_drop = y - current_y
+
+    # Bottom boundary of text box
+    bottom_boundary = y - height
+
+    drawn = 0
+    for line in lines:
+        # Check if we have room (descender is negative, so + moves down)
+        line_bottom = current_y + metrics['descender']
+        if line_bottom < bottom_boundary or current_y < lowest_baseline:
+            break  # Stop if we'd overflow
+
+        # Calculate x position based on alignment
+        if align == "center":
+            line_x = x + (width - advances.measure(line)) / 2
+        elif align == "right":
+            line_x = x + width - advances.measure(line)
+        else:  # left
+            line_x = x
+
+        db.text(line, (line_x, current_y))
+        current_y -= line_spacing
+        drawn += 1
+
+    overflow_offset = None
+    overflow_text = ""
+    if drawn < len(lines):
+        overflow_offset = _line_offsets(text, lines[:drawn + 1])[drawn]
+        overflow_text = text[overflow_offset:]
+
+    return WrappedText(
+        y=current_y,
+        lines=lines[:drawn],
+        overflow_lines=lines[drawn:],
+        overflow_offset=overflow_offset,
+        height=_block_height(metrics, drawn, line_spacing, first_baseline_drop),
+        required_height=_block_height(metrics, len(lines), line_spacing, first_baseline_drop),
+        overflow_text=overflow_text,
+    )
+
+# ==================== TEXT FITTING ====================
+
+def fit_text_to_box(
+    text: str,
+    width: float,
+    height: float,
+    font: str,
+    min_size: float,
+    max_size: float,
+    leading_ratio: float = 1.5,
+    precision: float = 0.25,
+    algorithm: str = "greedy"
+) -> Tuple[float, List[str]]:
+    """
+    Find the largest font size at which text fits a box.
+
+    Bisects over point size. Advances scale linearly with size, so wrapping
+    at size s in a box of width w breaks exactly like wrapping at max_size in
+    a box of width w * max_size / s: every pass reuses the advance table and
+    metrics measured once at max_size. About log2((max - min) / precision)
+    layout passes, no drawing.
+
+    Fitting follows draw_wrapped_text: the first baseline sits one ascender
+    below the top and the last line's descender must stay inside the box.
+
+    Args:
+        text: Text to fit
+        width, height: Box dimensions
+        font: Font name
+        min_size, max_size: Point size range to search
+        leading_ratio: Line spacing ratio, as in draw_wrapped_text
+        precision: Stop when the size range is narrower than this (points)
+        algorithm: Line breaking, "greedy" or "optimal"
+
+    Returns:
+        (size, lines). If the text doesn't fit even at min_size, returns
+        min_size and its lines, which will overflow the box.
+
+    Example:
+        size, lines = fit_text_to_box(headline, *grid*(6, 2), "Helvetica Bold", 24, 120)
+        draw_wrapped_text(headline, x, y + h, w, h, "Helvetica Bold", size)
+    """
+    if min_size > max_size:
+        raise ValueError(f"min_size ({min_size}) must not exceed max_size ({max_size})")
+
+    reference = max_size
+    metrics = _font_metrics(font, reference)
+
+    def layout(size: float) -> Tuple[bool, List[str]]:
+        scale = size / reference
+        lines = wrap_text_to_width(text, width / scale, font, reference, algorithm=algorithm)
+        if not lines:
+            return True, lines
+        block = _block_height(metrics, len(lines), reference * leading_ratio) * scale
+        return block <= height, lines
+
+    fits, lines = layout(max_size)
+    if fits:
+        return max_size, lines
+
+    low = min_size
+    fits, low_lines = layout(low)
+    if not fits:
+        return min_size, low_lines
+
+    high = max_size
+    while high - low > precision:
+        middle = (low + high) / 2
+        fits, lines = layout(middle)
+        if fits:
+            low, low_lines = middle, lines
+        else:
+            high = middle
+
+    return low, low_lines
+
+# ==================== TEXT FLOW ====================
+
+# A text frame in DrawBot coordinates: (x, y, width, height), y at the bottom,
+# e.g. (*grid[(0, 0)], *grid * (6, 8))
+Frame = Tuple[float, float, float, float]
+
+
+@dataclass
+class FlowPage:
+    """A page filled by TextFlow.pages()."""
+    number: int          # 0-based page number
+    frames: List[Frame]  # Frames that received text
+    lines: int           # Lines drawn on the page
+
+
+class TextFlow:
+    """
+    Stream paragraphs through linked frames, opening pages on demand.
+
+    Paragraphs are pulled from the iterator one at a time and wrapped only
+    when they reach a frame (re-wrapped if the next frame is a different
+    width), so a long document never holds more than the current paragraph's
+    lines in memory.
+
+    Usage:
+        def new_page(number):
+            db.newPage(WIDTH, HEIGHT)
+            grid = create_page_grid(MARGIN, column_subdivisions=12)
+            return [(*grid[(0, 0)], *grid * (6, 8)), (*grid[(6, 0)], *grid * (6, 8))]
+
+        flow = TextFlow(read_paragraphs(), "Helvetica", REPORT_SCALE.body)
+        for page in flow.pages(new_page):
+            db.text(str(page.number + 1), (WIDTH / 2, MARGIN / 2))  # Folio
+
+        # Or fill frames by hand:
+        flow.fill((*grid[(0, 4)], *grid * (4, 4)))
+        if flow.has_more:
+            flow.fill((*grid[(4, 4)], *grid * (4, 4)))
+
+    Args:
+        paragraphs: Iterable of paragraph strings (consumed lazily)
+        font, size: Typography settings
+        leading_ratio: Line spacing ratio (as in draw_wrapped_text)
+        paragraph_spacing: Extra space between paragraphs in points
+        align: "left", "right", "center"
+        algorithm: Line breaking, "greedy" or "optimal"
+        baseline_grid: Optional BaselineGrid to snap every line to (as in
+            draw_wrapped_text); paragraph spacing also lands on grid lines,
+            so all frames on a page share baselines
+    """
+
+    def __init__(
+        self,
+        paragraphs: Iterable[str],
+        font: str,
+        size: float,
+        leading_ratio: float = 1.5,
+        paragraph_spacing: float = 0.0,
+        align: str = "left",
+        algorithm: str = "greedy",
+        baseline_grid=None
+    ):
+        self.font = font
+        self.size = size
+        self.leading_ratio = leading_ratio
+        self.paragraph_spacing = paragraph_spacing
+        self.align = align
+        self.algorithm = algorithm
+        self.baseline_grid = baseline_grid
+
+        self._paragraphs = iter(paragraphs)
+        self._text: Optional[str] = None   # Unset text of the current paragraph
+        self._lines: List[str] = []        # _text wrapped at _width
+        self._line_index = 0
+        self._width: Optional[float] = None
+
+    @property
+    def has_more(self) -> bool:
+        """True while text is left to flow (pulls the next paragraph if needed)."""
+        while self._text is None:
+            try:
+                paragraph = next(self._paragraphs)
+            except StopIteration:
+                return False
+            if paragraph.strip():
+                self._text = paragraph
+                self._lines = []
+                self._line_index = 0
+                self._width = None
+        return True
+
+    def _wrap_for(self, width: float) -> None:
+        """Wrap what is left of the current paragraph at a frame width."""
+        if self._width == width:
+            return
+        if self._width is not None and self._line_index:
+            offset = _line_offsets(self._text, self._lines[:self._line_index + 1])[self._line_index]
+            self._text = self._text[offset:]
+        self._lines = wrap_text_to_width(self._text, width, self.font, self.size, algorithm=self.algorithm)
+        self._line_index = 0
+        self._width = width
+
+    def fill(self, frame: Frame) -> int:
+        """
+        Draw as many lines as fit into one frame.
+
+        Returns:
+            Number of lines drawn
+        """
+        x, y, width, height = frame
+        metrics = _font_metrics(self.font, self.size)
+        advances = _advance_table(self.font, self.size)
+        line_spacing = self.size * self.leading_ratio
+        grid = self.baseline_grid
+
+        db.font(self.font)
+        db.fontSize(self.size)
+
+        baseline = y + height - metrics['ascender']
+        lowest_baseline = -math.inf
+        if grid is not None:
+            line_spacing = _grid_line_spacing(grid, line_spacing)
+            lowest_baseline = grid.bottom - _BASELINE_EPSILON
+        drawn = 0
+
+        while self.has_more:
+            self._wrap_for(width)
+
+            while self._line_index < len(self._lines):
+                if grid is not None:
+                    baseline = grid.closest_line_below_coordinate(baseline + _BASELINE_EPSILON)
+                    if baseline is None:
+                        return drawn  # Below the baseline grid
+                if baseline + metrics['descender'] < y or baseline < lowest_baseline:
+                    return drawn  # Frame is full
+
+                line = self._lines[self._line_index]
+                if self.align == "center":
+                    line_x = x + (width - advances.measure(line)) / 2
+                elif self.align == "right":
+                    line_x = x + width - advances.measure(line)
+                else:  # left
+                    line_x = x
+
+                db.text(line, (line_x, baseline))
+                baseline -= line_spacing
+                self._line_index += 1
+                drawn += 1
+
+            # Paragraph finished
+            self._text = None
+            baseline -= self.paragraph_spacing
+
+        return drawn
+
+    def pages(self, new_page: Callable[[int], List[Frame]]) -> Iterator[FlowPage]:
+        """
+        Fill pages until the text runs out, one page per iteration.
+
+        Args:
+            new_page: Called with the 0-based page number; creates the page
+                (e.g. db.newPage) and returns its frames in reading order
+
+        Yields:
+            FlowPage for each filled page, after its text is drawn
+        """
+        number = 0
+        while self.has_more:
+            frames = list(new_page(number))
+            if not frames:
+                raise ValueError(f"new_page returned no frames for page {number}")
+
+            used = []
+            lines = 0
+            for frame in frames:
+                if not self.has_more:
+                    break
+                lines += self.fill(frame)
+                used.append(frame)
+
+            if lines == 0:
+                raise ValueError(f"Frames on page {number} are too small for a single line")
+
+            yield FlowPage(number=number, frames=used, lines=lines)
+            number += 1
+
+# ==================== INCREMENTAL WRAPPING ====================
+
+# One breakable piece of a paragraph: (text, width, break_before, break_after, word_index)
+_WrapItem = Tuple[str, float, bool, bool, int]
+
+
+class IncrementalWrapper:
+    """
+    Greedy wrapper that keeps its line breaks between calls.
+
+    After an edit, only lines from just before the first changed word are
+    re-broken, and re-flow stops as soon as a line starts at the same place
+    in the unchanged tail as before. Results match wrap_text_to_width().
+
+    Usage:
+        wrapper = IncrementalWrapper(300, "Helvetica", 12)
+        lines = wrapper.wrap(text)
+        lines = wrapper.wrap(edited_text)  # re-breaks only around the edit
+
+        # Or let draw_wrapped_text reuse it across re-renders:
+        draw_wrapped_text(text, x, y, 300, h, "Helvetica", 12, wrapper=wrapper)
+    """
+
+    def __init__(
+        self,
+        width_in_points: float,
+        font: str,
+        size: float,
+        hyphenator: Optional[Hyphenator] = None
+    ):
+        self.width = width_in_points
+        self.font = font
+        self.size = size
+        self.hyphenator = hyphenator
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the previous layout; the next wrap starts from scratch."""
+        self._words: List[str] = []
+        self._word_items: List[List[_WrapItem]] = []
+        self._items: List[_WrapItem] = []
+        self._starts: List[int] = []
+        self._lines: List[str] = []
+        # Features/variations the kept widths were measured with
+        self._style: Optional[tuple] = None
+        # Lines re-broken by the last call (for diagnostics and tests)
+        self.reflowed_lines = 0
+
+    @property
+    def lines(self) -> List[str]:
+        return list(self._lines)
+
+    def _pieces(self, word: str, advances: _AdvanceTable) -> List[Tuple[str, float, bool, bool]]:
+        """Breakable pieces of a word: itself, or chunks if wider than the line."""
+        width = advances.measure(word)
+        if width <= self.width:
+            return [(word, width, False, False)]
+        chunks = _break_long_word(word, self.width, self.font, self.size, self.hyphenator)
+        return [
+            (chunk, advances.measure(chunk), i == 0, i < len(chunks) - 1)
+            for i, chunk in enumerate(chunks)
+        ]
+
+    def wrap(self, text: str) -> List[str]:
+        """Wrap text, re-using line breaks from the previous call where possible."""
+        style = (_features_key(), _variations_key())
+        if style != self._style:
+            # Kept widths were measured with other features or variations
+            self.reset()
+            self._style = style
+
+        words = text.split()
+        old_words = self._words
+        advances = _advance_table(self.font, self.size)
+
+        # Unchanged words at the start and end of the paragraph
+        limit = min(len(words), len(old_words))
+        prefix = 0
+        while prefix < limit and words[prefix] == old_words[prefix]:
+            prefix += 1
+        suffix = 0
+        while suffix < limit - prefix and words[-1 - suffix] == old_words[-1 - suffix]:
+            suffix += 1
+
+        if prefix == len(words) == len(old_words):
+            self.reflowed_lines = 0
+            return self.lines
+
+        # Re-use measured pieces for unchanged words, measure the rest
+        changed = [
+            [(*piece, 0) for piece in self._pieces(word, advances)]
+            for word in words[prefix:len(words) - suffix]
+        ]
+        word_items = (
+            self._word_items[:prefix]
+            + changed
+            + self._word_items[len(old_words) - suffix:]
+        )
+        items = [
+            (piece, width, before, after, index)
+            for index, pieces in enumerate(word_items)
+            for piece, width, before, after, _ in pieces
+        ]
+
+        # Items of the unchanged tail sit at a fixed offset from their old position
+        old_items = self._items
+        tail_start = len(items) - sum(len(pieces) for pieces in word_items[len(words) - suffix:])
+        offset = len(items) - len(old_items)
+        old_starts = {start: line for line, start in enumerate(self._starts)}
+
+        # Restart one line before the line holding the first changed word,
+        # since a shorter word may now fit on the previous line
+        first_changed = sum(len(pieces) for pieces in word_items[:prefix])
+        line = 0
+        while line + 1 < len(self._starts) and self._starts[line + 1] <= first_changed:
+            line += 1
+        line = max(0, line - 1)
+
+        starts = self._starts[:line]
+        lines = self._lines[:line]
+        start = self._starts[line] if line < len(self._starts) else 0
+
+        space_width = advances.advance(" ")
+        reflowed = 0
+        converged = None
+        current: List[str] = []
+        current_width = 0.0
+        line_start = start
+
+        def line_break(next_start: int) -> bool:
+            """Close the current line; True if layout converged at next_start."""
+            nonlocal current, current_width, line_start, reflowed, converged
+            starts.append(line_start)
+            lines.append(" ".join(current))
+            reflowed += 1
+            current = []
+            current_width = 0.0
+            line_start = next_start
+            if next_start >= tail_start and next_start - offset in old_starts:
+                converged = old_starts[next_start - offset]
+                return True
+            return False
+
+        for index in range(start, len(items)):
+            piece, width, before, after, _ = items[index]
+            if current and (before or current_width + space_width + width > self.width):
+                if line_break(index):
+                    break
+            current_width = current_width + space_width + width if current else width
+            current.append(piece)
+            if after and index + 1 < len(items):
+                if line_break(index + 1):
+                    break
+
+        if converged is not None:
+            starts.extend(old + offset for old in self._starts[converged:])
+            lines.extend(self._lines[converged:])
+        elif current:
+            starts.append(line_start)
+            lines.append(" ".join(current))
+            reflowed += 1
+
+        self._words = words
+        self._word_items = word_items
+        self._items = items
+        self._starts = starts
+        self._lines = lines
+        self.reflowed_lines = reflowed
+        return self.lines
+
+# ==================== BATCH WRAPPING ====================
+
+# A wrap request: (text, width_in_points, font, size)
+WrapBlock = Tuple[str, float, str, float]
+
+
+def _wrap_block(block: WrapBlock, algorithm: str) -> List[str]:
+    text, width, font, size = block
+    return wrap_text_to_width(text, width, font, size, algorithm=algorithm)
+
+
+def _wrap_chunk(
+    blocks: List[WrapBlock],
+    algorithm: str,
+    style: Tuple[tuple, tuple] = ((), ())
+) -> List[List[str]]:
+    """
+    Process-pool task: wrap a chunk of blocks with the worker's backend.
+
+    style is the caller's (features, variations) keys, applied first so
+    workers measure like the parent whatever the process start method.
+    """
+    features, variations = style
+    _active_features.clear()
+    _active_features.update(features)
+    _active_variations.clear()
+    _active_variations.update(variations)
+    return [_wrap_block(block, algorithm) for block in blocks]
+
+
+def wrap_many(
+    blocks: Iterable[WrapBlock],
+    workers: Optional[int] = None,
+    algorithm: str = "greedy"
+) -> List[List[str]]:
+    """
+    Wrap many independent text blocks at once.
+
+    Identical requests are wrapped once. With a headless measurement backend
+    (FontToolsBackend) unique blocks are spread over a process pool; with
+    DrawBot they are wrapped in this process, since DrawBot's drawing state
+    can't be shared across processes.
+
+    Args:
+        blocks: (text, width_in_points, font, size) tuples
+        workers: Worker processes (default: CPU count, 1 = no pool)
+        algorithm: Line breaking, "greedy" or "optimal"
+
+    Returns:
+        Wrapped lines for each block, in input order
+    """
+    blocks = [tuple(block) for block in blocks]
+    unique = list(dict.fromkeys(blocks))
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(unique))
+
+    if workers > 1 and getattr(_backend, 'headless', False):
+        from concurrent.futures import ProcessPoolExecutor
+
+        # A few chunks per worker balances load without per-block overhead
+        chunk_size = max(1, math.ceil(len(unique) / (workers * 4)))
+        chunks = [unique[i:i + chunk_size] for i in range(0, len(unique), chunk_size)]
+        style = (_features_key(), _variations_key())
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=set_measurement_backend,
+            initargs=(_backend,)
+        ) as pool:
+            wrapped = [
+                lines
+                for chunk_lines in pool.map(
+                    _wrap_chunk, chunks, [algorithm] * len(chunks), [style] * len(chunks)
+                )
+                for lines in chunk_lines
+            ]
+    else:
+        wrapped = [_wrap_block(block, algorithm) for block in unique]
+
+    results = dict(zip(unique, wrapped))
+    return [list(results[block]) for block in blocks]
 
-    # Don't forget the last line
-    if current_line_words:
-        lines.append(" ".join(current_line_words))
+# ==================== LAYOUT VALIDATION ====================
 
-    return lines
+class _StabbingTree:
+    """
+    Segment tree over fixed coordinates for interval stabbing queries.
 
+    Intervals (inclusive coordinate-index ranges) are inserted and removed
+    in O(log n); stab(i) reports every stored interval containing
+    coordinate index i in O(log n + k).
+    """
 
-def _break_long_word(word: str, max_width: float, font: str, size: float) -> List[str]:
+    def __init__(self, count: int):
+        self.size = 1
+        while self.size < count:
+            self.size *= 2
+        self.nodes: Dict[int, set] = {}
+
+    def _canonical(self, lo: int, hi: int) -> Iterator[int]:
+        lo += self.size
+        hi += self.size + 1
+        while lo < hi:
+            if lo & 1:
+                yield lo
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                yield hi
+            lo //= 2
+            hi //= 2
+
+    def add(self, lo: int, hi: int, item: int) -> None:
+        for node in self._canonical(lo, hi):
+            self.nodes.setdefault(node, set()).add(item)
+
+    def remove(self, lo: int, hi: int, item: int) -> None:
+        for node in self._canonical(lo, hi):
+            self.nodes[node].discard(item)
+
+    def stab(self, index: int) -> Iterator[int]:
+        node = index + self.size
+        while node:
+            items = self.nodes.get(node)
+            if items:
+                yield from items
+            node //= 2
+
+
+class _RangeTree:
     """
-    Break a word that's too wide for the column into multiple chunks.
+    Segment tree over fixed coordinates for range reporting.
 
-    Returns a list of chunks, each fitting within max_width (with hyphens added
-    to all but the last chunk).
+    Items are added at and removed from a coordinate index in O(log n);
+    report(lo, hi) yields every stored item whose index lies in the
+    inclusive range, descending only into non-empty nodes, in
+    O((1 + k) log n) for k reported items.
     """
-    db.font(font)
-    db.fontSize(size)
 
-    hyphen_width, _ = db.textSize("-")
-    available = max_width - hyphen_width
+    def __init__(self, count: int):
+        self.size = 1
+        while self.size < count:
+            self.size *= 2
+        self.counts = array('l', [0]) * (2 * self.size)
+        self.leaves: Dict[int, set] = {}
+
+    def _update(self, index: int, delta: int) -> None:
+        node = index + self.size
+        while node:
+            self.counts[node] += delta
+            node //= 2
+
+    def add(self, index: int, item: int) -> None:
+        self.leaves.setdefault(index, set()).add(item)
+        self._update(index, 1)
+
+    def remove(self, index: int, item: int) -> None:
+        self.leaves[index].remove(item)
+        self._update(index, -1)
+
+    def report(self, lo: int, hi: int) -> Iterator[int]:
+        counts = self.counts
+        stack = [(1, 0, self.size - 1)]
+        while stack:
+            node, node_lo, node_hi = stack.pop()
+            if not counts[node] or node_hi < lo or node_lo > hi:
+                continue
+            if node >= self.size:
+                yield from self.leaves[node_lo]
+                continue
+            mid = (node_lo + node_hi) // 2
+            stack.append((2 * node + 1, mid + 1, node_hi))
+            stack.append((2 * node, node_lo, mid))
+
+
+def _element_boxes(
+    elements: List[Dict[str, Any]],
+    page_width: Optional[float]
+) -> List[Tuple[float, float, float, float]]:
+    """(left, bottom, right, top) per element; no x/width spans the full width."""
+    boxes = []
+    for elem in elements:
+        if 'x' in elem and 'width' in elem:
+            left, right = elem['x'], elem['x'] + elem['width']
+        elif page_width:
+            left, right = 0.0, page_width
+        else:
+            left, right = -math.inf, math.inf
+        boxes.append((left, elem['y'] - elem['height'], right, elem['y']))
+    return boxes
 
-    chunks = []
-    remaining = word
 
-    while remaining:
-        # Check if remainder fits without hyphen
-        remaining_width, _ = db.textSize(remaining)
-        if remaining_width <= max_width:
-            chunks.append(remaining)
-            break
+def _overlapping_pairs(boxes: List[Tuple[float, float, float, float]]) -> List[Tuple[int, int]]:
+    """
+    Every pair of boxes whose interiors intersect (touching edges don't count).
+
+    Sweeps down the page by top edge. Boxes still crossing the sweep line
+    are kept in two x indexes: a range tree over left edges finds boxes
+    that start inside the new box's x range, and a stabbing tree finds
+    boxes that start before it and reach into it. Runs in
+    O((n + k) log n) for k reported pairs (plus edge-touching candidates,
+    which are filtered).
+    """
+    import heapq
 
-        # Find how many characters fit with hyphen
-        found_break = False
-        for i in range(len(remaining), 0, -1):
-            part_width, _ = db.textSize(remaining[:i])
-            if part_width <= available:
-                chunks.append(remaining[:i] + "-")
-                remaining = remaining[i:]
-                found_break = True
-                break
+    xs = sorted({x for left, _, right, _ in boxes for x in (left, right)})
+    x_index = {x: i for i, x in enumerate(xs)}
+    spans = _StabbingTree(len(xs))
+    lefts = _RangeTree(len(xs))
+    expiring: List[Tuple[float, int]] = []   # (-bottom, box) heap of active boxes
 
-        # Fallback: take at least one character to avoid infinite loop
-        if not found_break:
-            if remaining:
-                chunks.append(remaining[0] + "-")
-                remaining = remaining[1:]
-            else:
-                break
+    pairs = []
+    order = sorted(range(len(boxes)), key=lambda i: -boxes[i][3])
+    for i in order:
+        left, bottom, right, top = boxes[i]
+        lo, hi = x_index[left], x_index[right]
 
-    return chunks if chunks else [""]
+        # Retire boxes entirely above this one
+        while expiring and -expiring[0][0] > top:
+            _, j = heapq.heappop(expiring)
+            j_lo, j_hi = x_index[boxes[j][0]], x_index[boxes[j][2]]
+            lefts.remove(j_lo, j)
+            spans.remove(j_lo, j_hi, j)
 
-def draw_wrapped_text(
-    text: str,
-    x: float,
-    y: float,
-    width: float,
-    height: float,
-    font: str,
-    size: float,
-    leading_ratio: float = 1.5,
-    align: str = "left"
-) -> float:
+        candidates = set(spans.stab(lo))
+        candidates.update(lefts.report(lo, hi))
+
+        for j in candidates:
+            j_left, j_bottom, j_right, j_top = boxes[j]
+            if left < j_right and j_left < right and bottom < j_top and j_bottom < top:
+                pairs.append((j, i))
+
+        lefts.add(lo, i)
+        spans.add(lo, hi, i)
+        heapq.heappush(expiring, (-bottom, i))
+
+    return pairs
+
+
+def find_overlaps(
+    elements: List[Dict[str, Any]],
+    page_width: Optional[float] = None
+) -> List[Tuple[int, int, float]]:
     """
-    Draw wrapped text with proper metrics and return final y position.
+    Find all overlapping element pairs in 2D.
+
+    Elements without 'x'/'width' span the full page width.
 
     Args:
-        text: Text to draw
-        x, y: Top-left corner of text box
-        width, height: Box dimensions
-        font, size: Typography settings
-        leading_ratio: Line spacing ratio (default 1.5x from docs)
-        align: "left", "right", "center"
+        elements: Element dicts as for validate_layout_fit
+        page_width: Page width (used for full-width elements)
 
     Returns:
-        Final y position (baseline of last line drawn)
+        List of (upper_index, lower_index, vertical_overlap) sorted top-down
     """
-    db.font(font)
-    db.fontSize(size)
+    boxes = _element_boxes(elements, page_width)
+    overlaps = []
+    for a, b in _overlapping_pairs(boxes):
+        upper, lower = (a, b) if (boxes[a][3], -a) >= (boxes[b][3], -b) else (b, a)
+        overlap = min(boxes[a][3], boxes[b][3]) - max(boxes[a][1], boxes[b][1])
+        overlaps.append((upper, lower, overlap))
+    overlaps.sort(key=lambda o: (-boxes[o[0]][3], o[0], -boxes[o[1]][3], o[1]))
+    return overlaps
+
+
+def _boundary_issues(
+    name: str,
+    elem: Dict[str, Any],
+    page_height: float,
+    page_width: Optional[float] = None,
+    bleed: float = 0.0
+) -> List[str]:
+    """Page-boundary violations of one element (validate_layout_fit format)."""
+    issues = []
+    elem_top = elem['y']
+    elem_bottom = elem['y'] - elem['height']
 
-    # Get real metrics
-    metrics = get_text_metrics("M", font, size)  # Use cap height as reference
-    line_spacing = size * leading_ratio
+    # Check if element extends above page
+    if elem_top > page_height + bleed:
+        overhang = elem_top - page_height - bleed
+        issues.append(f"{name} extends {overhang:.1f}pt above page top")
 
-    # Wrap text to width
-    lines = wrap_text_to_width(text, width, font, size)
+    # Check if element extends below page
+    if elem_bottom < -bleed:
+        issues.append(f"{name} extends {abs(elem_bottom + bleed):.1f}pt below page bottom")
 
-    # Start from top, move down
-    current_y = y - metrics['ascender']  # Position first baseline
-    
-    # Bottom boundary of text box
-    bottom_boundary = y - height
+    # Check horizontal bounds if provided
+    if page_width and 'x' in elem and 'width' in elem:
+        if elem['x'] < -bleed:
+            issues.append(f"{name} extends {abs(elem['x'] + bleed):.1f}pt past left edge")
+        if elem['x'] + elem['width'] > page_width + bleed:
+            overhang = (elem['x'] + elem['width']) - page_width - bleed
+            issues.append(f"{name} extends {overhang:.1f}pt past right edge")
 
-    for line in lines:
-        # Check if we have room (descender is negative, so + moves down)
-        line_bottom = current_y + metrics['descender']
-        if line_bottom < bottom_boundary:
-            break  # Stop if we'd overflow
+    return issues
 
-        # Calculate x position based on alignment
-        if align == "center":
-            line_width, _ = db.textSize(line)
-            line_x = x + (width - line_width) / 2
-        elif align == "right":
-            line_width, _ = db.textSize(line)
-            line_x = x + width - line_width
-        else:  # left
-            line_x = x
 
-        db.text(line, (line_x, current_y))
-        current_y -= line_spacing
+def find_layout_issues(
+    elements: List[Dict[str, Any]],
+    page_height: float,
+    page_width: Optional[float] = None
+) -> List[str]:
+    """
+    Every page-boundary violation and overlap in a layout, top-down.
+
+    Same inputs as validate_layout_fit(); returns one message per problem.
+    """
+    issues = []
+    names = [elem.get('name', f'Element {i}') for i, elem in enumerate(elements)]
 
-    return current_y
+    for i in sorted(range(len(elements)), key=lambda i: -elements[i]['y']):
+        issues.extend(_boundary_issues(names[i], elements[i], page_height, page_width))
+
+    for upper, lower, overlap in find_overlaps(elements, page_width):
+        issues.append(f"{names[upper]} overlaps {names[lower]} by {overlap:.1f}pt")
+
+    return issues
 
-# ==================== LAYOUT VALIDATION ====================
 
 def validate_layout_fit(
     elements: List[Dict[str, Any]],
@@ -386,6 +2708,9 @@ def validate_layout_fit(
     - y is the TOP of the element
     - Element extends from y down to (y - height)
 
+    Overlaps are checked in 2D between every pair of elements (not only
+    vertical neighbours); elements without 'x'/'width' span the full width.
+
     Args:
         elements: List of dicts with:
             - 'y': float - Top Y coordinate
@@ -397,49 +2722,306 @@ def validate_layout_fit(
         page_width: Total page width (optional, for horizontal checks)
 
     Returns:
-        (fits: bool, error_message: Optional[str])
+        (fits: bool, error_message: Optional[str]) - the message lists every
+        problem found, one per line (see find_layout_issues)
     """
     if not elements:
         return True, None
 
-    # Sort by y position (top to bottom, highest y first)
-    sorted_elements = sorted(elements, key=lambda e: e['y'], reverse=True)
-
-    for i, elem in enumerate(sorted_elements):
-        elem_top = elem['y']
-        elem_bottom = elem['y'] - elem['height']
-        elem_name = elem.get('name', f'Element {i}')
-
-        # Check if element extends above page
-        if elem_top > page_height:
-            overhang = elem_top - page_height
-            return False, f"{elem_name} extends {overhang:.1f}pt above page top"
-
-        # Check if element extends below page
-        if elem_bottom < 0:
-            return False, f"{elem_name} extends {abs(elem_bottom):.1f}pt below page bottom"
-
-        # Check horizontal bounds if provided
-        if page_width and 'x' in elem and 'width' in elem:
-            if elem['x'] < 0:
-                return False, f"{elem_name} extends {abs(elem['x']):.1f}pt past left edge"
-            if elem['x'] + elem['width'] > page_width:
-                overhang = (elem['x'] + elem['width']) - page_width
-                return False, f"{elem_name} extends {overhang:.1f}pt past right edge"
-
-        # Check for overlaps with elements below
-        if i < len(sorted_elements) - 1:
-            next_elem = sorted_elements[i + 1]
-            next_top = next_elem['y']
-            next_name = next_elem.get('name', f'Element {i+1}')
-
-            # Overlap occurs if current bottom is below next top
-            if elem_bottom < next_top:
-                overlap = next_top - elem_bottom
-                return False, f"{elem_name} overlaps {next_name} by {overlap:.1f}pt"
-
+    issues = find_layout_issues(elements, page_height, page_width)
+    if issues:
+        return False, "\n".join(issues)
     return True, None
 
+class LayoutError(ValueError):
+    """A placed element overlaps another or leaves the page."""
+
+    def __init__(self, issues: List[str]):
+        super().__init__("\n".join(issues))
+        self.issues = issues
+
+
+# Elements on the same layer must not overlap. Shapes default to no layer
+# (backgrounds, bars and decorations sit under content by design) and are
+# only checked against the page edges. Images get their own layer, so text
+# may sit on a photo but two photos may not collide.
+DEFAULT_LAYERS = {
+    'rect': None,
+    'oval': None,
+    'line': None,
+    'text': 'content',
+    'image': 'image',
+}
+
+_DEFAULT_LAYER = object()
+
+
+class LayoutTracker:
+    """
+    Validate a page incrementally, as elements are placed.
+
+    Each placement is checked against the page edges and, through a
+    uniform-grid spatial hash, against earlier elements on the same layer,
+    so a broken layout fails at the offending element rather than after
+    the whole page has been drawn and exported.
+
+    Boxes use DrawBot's convention: (x, y) is the bottom-left corner.
+
+    Example:
+        tracker = LayoutTracker(WIDTH, HEIGHT)
+        tracker.text(x, y, w, h, name="Body")
+        tracker.text(x, y, w, h, name="Caption")   # raises LayoutError on overlap
+
+    Args:
+        page_width: Page width in points
+        page_height: Page height in points
+        strict: Raise LayoutError as soon as a problem occurs; otherwise
+            problems are collected in `issues`
+        bleed: Distance elements may extend past the page edges
+        cell_size: Spatial hash cell size (default: 1/16 of the longer page side)
+    """
+
+    def __init__(
+        self,
+        page_width: float,
+        page_height: float,
+        strict: bool = True,
+        bleed: float = 0.0,
+        cell_size: Optional[float] = None
+    ):
+        if page_width <= 0 or page_height <= 0:
+            raise ValueError(f"Page size must be positive, got {page_width}x{page_height}")
+        self.page_width = page_width
+        self.page_height = page_height
+        self.strict = strict
+        self.bleed = bleed
+        self.cell_size = cell_size or max(page_width, page_height) / 16
+        self.new_page()
+
+    def new_page(self) -> None:
+        """Forget all placed elements and issues."""
+        self.elements: List[Dict[str, Any]] = []
+        self.issues: List[str] = []
+        self._cells: Dict[Tuple[Any, int, int], List[int]] = {}
+
+    def _cell_range(self, left: float, bottom: float, right: float, top: float):
+        size = self.cell_size
+        return (
+            range(math.floor(left / size), math.floor(right / size) + 1),
+            range(math.floor(bottom / size), math.floor(top / size) + 1),
+        )
+
+    def place(
+        self,
+        kind: str,
+        x: float,
+        y: float,
+        width: float,
+        height: float,
+        name: Optional[str] = None,
+        layer: Any = _DEFAULT_LAYER
+    ) -> List[str]:
+        """
+        Record an element and check it against the page and earlier elements.
+
+        Args:
+            kind: 'rect', 'oval', 'line', 'text', 'image' (or any label)
+            x, y: Bottom-left corner
+            width, height: Element size (negative sizes are normalized)
+            name: Name for messages (default "Element <index>")
+            layer: Overlap layer; None disables overlap checks for this
+                element (default from DEFAULT_LAYERS, else 'content')
+
+        Returns:
+            New issues caused by this element (empty when it fits)
+
+        Raises:
+            LayoutError: In strict mode, when there are new issues
+        """
+        if width < 0:
+            x, width = x + width, -width
+        if height < 0:
+            y, height = y + height, -height
+        if layer is _DEFAULT_LAYER:
+            layer = DEFAULT_LAYERS.get(kind, 'content')
+
+        index = len(self.elements)
+        name = name or f"Element {index}"
+        elem = {'x': x, 'y': y + height, 'width': width, 'height': height,
+                'name': name, 'kind': kind, 'layer': layer}
+        self.elements.append(elem)
+
+        issues = _boundary_issues(name, elem, self.page_height, self.page_width, self.bleed)
+
+        if layer is not None:
+            left, bottom, right, top = x, y, x + width, y + height
+            columns, rows = self._cell_range(left, bottom, right, top)
+            seen = set()
+            hits = []
+            for col in columns:
+                for row in rows:
+                    bucket = self._cells.setdefault((layer, col, row), [])
+                    for j in bucket:
+                        if j in seen:
+                            continue
+                        seen.add(j)
+                        other = self.elements[j]
+                        o_bottom = other['y'] - other['height']
+                        if (left < other['x'] + other['width'] and other['x'] < right
+                                and bottom < other['y'] and o_bottom < top):
+                            overlap = min(top, other['y']) - max(bottom, o_bottom)
+                            upper, lower = (other, elem) if other['y'] >= top else (elem, other)
+                            hits.append((j, f"{upper['name']} overlaps {lower['name']} by {overlap:.1f}pt"))
+                    bucket.append(index)
+            issues.extend(message for _, message in sorted(hits))
+
+        if issues:
+            self.issues.extend(issues)
+            if self.strict:
+                raise LayoutError(issues)
+        return issues
+
+    def rect(self, x: float, y: float, width: float, height: float,
+             name: Optional[str] = None, layer: Any = _DEFAULT_LAYER) -> List[str]:
+        """Record a rectangle (see place())."""
+        return self.place('rect', x, y, width, height, name, layer)
+
+    def oval(self, x: float, y: float, width: float, height: float,
+             name: Optional[str] = None, layer: Any = _DEFAULT_LAYER) -> List[str]:
+        """Record an oval by its bounding box (see place())."""
+        return self.place('oval', x, y, width, height, name, layer)
+
+    def text(self, x: float, y: float, width: float, height: float,
+             name: Optional[str] = None, layer: Any = _DEFAULT_LAYER) -> List[str]:
+        """Record a text block by its box (see place())."""
+        return self.place('text', x, y, width, height, name, layer)
+
+    def image(self, x: float, y: float, width: float, height: float,
+              name: Optional[str] = None, layer: Any = _DEFAULT_LAYER) -> List[str]:
+        """Record an image by its drawn box (see place())."""
+        return self.place('image', x, y, width, height, name, layer)
+
+    def line(self, start: Tuple[float, float], end: Tuple[float, float],
+             name: Optional[str] = None, layer: Any = _DEFAULT_LAYER) -> List[str]:
+        """Record a line by its bounding box (see place())."""
+        (x1, y1), (x2, y2) = start, end
+        return self.place('line', min(x1, x2), min(y1, y2), abs(x2 - x1), abs(y2 - y1),
+                          name, layer)
+
+    def validate(self) -> Tuple[bool, Optional[str]]:
+        """Result for the page so far, in validate_layout_fit() form."""
+        if self.issues:
+            return False, "\n".join(self.issues)
+        return True, None
+
+    def __len__(self) -> int:
+        return len(self.elements)
+
+
+def _validate_page_record(
+    page: Any,
+    record: Any,
+    page_height: Optional[float],
+    page_width: Optional[float]
+) -> Dict[str, Any]:
+    """Validate one page record (see validate_layouts); never raises."""
+    import json
+    import time
+
+    start = time.perf_counter()
+    result: Dict[str, Any] = {'page': page}
+    try:
+        if isinstance(record, (str, bytes)):
+            record = json.loads(record)
+        if isinstance(record, dict):
+            result['page'] = record.get('page', page)
+            elements = record['elements']
+            page_height = record.get('page_height', page_height)
+            page_width = record.get('page_width', page_width)
+        else:
+            elements = record
+        if not isinstance(elements, list):
+            raise ValueError(f"elements must be a list, got {type(elements).__name__}")
+        for index, elem in enumerate(elements):
+            if not isinstance(elem, dict):
+                raise ValueError(f"element {index} must be an object, got {type(elem).__name__}")
+        if page_height is None:
+            raise ValueError("page_height is required")
+        issues = find_layout_issues(elements, page_height, page_width)
+        result.update(fits=not issues, issues=issues, elements=len(elements))
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
+        reason = f"missing key {e}" if isinstance(e, KeyError) else str(e)
+        result.update(fits=False, error=reason, elements=0)
+    result['ms'] = round((time.perf_counter() - start) * 1000, 3)
+    return result
+
+
+def _validate_page_batch(
+    batch: List[Tuple[int, Any]],
+    page_height: Optional[float],
+    page_width: Optional[float]
+) -> List[Dict[str, Any]]:
+    return [_validate_page_record(i, record, page_height, page_width) for i, record in batch]
+
+
+def validate_layouts(
+    pages: Iterable[Any],
+    page_height: Optional[float] = None,
+    page_width: Optional[float] = None,
+    workers: Optional[int] = None,
+    chunksize: int = 64
+) -> Iterator[Dict[str, Any]]:
+    """
+    Validate many pages, in parallel, yielding one report record per page.
+
+    Each page is either a list of elements (as for validate_layout_fit) or
+    a dict with 'elements' and optional 'page', 'page_height' and
+    'page_width'. Pages may also be given as JSON strings (e.g. raw JSONL
+    lines), which are parsed in the workers.
+
+    Results come back in input order:
+        {'page': 0, 'fits': False, 'issues': [...], 'elements': 12, 'ms': 0.4}
+    Malformed pages get fits=False and an 'error' message instead of issues.
+
+    Args:
+        pages: Iterable of page records (consumed lazily)
+        page_height: Default page height for records without one
+        page_width: Default page width for records without one
+        workers: Worker processes (default: CPU count; 0 or 1 runs in-process)
+        chunksize: Pages per task sent to a worker
+
+    Returns:
+        Iterator of per-page result dicts
+    """
+    from itertools import islice
+
+    if chunksize < 1:
+        raise ValueError(f"chunksize must be at least 1, got {chunksize}")
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    numbered = enumerate(pages)
+    batches = iter(lambda: list(islice(numbered, chunksize)), [])
+
+    if workers <= 1:
+        for batch in batches:
+            yield from _validate_page_batch(batch, page_height, page_width)
+        return
+
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor
+
+    # Keep a bounded number of batches in flight so huge inputs stream
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for batch in batches:
+            pending.append(pool.submit(_validate_page_batch, batch, page_height, page_width))
+            if len(pending) >= workers * 4:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
 # ==================== SPACING HELPERS ====================
 
 def get_spacing_for_context(context: str = "poster") -> dict:
@@ -541,7 +3123,6 @@ def setup_poster_page(
 # ==================== COLOR HARMONY ====================
 
 import colorsys
-import math
 
 def hex_to_rgb(hex_color: str) -> Tuple[float, float, float]:
     """Convert hex color (#RRGGBB or RRGGBB) to RGB (0-1 range)."""
@@ -576,6 +3157,26 @@ def _rotate_hue(r: float, g: float, b: float, degrees: float) -> Tuple[float, fl
     h = (h + degrees / 360) % 1.0
     return colorsys.hls_to_rgb(h, l, s)
 
+# Palette recipes: (operation, amount) per color, in palette order.
+# 'light' adjusts lightness by a factor, 'hue' rotates by degrees.
+_BACKGROUND_AND_TEXT = [('light', 0.7), ('light', -0.6), ('base', 0)]
+HARMONIES = {
+    "complementary": _BACKGROUND_AND_TEXT + [('hue', 180)],
+    "analogous": _BACKGROUND_AND_TEXT + [('hue', 30), ('hue', -30)],
+    "triadic": _BACKGROUND_AND_TEXT + [('hue', 120), ('hue', 240)],
+    "split_complementary": _BACKGROUND_AND_TEXT + [('hue', 150), ('hue', 210)],
+    "tetradic": _BACKGROUND_AND_TEXT + [('hue', 90), ('hue', 180), ('hue', 270)],
+    "monochromatic": [('light', 0.7), ('light', -0.7), ('base', 0),
+                      ('light', 0.3), ('light', -0.3)],
+}
+PALETTE_ROLES = ("background", "text", "accent", "accent2", "accent3", "accent4")
+
+def _harmony_recipe(harmony: str) -> List[Tuple[str, float]]:
+    try:
+        return HARMONIES[harmony]
+    except KeyError:
+        raise ValueError(f"Unknown harmony type: {harmony}. Use: complementary, analogous, triadic, split_complementary, tetradic, monochromatic")
+
 def generate_color_palette(
     base_color: Tuple[float, float, float],
     harmony: str = "complementary",
@@ -600,91 +3201,144 @@ def generate_color_palette(
         or list of RGB tuples
     """
     r, g, b = base_color
+    colors = []
+    for op, amount in _harmony_recipe(harmony):
+        if op == 'light':
+            colors.append(adjust_lightness(r, g, b, amount))
+        elif op == 'hue':
+            colors.append(_rotate_hue(r, g, b, amount))
+        else:
+            colors.append(base_color)
 
-    if harmony == "complementary":
-        complement = _rotate_hue(r, g, b, 180)
-        colors = [
-            adjust_lightness(r, g, b, 0.7),      # Light background from base
-            adjust_lightness(r, g, b, -0.6),     # Dark text from base
-            base_color,                           # Primary accent
-            complement                            # Complementary accent
-        ]
+    if not as_dict:
+        return colors
 
-    elif harmony == "analogous":
-        analog1 = _rotate_hue(r, g, b, 30)
-        analog2 = _rotate_hue(r, g, b, -30)
-        colors = [
-            adjust_lightness(r, g, b, 0.7),
-            adjust_lightness(r, g, b, -0.6),
-            base_color,
-            analog1,
-            analog2
-        ]
+    return dict(zip(PALETTE_ROLES, colors))
 
-    elif harmony == "triadic":
-        triad1 = _rotate_hue(r, g, b, 120)
-        triad2 = _rotate_hue(r, g, b, 240)
-        colors = [
-            adjust_lightness(r, g, b, 0.7),
-            adjust_lightness(r, g, b, -0.6),
-            base_color,
-            triad1,
-            triad2
-        ]
+def rgb_to_hls_array(rgb: Any) -> Any:
+    """
+    Vectorized colorsys.rgb_to_hls.
 
-    elif harmony == "split_complementary":
-        split1 = _rotate_hue(r, g, b, 150)
-        split2 = _rotate_hue(r, g, b, 210)
-        colors = [
-            adjust_lightness(r, g, b, 0.7),
-            adjust_lightness(r, g, b, -0.6),
-            base_color,
-            split1,
-            split2
-        ]
+    Args:
+        rgb: Array-like of shape (..., 3), RGB in 0-1 range
 
-    elif harmony == "tetradic":
-        color2 = _rotate_hue(r, g, b, 90)
-        color3 = _rotate_hue(r, g, b, 180)
-        color4 = _rotate_hue(r, g, b, 270)
-        colors = [
-            adjust_lightness(r, g, b, 0.7),
-            adjust_lightness(r, g, b, -0.6),
-            base_color,
-            color2,
-            color3,
-            color4
-        ]
+    Returns:
+        numpy array of shape (..., 3) with H, L, S (same values as colorsys)
+    """
+    np = _get_numpy()
+    rgb = np.asarray(rgb, dtype=float)
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    maxc = rgb.max(axis=-1)
+    minc = rgb.min(axis=-1)
+    sumc = maxc + minc
+    rangec = maxc - minc
+    l = sumc / 2.0
+    grey = rangec == 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        s = np.where(l <= 0.5, rangec / sumc, rangec / (2.0 - sumc))
+        rc = (maxc - r) / rangec
+        gc = (maxc - g) / rangec
+        bc = (maxc - b) / rangec
+    h = np.where(r == maxc, bc - gc, np.where(g == maxc, 2.0 + rc - bc, 4.0 + gc - rc))
+    h = (h / 6.0) % 1.0
+    h[grey] = 0.0
+    s[grey] = 0.0
+    return np.stack([h, l, s], axis=-1)
+
+def hls_to_rgb_array(hls: Any) -> Any:
+    """
+    Vectorized colorsys.hls_to_rgb.
 
-    elif harmony == "monochromatic":
-        colors = [
-            adjust_lightness(r, g, b, 0.7),      # Very light
-            adjust_lightness(r, g, b, -0.7),     # Very dark
-            base_color,                           # Base
-            adjust_lightness(r, g, b, 0.3),      # Light variation
-            adjust_lightness(r, g, b, -0.3)      # Dark variation
-        ]
+    Args:
+        hls: Array-like of shape (..., 3) with H, L, S in 0-1 range
 
-    else:
-        raise ValueError(f"Unknown harmony type: {harmony}. Use: complementary, analogous, triadic, split_complementary, tetradic, monochromatic")
+    Returns:
+        numpy array of shape (..., 3), RGB in 0-1 range
+    """
+    np = _get_numpy()
+    hls = np.asarray(hls, dtype=float)
+    h, l, s = hls[..., 0], hls[..., 1], hls[..., 2]
+    m2 = np.where(l <= 0.5, l * (1.0 + s), l + s - (l * s))
+    m1 = 2.0 * l - m2
+
+    def channel(hue):
+        hue = hue % 1.0
+        return np.select(
+            [hue < 1 / 6, hue < 0.5, hue < 2 / 3],
+            [m1 + (m2 - m1) * hue * 6.0, m2, m1 + (m2 - m1) * (2 / 3 - hue) * 6.0],
+            m1,
+        )
+
+    rgb = np.stack([channel(h + 1 / 3), channel(h), channel(h - 1 / 3)], axis=-1)
+    grey = s == 0.0
+    rgb[grey] = l[grey, None]
+    return rgb
+
+def _adjusted_lightness(l: Any, factor: float) -> Any:
+    np = _get_numpy()
+    return np.clip(l + factor * ((1 - l) if factor > 0 else l), 0, 1)
+
+def adjust_lightness_array(rgb: Any, factor: float) -> Any:
+    """
+    Vectorized adjust_lightness() over an (..., 3) array of RGB colors.
 
-    if not as_dict:
-        return colors
+    Returns:
+        numpy array of shape (..., 3)
+    """
+    hls = rgb_to_hls_array(rgb)
+    hls[..., 1] = _adjusted_lightness(hls[..., 1], factor)
+    return hls_to_rgb_array(hls)
 
-    result = {
-        "background": colors[0],
-        "text": colors[1],
-        "accent": colors[2]
-    }
-    if len(colors) > 3:
-        result["accent2"] = colors[3]
-    if len(colors) > 4:
-        result["accent3"] = colors[4]
-    if len(colors) > 5:
-        result["accent4"] = colors[5]
+def rotate_hue_array(rgb: Any, degrees: float) -> Any:
+    """
+    Rotate the hue of an (..., 3) array of RGB colors by degrees.
 
-    return result
+    Returns:
+        numpy array of shape (..., 3)
+    """
+    hls = rgb_to_hls_array(rgb)
+    hls[..., 0] = (hls[..., 0] + degrees / 360) % 1.0
+    return hls_to_rgb_array(hls)
+
+def generate_color_palettes(base_colors: Any, harmony: str = "complementary") -> Any:
+    """
+    Vectorized generate_color_palette() for many base colors at once.
+
+    Each base color is converted to HLS once; every palette color is then
+    built for all bases in a single array operation.
+
+    Args:
+        base_colors: Array-like of shape (N, 3), RGB in 0-1 range
+        harmony: Harmony type (see generate_color_palette)
+
+    Returns:
+        numpy array of shape (N, K, 3): K colors per palette, in the order
+        of generate_color_palette(..., as_dict=False) (roles: PALETTE_ROLES)
+    """
+    np = _get_numpy()
+    recipe = _harmony_recipe(harmony)
+    base = np.asarray(base_colors, dtype=float)
+    if base.ndim != 2 or base.shape[1] != 3:
+        raise ValueError(f"base_colors must have shape (N, 3), got {base.shape}")
+
+    hls = rgb_to_hls_array(base)
+    out = np.empty((len(base), len(recipe), 3))
+    for k, (op, amount) in enumerate(recipe):
+        if op == 'base':
+            out[:, k] = base
+            continue
+        varied = hls.copy()
+        if op == 'light':
+            varied[:, 1] = _adjusted_lightness(hls[:, 1], amount)
+        else:
+            varied[:, 0] = (hls[:, 0] + amount / 360) % 1.0
+        out[:, k] = hls_to_rgb_array(varied)
+    return out
+
+# Minimum contrast ratio per WCAG level, strictest first
+WCAG_LEVELS = {"AAA": 7.0, "AA": 4.5, "AA-large": 3.0}
 
+@lru_cache(maxsize=4096)
 def _relative_luminance(r: float, g: float, b: float) -> float:
     """Calculate relative luminance per WCAG 2.1."""
     def adjust(c):
@@ -717,17 +3371,89 @@ def check_contrast_ratio(
 
     ratio = (lighter + 0.05) / (darker + 0.05)
 
-    if ratio >= 7:
-        level = "AAA"
-    elif ratio >= 4.5:
-        level = "AA"
-    elif ratio >= 3:
-        level = "AA-large"
-    else:
-        level = "fail"
+    level = next((name for name, minimum in WCAG_LEVELS.items() if ratio >= minimum), "fail")
 
     return ratio, level
 
+def relative_luminance_array(colors: Any) -> Any:
+    """
+    Vectorized _relative_luminance() for an (..., 3) array of RGB colors.
+
+    Returns:
+        numpy array of shape (...)
+    """
+    np = _get_numpy()
+    rgb = np.asarray(colors, dtype=float)
+    linear = np.where(rgb <= 0.03928, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+    return linear @ np.array([0.2126, 0.7152, 0.0722])
+
+def contrast_matrix(colors: Any, backgrounds: Any = None) -> Tuple[Any, Any]:
+    """
+    WCAG contrast ratios and levels for every pair of colors in one pass.
+
+    Luminance is computed once per color, then all ratios are broadcast
+    from the two luminance vectors.
+
+    Args:
+        colors: Array-like of shape (N, 3), RGB in 0-1 range (foregrounds)
+        backgrounds: Optional (M, 3) array; defaults to `colors` (N x N)
+
+    Returns:
+        Tuple of (ratios, levels): float array of shape (N, M) and string
+        array of the same shape with check_contrast_ratio() levels
+    """
+    np = _get_numpy()
+    fg = np.asarray(colors, dtype=float)
+    bg = fg if backgrounds is None else np.asarray(backgrounds, dtype=float)
+    for name, arr in (("colors", fg), ("backgrounds", bg)):
+        if arr.ndim != 2 or arr.shape[1] != 3:
+            raise ValueError(f"{name} must have shape (N, 3), got {arr.shape}")
+
+    fg_lum = relative_luminance_array(fg)
+    bg_lum = fg_lum if backgrounds is None else relative_luminance_array(bg)
+    lum1 = fg_lum[:, None]
+    lum2 = bg_lum[None, :]
+    ratios = (np.maximum(lum1, lum2) + 0.05) / (np.minimum(lum1, lum2) + 0.05)
+
+    levels = np.select(
+        [ratios >= minimum for minimum in WCAG_LEVELS.values()],
+        list(WCAG_LEVELS),
+        "fail",
+    )
+    return ratios, levels
+
+def find_accessible_pairs(
+    colors: Any,
+    backgrounds: Any = None,
+    level: str = "AA"
+) -> List[Tuple[int, int, float]]:
+    """
+    Find all text/background pairs that meet a WCAG level.
+
+    Args:
+        colors: (N, 3) RGB array of text colors (0-1 range)
+        backgrounds: Optional (M, 3) background colors; defaults to `colors`,
+            in which case a color is never paired with itself
+        level: "AAA", "AA" or "AA-large"
+
+    Returns:
+        List of (text_index, background_index, ratio), highest ratio first
+    """
+    np = _get_numpy()
+    if level not in WCAG_LEVELS:
+        raise ValueError(f"Unknown WCAG level: {level}. Use: {', '.join(WCAG_LEVELS)}")
+
+    ratios, _ = contrast_matrix(colors, backgrounds)
+    passing = ratios >= WCAG_LEVELS[level]
+    if backgrounds is None:
+        np.fill_diagonal(passing, False)
+
+    text, background = np.nonzero(passing)
+    found = ratios[text, background]
+    order = np.argsort(-found, kind="stable")
+    return [(int(i), int(j), float(r))
+            for i, j, r in zip(text[order], background[order], found[order])]
+
 def get_accessible_text_color(
     background: Tuple[float, float, float],
     prefer_dark: bool = True
@@ -815,6 +3541,7 @@ def set_opentype_features(features: List[str], enable: bool = True) -> None:
     """
     for feature in features:
         db.openTypeFeatures(**{feature: enable})
+        _active_features[feature] = enable
 
 def get_available_opentype_features(font_name: str = None) -> Dict[str, str]:
     """
@@ -859,21 +3586,40 @@ def set_font_variation(axes: Dict[str, float] = None, **kwargs) -> None:
     axes.update(kwargs)
     db.fontVariations(**axes)
 
+    if axes.get('resetVariations'):
+        _active_variations.clear()
+    _active_variations.update({tag: value for tag, value in axes.items() if tag != 'resetVariations'})
+
 def get_font_variation_axes(font_name: str = None) -> Dict[str, Dict[str, float]]:
     """
     Get available variable font axes for current or specified font.
 
+    A named font becomes DrawBot's current font (except with a headless
+    measurement backend), ready for set_font_variation(); the axes
+    themselves are cached per font.
+
     Args:
         font_name: Font to query (uses current font if None)
 
     Returns:
         Dict of {axis_tag: {'minValue': x, 'defaultValue': y, 'maxValue': z}}
     """
-    if font_name:
+    if font_name is None:
+        try:
+            return db.listFontVariations()
+        except Exception:
+            return {}
+
+    if not getattr(_backend, 'headless', False):
         db.font(font_name)
+    return {tag: dict(axis) for tag, axis in _cached_variation_axes(font_name).items()}
+
 
+@lru_cache(maxsize=METRICS_CACHE_SIZE)
+def _cached_variation_axes(font_name: str) -> Dict[str, Dict[str, float]]:
+    """Query a font's axes through the measurement backend once."""
     try:
-        return db.listFontVariations()
+        return _backend.variation_axes(font_name) or {}
     except Exception:
         return {}
 
@@ -1029,6 +3775,201 @@ def validate_print_ready(
 
     return is_valid, warnings + recommendations
 
+# ==================== TEXT OUTLINES ====================
+
+# Maximum number of flattened glyph outlines kept in memory
+OUTLINE_CACHE_SIZE = 4096
+
+# Maximum deviation of flattened curves from the true outline, in font units
+OUTLINE_TOLERANCE = 0.5
+
+class _FlattenPen(BasePen):
+    """Collect contours as polylines, subdividing curves (Wang's formula)."""
+
+    def __init__(self, tolerance: float):
+        super().__init__(glyphSet=None)
+        self.tolerance = tolerance
+        self.points = array('d')
+        self.contour_ends = array('I')
+
+    def _moveTo(self, pt):
+        self._close()
+        self.points.extend(pt)
+
+    def _lineTo(self, pt):
+        self.points.extend(pt)
+
+    def _curveToOne(self, pt1, pt2, pt3):
+        (x0, y0), (x1, y1), (x2, y2), (x3, y3) = self._getCurrentPoint(), pt1, pt2, pt3
+        deviation = max(math.hypot(x0 - 2 * x1 + x2, y0 - 2 * y1 + y2),
+                        math.hypot(x1 - 2 * x2 + x3, y1 - 2 * y2 + y3))
+        steps = max(1, math.ceil(math.sqrt(0.75 * deviation / self.tolerance)))
+        for i in range(1, steps + 1):
+            t = i / steps
+            mt = 1 - t
+            a, b, c, d = mt * mt * mt, 3 * mt * mt * t, 3 * mt * t * t, t * t * t
+            self.points.extend((a * x0 + b * x1 + c * x2 + d * x3,
+                                a * y0 + b * y1 + c * y2 + d * y3))
+
+    def _qCurveToOne(self, pt1, pt2):
+        (x0, y0), (x1, y1), (x2, y2) = self._getCurrentPoint(), pt1, pt2
+        deviation = math.hypot(x0 - 2 * x1 + x2, y0 - 2 * y1 + y2)
+        steps = max(1, math.ceil(math.sqrt(0.25 * deviation / self.tolerance)))
+        for i in range(1, steps + 1):
+            t = i / steps
+            mt = 1 - t
+            a, b, c = mt * mt, 2 * mt * t, t * t
+            self.points.extend((a * x0 + b * x1 + c * x2, a * y0 + b * y1 + c * y2))
+
+    def _closePath(self):
+        self._close()
+
+    def _endPath(self):
+        self._close()
+
+    def _close(self):
+        count = len(self.points) // 2
+        if count and (not self.contour_ends or self.contour_ends[-1] != count):
+            self.contour_ends.append(count)
+
+
+@dataclass
+class _GlyphOutline:
+    """Flattened contours of one glyph in font units: x, y pairs plus contour ends."""
+    points: array
+    contour_ends: array
+    advance: float
+
+
+@lru_cache(maxsize=OUTLINE_CACHE_SIZE)
+def _glyph_outline(
+    path: str,
+    font_number: int,
+    glyph_id: int,
+    location: Tuple[Tuple[str, float], ...]
+) -> _GlyphOutline:
+    tables = _font_tables(path, font_number)
+    glyph_set = tables.glyph_set(location)
+    glyph = glyph_set[tables.glyph_order[glyph_id]]
+    pen = _FlattenPen(OUTLINE_TOLERANCE)
+    glyph.draw(pen)
+    pen._close()
+    return _GlyphOutline(pen.points, pen.contour_ends, glyph.width)
+
+
+@dataclass
+class OutlinedText:
+    """
+    Text converted to flattened outlines, in page coordinates (points).
+
+    points holds x, y pairs; contour_ends[i] is the point index just past
+    the end of contour i. width is the advance of the whole run.
+    """
+    points: array
+    contour_ends: array
+    width: float
+
+    def contours(self) -> Iterator[List[Tuple[float, float]]]:
+        """Iterate over contours as lists of (x, y) points."""
+        points = self.points
+        start = 0
+        for end in self.contour_ends:
+            yield [(points[2 * i], points[2 * i + 1]) for i in range(start, end)]
+            start = end
+
+    def to_bezier_path(self):
+        """Build a single DrawBot BezierPath holding every contour."""
+        path = db.BezierPath()
+        for contour in self.contours():
+            path.moveTo(contour[0])
+            for point in contour[1:]:
+                path.lineTo(point)
+            path.closePath()
+        return path
+
+
+def _font_face(font: str) -> Tuple[str, int]:
+    """Font file and face index for a name: via the measurement backend, else DrawBot."""
+    if hasattr(_backend, 'font_face'):
+        return _backend.font_face(font)
+    if Path(font).is_file():
+        return font, 0
+    db.font(font)
+    path = db.fontFilePath()
+    if not path:
+        raise ValueError(f"DrawBot can't find a font file for '{font}'")
+    path = str(path)
+    font_number = _face_index(path, font)
+    if font_number is None:
+        raise ValueError(f"Cannot find face '{font}' in font collection {path}")
+    return path, font_number
+
+
+def outline_text(text: str, font: str, size: float, x: float = 0, y: float = 0) -> OutlinedText:
+    """
+    Convert a line of text to flattened outlines positioned at (x, y).
+
+    Each glyph is read from the font file and flattened once per
+    (font, glyph id, variation location); every later occurrence just
+    scales and translates the cached contours, so outlining long documents
+    costs little more than copying points. Uses cmap glyphs, pair kerning
+    and the set_font_variation() location (no OpenType substitutions).
+
+    Args:
+        text: Single line of text
+        font: Font name or file path
+        size: Font size in points
+        x, y: Baseline origin
+
+    Returns:
+        OutlinedText (draw with db.drawPath(result.to_bezier_path()))
+
+    Example:
+        for line, line_y in zip(lines, baselines):
+            db.drawPath(outline_text(line, "Helvetica", 10, x, line_y).to_bezier_path())
+    """
+    path, font_number = _font_face(font)
+    tables = _font_tables(path, font_number)
+    location = tables.location(_variations_key())
+    scale = size / tables.units_per_em
+    glyph_ids = tables.glyph_ids
+    notdef = glyph_ids.get('.notdef', 0)
+    kerning = tables.kerning
+
+    points = array('d')
+    contour_ends = array('I')
+    pen_x = 0.0
+    previous = None
+    for char in text:
+        if previous is not None and kerning:
+            pen_x += kerning.pair(previous, char)
+        previous = char
+
+        glyph = tables.cmap.get(ord(char))
+        outline = _glyph_outline(path, font_number, glyph_ids.get(glyph, notdef), location)
+
+        offset = len(points) // 2
+        contour_ends.extend(end + offset for end in outline.contour_ends)
+        glyph_points = outline.points
+        origin_x = x + pen_x * scale
+        for i in range(0, len(glyph_points), 2):
+            points.append(origin_x + glyph_points[i] * scale)
+            points.append(y + glyph_points[i + 1] * scale)
+        pen_x += outline.advance
+
+    return OutlinedText(points, contour_ends, pen_x * scale)
+
+
+def draw_outlined_text(text: str, x: float, y: float, font: str, size: float) -> OutlinedText:
+    """
+    Draw a line of text as outlines (no live text in the PDF).
+
+    Uses the current fill/stroke. Returns the OutlinedText that was drawn.
+    """
+    outlined = outline_text(text, font, size, x, y)
+    db.drawPath(outlined.to_bezier_path())
+    return outlined
+
 # ==================== USAGE EXAMPLE ====================
 
 if __name__ == "__main__":
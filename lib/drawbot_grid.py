@@ -23,6 +23,8 @@ Usage:
 
 from __future__ import annotations
 import math
+from collections import OrderedDict
+from functools import lru_cache
 
 # Lazy import drawBot to allow core-only installs that don't use drawing functions
 _db = None
@@ -50,10 +52,71 @@ class _DrawBotProxy:
 
 
 db = _DrawBotProxy()
+
+
+def _get_numpy():
+    """Lazy-load numpy, with clear error if not installed."""
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError(
+            "numpy is required for vectorized grid queries but is not installed.\n"
+            "Install with: uv sync --extra fast\n"
+            "Or: pip install numpy"
+        )
+    return numpy
+
+
 from typing import List, Union, Tuple, Iterator, Optional, overload
 
 # ==================== CORE GRID CLASSES ====================
 
+def _possize_from_margins(margins) -> Tuple[float, float, float, float]:
+    """Page box inside margins (left, bottom, right, top) given as negative numbers"""
+    left_margin, bottom_margin, right_margin, top_margin = margins
+    # Get page dimensions from current DrawBot context
+    try:
+        page_width = db.width()
+        page_height = db.height()
+    except:
+        # Fallback to letter size if no active canvas
+        page_width = 612
+        page_height = 792
+    return (-left_margin, -bottom_margin,
+            page_width + left_margin + right_margin,
+            page_height + bottom_margin + top_margin)
+
+
+# Maximum number of grid overlays (frame and index paths) kept for redraws
+OVERLAY_CACHE_SIZE = 64
+
+_overlays: "OrderedDict[tuple, object]" = OrderedDict()
+
+def _cached_overlay(key: tuple, build) -> "db.BezierPath":
+    """
+    BezierPath for a debug overlay, built once per grid geometry.
+
+    Drawing a grid overlay then costs one drawPath call instead of one
+    rect/text call per cell, and re-renders reuse the same path until the
+    geometry (and so the key) changes.
+    """
+    path = _overlays.get(key)
+    if path is None:
+        path = db.BezierPath()
+        build(path)
+        _overlays[key] = path
+        if len(_overlays) > OVERLAY_CACHE_SIZE:
+            _overlays.popitem(last=False)
+    else:
+        _overlays.move_to_end(key)
+    return path
+
+
+def clear_overlay_cache() -> None:
+    """Drop all cached grid overlays."""
+    _overlays.clear()
+
+
 class AbstractArea:
     """Base class for all grid areas - manages position and size"""
 
@@ -63,19 +126,7 @@ class AbstractArea:
     @classmethod
     def from_margins(cls, margins, *args, **kwargs):
         """Create grid from margin values (left, bottom, right, top) as negative numbers"""
-        left_margin, bottom_margin, right_margin, top_margin = margins
-        # Get page dimensions from current DrawBot context
-        try:
-            page_width = db.width()
-            page_height = db.height()
-        except:
-            # Fallback to letter size if no active canvas
-            page_width = 612
-            page_height = 792
-        possize = (-left_margin, -bottom_margin,
-                   page_width + left_margin + right_margin,
-                   page_height + bottom_margin + top_margin)
-        return cls(possize, *args, **kwargs)
+        return cls(_possize_from_margins(margins), *args, **kwargs)
 
     @property
     def x(self):
@@ -126,6 +177,7 @@ class AbstractArea:
         return self.y + self.height / 2
 
     draw_color = (1, 0, 1, 1)  # Magenta for grid visualization
+    index_font_size = 5
 
     def draw(self, show_index=False):
         """Draw the grid for debugging"""
@@ -139,13 +191,28 @@ class AbstractArea:
             with db.savedState():
                 db.stroke(None)
                 db.fill(*self.draw_color)
-                db.fontSize(5)
+                db.fontSize(self.index_font_size)
                 self.draw_indexes()
 
+    def _geometry_key(self) -> tuple:
+        """Everything the overlay depends on; subclasses add their divisions"""
+        return (type(self), self.x, self.y, self.width, self.height)
+
+    def _overlay(self, kind: str, build) -> "db.BezierPath":
+        return _cached_overlay((kind, self.index_font_size) + self._geometry_key(), build)
+
     def draw_frame(self):
-        raise NotImplementedError
+        """Draw the grid lines as one cached path"""
+        db.drawPath(self._overlay('frame', self._build_frame))
 
     def draw_indexes(self):
+        """Draw the index labels as one cached path"""
+        db.drawPath(self._overlay('indexes', self._build_indexes))
+
+    def _build_frame(self, path):
+        raise NotImplementedError
+
+    def _build_indexes(self, path):
         raise NotImplementedError
 
 
@@ -210,6 +277,9 @@ class AbstractGutterGrid(AbstractArea):
         """Multiply to get span width/height: grid * 3 = width of 3 subdivisions"""
         return self.span(factor)
 
+    def _geometry_key(self) -> tuple:
+        return super()._geometry_key() + (self.subdivisions, self.gutter)
+
 
 class ColumnGrid(AbstractGutterGrid):
     """
@@ -237,15 +307,15 @@ class ColumnGrid(AbstractGutterGrid):
     def _end_point(self):
         return self.right
 
-    def draw_frame(self) -> None:
+    def _build_frame(self, path) -> None:
         for i in range(len(self)):
             col: float = self[i]
-            db.rect(col, self.bottom, self.column_width, self.height)
+            path.rect(col, self.bottom, self.column_width, self.height)
 
-    def draw_indexes(self) -> None:
+    def _build_indexes(self, path) -> None:
         for i in range(len(self)):
             col: float = self[i]
-            db.text(str(i), (col + 2, self.bottom + 2))
+            path.text(str(i), (col + 2, self.bottom + 2), fontSize=self.index_font_size)
 
 
 class RowGrid(AbstractGutterGrid):
@@ -274,15 +344,15 @@ class RowGrid(AbstractGutterGrid):
     def _end_point(self):
         return self.top
 
-    def draw_frame(self) -> None:
+    def _build_frame(self, path) -> None:
         for i in range(len(self)):
             row: float = self[i]
-            db.rect(self.left, row, self.width, self.row_height)
+            path.rect(self.left, row, self.width, self.row_height)
 
-    def draw_indexes(self) -> None:
+    def _build_indexes(self, path) -> None:
         for i in range(len(self)):
             row: float = self[i]
-            db.text(str(i), (self.left + 2, row + 2))
+            path.text(str(i), (self.left + 2, row + 2), fontSize=self.index_font_size)
 
 
 class Grid(AbstractArea):
@@ -348,18 +418,454 @@ class Grid(AbstractArea):
         """Multiply by (col_span, row_span) to get (width, height)"""
         return self.span(factor)
 
+    def _geometry_key(self) -> tuple:
+        return (super()._geometry_key()
+                + self.columns._geometry_key()[1:] + self.rows._geometry_key()[1:])
+
     def draw_frame(self) -> None:
+        """Draw every cell as one cached path"""
+        db.drawPath(self._overlay('cells', self._build_cells))
+
+    def _build_cells(self, path) -> None:
         for col, row in self:
-            db.rect(col, row, self.column_width, self.row_height)
+            path.rect(col, row, self.column_width, self.row_height)
+
+    def _build_frame(self, path) -> None:
+        self.columns._build_frame(path)
+        self.rows._build_frame(path)
 
-    def draw_indexes(self) -> None:
-        self.columns.draw_indexes()
-        self.rows.draw_indexes()
+    def _build_indexes(self, path) -> None:
+        self.columns._build_indexes(path)
+        self.rows._build_indexes(path)
 
     def draw(self, show_index: bool = False) -> None:
-        """Override to draw both column and row grids"""
-        self.columns.draw(show_index=show_index)
-        self.rows.draw(show_index=show_index)
+        """Override to draw column and row grids together, one path each for lines and indexes"""
+        with db.savedState():
+            db.stroke(*self.draw_color)
+            db.fill(None)
+            db.strokeWidth(0.5)
+            db.drawPath(self._overlay('frame', self._build_frame))
+
+        if show_index:
+            with db.savedState():
+                db.stroke(None)
+                db.fill(*self.draw_color)
+                self.draw_indexes()
+
+    def freeze(self) -> "FrozenGrid":
+        """Immutable copy with precomputed column/row tables (see FrozenGrid)"""
+        return _frozen_grid((self.x, self.y, self.width, self.height),
+                            self.columns.subdivisions, self.rows.subdivisions,
+                            self.columns.gutter, self.rows.gutter)
+
+    def area(self, column: int, row: int, column_span: int = 1, row_span: int = 1) -> "GridArea":
+        """Block of cells usable as a grid of its own (see GridArea)"""
+        return self.freeze().area(column, row, column_span, row_span)
+
+
+class FrozenGrid:
+    """
+    Immutable Grid with precomputed column and row tables.
+
+    Same geometry and indexing as Grid (including negative indexes counted
+    from the far edge), but column/row origins and whole-number spans are
+    computed once at construction and served by index, so layouts doing
+    thousands of lookups skip the property chain. Indexes outside the grid
+    still extrapolate like Grid.
+
+    Usage:
+        grid = FrozenGrid.from_margins((-50, -50, -50, -50),
+                                       column_subdivisions=12, row_subdivisions=8)
+        # or: grid = Grid.from_margins(...).freeze()
+
+        x, y = grid[(3, 5)]
+        w, h = grid * (4, 2)
+        rects = grid.cells([(0, 0, 6, 2), (6, 0, 6, 2)])   # NumPy (N, 4) array
+    """
+
+    __slots__ = (
+        'x', 'y', 'width', 'height',
+        'column_subdivisions', 'row_subdivisions', 'column_gutter', 'row_gutter',
+        'column_width', 'row_height', 'column_origins', 'row_origins',
+        '_column_spans', '_row_spans',
+    )
+
+    def __init__(self, possize: Tuple[float, float, float, float],
+                 column_subdivisions: int = 8, row_subdivisions: int = 8,
+                 column_gutter: float = 10, row_gutter: float = 10):
+        # Reuse the gutter grids once so the tables match Grid exactly
+        columns = ColumnGrid(possize, column_subdivisions, column_gutter)
+        rows = RowGrid(possize, row_subdivisions, row_gutter)
+
+        values = {
+            'x': possize[0], 'y': possize[1], 'width': possize[2], 'height': possize[3],
+            'column_subdivisions': column_subdivisions, 'row_subdivisions': row_subdivisions,
+            'column_gutter': column_gutter, 'row_gutter': row_gutter,
+            'column_width': columns.column_width, 'row_height': rows.row_height,
+            # Forward indexes, then -n..-1, so Python's negative indexing matches Grid
+            'column_origins': tuple(columns[i] for i in range(column_subdivisions))
+                              + tuple(columns[i] for i in range(-column_subdivisions, 0)),
+            'row_origins': tuple(rows[i] for i in range(row_subdivisions))
+                           + tuple(rows[i] for i in range(-row_subdivisions, 0)),
+            '_column_spans': tuple(columns.span(n) for n in range(column_subdivisions + 1)),
+            '_row_spans': tuple(rows.span(n) for n in range(row_subdivisions + 1)),
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    @classmethod
+    def from_margins(cls, margins, *args, **kwargs) -> "FrozenGrid":
+        """Create grid from margin values (left, bottom, right, top) as negative numbers"""
+        return cls(_possize_from_margins(margins), *args, **kwargs)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    @property
+    def possize(self) -> Tuple[float, float, float, float]:
+        return self.x, self.y, self.width, self.height
+
+    @property
+    def top(self) -> float:
+        """Absolute Y value of the top of the grid"""
+        return self.y + self.height
+
+    @property
+    def bottom(self) -> float:
+        """Absolute Y value of the bottom of the grid"""
+        return self.y
+
+    @property
+    def left(self) -> float:
+        """Absolute X value of the left of the grid"""
+        return self.x
+
+    @property
+    def right(self) -> float:
+        """Absolute X value of the right of the grid"""
+        return self.x + self.width
+
+    @property
+    def center(self) -> Tuple[float, float]:
+        return self.horizontal_center, self.vertical_center
+
+    @property
+    def horizontal_center(self) -> float:
+        return self.x + self.width / 2
+
+    @property
+    def vertical_center(self) -> float:
+        return self.y + self.height / 2
+
+    @property
+    def columns(self) -> ColumnGrid:
+        """Column grid as on Grid; a fresh copy, so editing it can't touch this grid"""
+        return ColumnGrid(self.possize, self.column_subdivisions, self.column_gutter)
+
+    @property
+    def rows(self) -> RowGrid:
+        """Row grid as on Grid; a fresh copy, so editing it can't touch this grid"""
+        return RowGrid(self.possize, self.row_subdivisions, self.row_gutter)
+
+    @property
+    def subdivision_dimension(self) -> Tuple[float, float]:
+        return self.column_width, self.row_height
+
+    @property
+    def _config(self) -> tuple:
+        return (self.possize, self.column_subdivisions, self.row_subdivisions,
+                self.column_gutter, self.row_gutter)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, FrozenGrid) and self._config == other._config
+
+    def __hash__(self) -> int:
+        return hash(self._config)
+
+    def __repr__(self) -> str:
+        return (f"FrozenGrid({self.possize}, column_subdivisions={self.column_subdivisions}, "
+                f"row_subdivisions={self.row_subdivisions}, column_gutter={self.column_gutter}, "
+                f"row_gutter={self.row_gutter})")
+
+    def __reduce__(self):
+        return (type(self), self._config)
+
+    @staticmethod
+    def _origin(table: tuple, count: int, start: float, end: float,
+                gutter: float, dimension: float, index: int) -> float:
+        if -count <= index < count:
+            return table[index]
+        if index >= 0:
+            return start + index * (gutter + dimension)
+        return end + (index + 1) * (gutter + dimension)
+
+    @staticmethod
+    def _span(table: tuple, gutter: float, dimension: float, span: Union[int, float]) -> float:
+        if isinstance(span, int) and 0 <= span < len(table):
+            return table[span]
+        if span >= 0:
+            return dimension * span + gutter * (math.ceil(span) - 1)
+        return dimension * span + gutter * (math.ceil(span) + 1)
+
+    def column(self, index: int) -> float:
+        """X coordinate of a column"""
+        return self._origin(self.column_origins, self.column_subdivisions, self.x,
+                            self.x + self.width, self.column_gutter, self.column_width, index)
+
+    def row(self, index: int) -> float:
+        """Y coordinate of a row"""
+        return self._origin(self.row_origins, self.row_subdivisions, self.y,
+                            self.y + self.height, self.row_gutter, self.row_height, index)
+
+    def column_span(self, span: Union[int, float]) -> float:
+        return self._span(self._column_spans, self.column_gutter, self.column_width, span)
+
+    def row_span(self, span: Union[int, float]) -> float:
+        return self._span(self._row_spans, self.row_gutter, self.row_height, span)
+
+    def span(self, column_span_row_span: Tuple[Union[int, float], Union[int, float]]) -> Tuple[float, float]:
+        """Return (width, height) for a span of (columns, rows)"""
+        column_span, row_span = column_span_row_span
+        return self.column_span(column_span), self.row_span(row_span)
+
+    def rect(self, column: int, row: int, column_span: Union[int, float] = 1,
+             row_span: Union[int, float] = 1) -> Tuple[float, float, float, float]:
+        """(x, y, width, height) of a block of cells"""
+        return self.column(column), self.row(row), self.column_span(column_span), self.row_span(row_span)
+
+    def cells(self, indices):
+        """
+        Rects for many cells at once.
+
+        Args:
+            indices: Sequence or array of (column, row) or
+                (column, row, column_span, row_span) rows
+
+        Returns:
+            NumPy float array of shape (N, 4): x, y, width, height
+        """
+        np = _get_numpy()
+        indices = np.asarray(indices, dtype=np.float64)
+        if indices.ndim != 2 or indices.shape[1] not in (2, 4):
+            raise ValueError("cells() expects (column, row) or (column, row, column_span, row_span) rows")
+
+        def origins(index, start, end, gutter, dimension):
+            pitch = gutter + dimension
+            return np.where(index >= 0, start + index * pitch, end + (index + 1) * pitch)
+
+        def spans(span, gutter, dimension):
+            steps = np.ceil(span)
+            return dimension * span + gutter * np.where(span >= 0, steps - 1, steps + 1)
+
+        rects = np.empty((len(indices), 4), dtype=np.float64)
+        rects[:, 0] = origins(indices[:, 0], self.x, self.x + self.width,
+                              self.column_gutter, self.column_width)
+        rects[:, 1] = origins(indices[:, 1], self.y, self.y + self.height,
+                              self.row_gutter, self.row_height)
+        if indices.shape[1] == 4:
+            rects[:, 2] = spans(indices[:, 2], self.column_gutter, self.column_width)
+            rects[:, 3] = spans(indices[:, 3], self.row_gutter, self.row_height)
+        else:
+            rects[:, 2] = self.column_width
+            rects[:, 3] = self.row_height
+        return rects
+
+    def __getitem__(self, index: Tuple[int, int]) -> Tuple[float, float]:
+        """Get (x, y) coordinate for (column_index, row_index)"""
+        return self.column(index[0]), self.row(index[1])
+
+    def __mul__(self, factor: Tuple[Union[int, float], Union[int, float]]) -> Tuple[float, float]:
+        """Multiply by (col_span, row_span) to get (width, height)"""
+        return self.span(factor)
+
+    def __len__(self) -> int:
+        return self.column_subdivisions * self.row_subdivisions
+
+    def __iter__(self) -> Iterator[Tuple[float, float]]:
+        columns = self.column_origins[:self.column_subdivisions]
+        rows = self.row_origins[:self.row_subdivisions]
+        return iter([(c, r) for c in columns for r in rows])
+
+    def thaw(self) -> "Grid":
+        """Mutable Grid with the same geometry (e.g. for drawing)"""
+        return Grid(*self._config)
+
+    def draw(self, show_index: bool = False) -> None:
+        """Draw the grid for debugging"""
+        self.thaw().draw(show_index=show_index)
+
+    def area(self, column: int, row: int, column_span: int = 1, row_span: int = 1) -> "GridArea":
+        """Block of cells usable as a grid of its own (see GridArea)"""
+        return GridArea(self, column, row, column_span, row_span)
+
+
+@lru_cache(maxsize=1024)
+def _frozen_grid(possize: Tuple[float, float, float, float],
+                 column_subdivisions: int, row_subdivisions: int,
+                 column_gutter: float, row_gutter: float) -> FrozenGrid:
+    """Shared FrozenGrid per configuration, so repeated sub-grids are built once"""
+    return FrozenGrid(possize, column_subdivisions, row_subdivisions, column_gutter, row_gutter)
+
+
+class GridArea:
+    """
+    A block of cells in a parent grid, usable as a grid itself.
+
+    Indexes are relative to the area and resolve through the parent's
+    precomputed tables, so an area keeps the parent's modules and gutters
+    without any geometry of its own. Nested areas point straight at the
+    same parent. subgrid() divides the area into a new module grid.
+
+    Usage:
+        grid = FrozenGrid.from_margins(..., column_subdivisions=12)
+        body = grid.area(4, 0, 8, 6)          # Columns 4-11, rows 0-5
+        x, y = body[(0, 0)]                   # == grid[(4, 0)]
+        w, h = body * (2, 1)
+        db.rect(*body.rect(0, 0, 8, 6))
+
+        # A 3-column grid inside the area
+        inner = body.subgrid(column_subdivisions=3, row_subdivisions=6)
+        x, y = inner[(2, 0)]
+    """
+
+    __slots__ = ('parent', 'column', 'row', 'column_subdivisions', 'row_subdivisions')
+
+    def __init__(self, parent: FrozenGrid, column: int, row: int,
+                 column_span: int = 1, row_span: int = 1):
+        if column_span < 1 or row_span < 1:
+            raise ValueError(f"Grid area spans must be at least 1, got ({column_span}, {row_span})")
+        self.parent = parent
+        self.column = column
+        self.row = row
+        self.column_subdivisions = column_span
+        self.row_subdivisions = row_span
+
+    @property
+    def x(self) -> float:
+        return self.parent.column(self.column)
+
+    @property
+    def y(self) -> float:
+        return self.parent.row(self.row)
+
+    @property
+    def width(self) -> float:
+        return self.parent.column_span(self.column_subdivisions)
+
+    @property
+    def height(self) -> float:
+        return self.parent.row_span(self.row_subdivisions)
+
+    @property
+    def possize(self) -> Tuple[float, float, float, float]:
+        return self.x, self.y, self.width, self.height
+
+    @property
+    def column_width(self) -> float:
+        return self.parent.column_width
+
+    @property
+    def row_height(self) -> float:
+        return self.parent.row_height
+
+    def _key(self) -> tuple:
+        return (self.parent, self.column, self.row, self.column_subdivisions, self.row_subdivisions)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, GridArea) and self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def __repr__(self) -> str:
+        return (f"GridArea({self.parent!r}, {self.column}, {self.row}, "
+                f"{self.column_subdivisions}, {self.row_subdivisions})")
+
+    def _parent_column(self, index: int) -> float:
+        if index >= 0:
+            return self.parent.column(self.column + index)
+        # Negative indexes count from the area's right edge, as in Grid
+        return self.parent.column(self.column + self.column_subdivisions + index + 1) - self.parent.column_gutter
+
+    def _parent_row(self, index: int) -> float:
+        if index >= 0:
+            return self.parent.row(self.row + index)
+        return self.parent.row(self.row + self.row_subdivisions + index + 1) - self.parent.row_gutter
+
+    def column_span(self, span: Union[int, float]) -> float:
+        return self.parent.column_span(span)
+
+    def row_span(self, span: Union[int, float]) -> float:
+        return self.parent.row_span(span)
+
+    def span(self, column_span_row_span: Tuple[Union[int, float], Union[int, float]]) -> Tuple[float, float]:
+        """Return (width, height) for a span of (columns, rows)"""
+        return self.parent.span(column_span_row_span)
+
+    def rect(self, column: int, row: int, column_span: Union[int, float] = 1,
+             row_span: Union[int, float] = 1) -> Tuple[float, float, float, float]:
+        """(x, y, width, height) of a block of cells in the area"""
+        return (self._parent_column(column), self._parent_row(row),
+                self.column_span(column_span), self.row_span(row_span))
+
+    def cells(self, indices):
+        """
+        Rects for many cells at once (see FrozenGrid.cells). Negative indexes
+        count from the area's far edge, as in rect().
+        """
+        np = _get_numpy()
+        indices = np.array(indices, dtype=np.float64)
+        if indices.ndim != 2 or indices.shape[1] not in (2, 4):
+            return self.parent.cells(indices)
+
+        from_end_column = indices[:, 0] < 0
+        from_end_row = indices[:, 1] < 0
+        indices[:, 0] += np.where(from_end_column, self.column + self.column_subdivisions + 1, self.column)
+        indices[:, 1] += np.where(from_end_row, self.row + self.row_subdivisions + 1, self.row)
+        rects = self.parent.cells(indices)
+        rects[from_end_column, 0] -= self.parent.column_gutter
+        rects[from_end_row, 1] -= self.parent.row_gutter
+        return rects
+
+    def area(self, column: int, row: int, column_span: int = 1, row_span: int = 1) -> "GridArea":
+        """Nested area, resolved directly against the same parent"""
+        return GridArea(self.parent, self.column + column, self.row + row, column_span, row_span)
+
+    def subgrid(self, column_subdivisions: Optional[int] = None, row_subdivisions: Optional[int] = None,
+                column_gutter: Optional[float] = None, row_gutter: Optional[float] = None) -> FrozenGrid:
+        """
+        Divide the area into a new grid (defaults: the area's own cells and
+        the parent's gutters). Identical sub-grids are shared.
+        """
+        return _frozen_grid(
+            self.possize,
+            column_subdivisions if column_subdivisions is not None else self.column_subdivisions,
+            row_subdivisions if row_subdivisions is not None else self.row_subdivisions,
+            column_gutter if column_gutter is not None else self.parent.column_gutter,
+            row_gutter if row_gutter is not None else self.parent.row_gutter,
+        )
+
+    def __getitem__(self, index: Tuple[int, int]) -> Tuple[float, float]:
+        """Get (x, y) coordinate for (column_index, row_index) within the area"""
+        return self._parent_column(index[0]), self._parent_row(index[1])
+
+    def __mul__(self, factor: Tuple[Union[int, float], Union[int, float]]) -> Tuple[float, float]:
+        """Multiply by (col_span, row_span) to get (width, height)"""
+        return self.span(factor)
+
+    def __len__(self) -> int:
+        return self.column_subdivisions * self.row_subdivisions
+
+    def __iter__(self) -> Iterator[Tuple[float, float]]:
+        return iter([self[(c, r)] for c in range(self.column_subdivisions)
+                     for r in range(self.row_subdivisions)])
+
+    def draw(self, show_index: bool = False) -> None:
+        """Draw the area's cells for debugging"""
+        self.subgrid().draw(show_index=show_index)
 
 
 class BaselineGrid(AbstractArea):
@@ -382,9 +888,20 @@ class BaselineGrid(AbstractArea):
         super().__init__(possize)
         self.line_height = line_height
 
+    @property
+    def line_height(self) -> float:
+        return self._line_height
+
+    @line_height.setter
+    def line_height(self, value: float) -> None:
+        self._line_height = value
+        # Derived geometry, computed once instead of through the property chain
+        self._top = self._y + self._height
+        self._count = abs(int((self._y - self._top) // -value)) + 1
+
     @property
     def _start_point(self) -> float:
-        return self.top
+        return self._top
 
     @property
     def _end_point(self) -> float:
@@ -407,45 +924,88 @@ class BaselineGrid(AbstractArea):
 
     @property
     def subdivisions(self) -> int:
-        return abs(int(self._reference_dimension // self.subdivision_dimension)) + 1
+        return self._count
 
     @property
     def subdivision_dimension(self) -> float:
-        return -self.line_height
+        return -self._line_height
 
     def span(self, span: Union[int, float]) -> float:
         return span * self.subdivision_dimension
 
+    def _first_index_below(self, y_coordinate: float, strict: bool = False) -> Optional[int]:
+        """
+        Index of the first (highest) line at or below a Y coordinate, or
+        strictly below it. Closed form, then nudged by at most a line to
+        absorb float rounding for coordinates sitting on a line.
+        """
+        top = self._top
+        step = -self._line_height
+        if strict:
+            index = max(0, math.floor((top - y_coordinate) / self._line_height) + 1)
+            while index > 0 and y_coordinate > top + (index - 1) * step:
+                index -= 1
+            while index < self._count and not y_coordinate > top + index * step:
+                index += 1
+        else:
+            index = max(0, math.ceil((top - y_coordinate) / self._line_height))
+            while index > 0 and y_coordinate >= top + (index - 1) * step:
+                index -= 1
+            while index < self._count and not y_coordinate >= top + index * step:
+                index += 1
+        return index if index < self._count else None
+
     def baseline_index_from_coordinate(self, y_coordinate: float) -> Optional[int]:
         """Get the baseline index closest to a Y coordinate"""
-        for i in range(len(self)):
-            line: float = self._get_single_item(i)
-            if y_coordinate >= line:
-                return i
-        return None
+        return self._first_index_below(y_coordinate)
 
     def closest_line_below_coordinate(self, y_coordinate: float) -> Optional[float]:
         """Get the baseline Y value below a coordinate"""
-        for i in range(len(self)):
-            line: float = self._get_single_item(i)
-            if y_coordinate >= line:
-                return line
-        return None
+        index = self._first_index_below(y_coordinate)
+        return None if index is None else self._get_single_item(index)
 
     def closest_line_above_coordinate(self, y_coordinate: float) -> Optional[float]:
         """Get the baseline Y value above a coordinate"""
-        for i in range(len(self)):
-            line: float = self._get_single_item(i)
-            if y_coordinate > line:
-                return line + self.line_height
-        return None
+        index = self._first_index_below(y_coordinate, strict=True)
+        return None if index is None else self._get_single_item(index) + self._line_height
+
+    def baseline_indices_from_coordinates(self, y_coordinates):
+        """
+        Vectorized baseline_index_from_coordinate for many Y coordinates.
+
+        Args:
+            y_coordinates: Sequence or NumPy array of Y values
+
+        Returns:
+            NumPy int array of baseline indices, -1 where no line is below
+        """
+        np = _get_numpy()
+        y = np.asarray(y_coordinates, dtype=np.float64)
+        top = self._top
+        step = -self._line_height
+
+        index = np.maximum(np.ceil((top - y) / self._line_height), 0).astype(np.intp)
+        index = np.where((index > 0) & (y >= top + (index - 1) * step), index - 1, index)
+        index = np.where(y >= top + index * step, index, index + 1)
+        return np.where(index < self._count, index, -1)
+
+    def closest_lines_below_coordinates(self, y_coordinates):
+        """
+        Vectorized closest_line_below_coordinate for many Y coordinates.
+
+        Returns:
+            NumPy float array of baseline Y values, NaN where no line is below
+        """
+        np = _get_numpy()
+        index = self.baseline_indices_from_coordinates(y_coordinates)
+        lines = self._top + index * -self._line_height
+        return np.where(index >= 0, lines, np.nan)
 
     def _get_single_item(self, index: int) -> float:
         """Get a single baseline position by index."""
-        if index >= 0:
-            return self._start_point + index * self.subdivision_dimension
-        else:
-            return self._start_point + len(self) * self.subdivision_dimension + index * self.subdivision_dimension
+        if index < 0:
+            index += self._count
+        return self._top + index * -self._line_height
 
     @overload
     def __getitem__(self, key: int) -> float: ...
@@ -469,15 +1029,18 @@ class BaselineGrid(AbstractArea):
 
     draw_color = (0, 1, 1, 1)  # Cyan for baseline grids
 
-    def draw_frame(self) -> None:
+    def _geometry_key(self) -> tuple:
+        return super()._geometry_key() + (self._line_height,)
+
+    def _build_frame(self, path) -> None:
         for i in range(len(self)):
             baseline: float = self._get_single_item(i)
-            db.line((self.left, baseline), (self.right, baseline))
+            path.line((self.left, baseline), (self.right, baseline))
 
-    def draw_indexes(self) -> None:
+    def _build_indexes(self, path) -> None:
         for i in range(len(self)):
             line: float = self._get_single_item(i)
-            db.text(str(i), (self.left + 2, line + 2))
+            path.text(str(i), (self.left + 2, line + 2), fontSize=self.index_font_size)
 
 
 # ==================== CONVENIENCE FUNCTIONS ====================
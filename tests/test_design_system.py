@@ -5,7 +5,10 @@ Uses a mock DrawBot to test wrapping and layout validation without requiring
 the actual DrawBot package (macOS only).
 """
 
+import math
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor  # noqa: F401 (see below)
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 import pytest
@@ -13,6 +16,14 @@ import pytest
 # Add lib to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
 
+# Optional extension modules can't be re-imported once patched sys.modules
+# is restored, so load them before any test patches it. The process pool
+# must likewise be imported once so its call items pickle.
+try:
+    import numpy  # noqa: F401
+except ImportError:
+    pass
+
 
 # ==================== MOCK DRAWBOT ====================
 
@@ -106,6 +117,45 @@ def test_predefined_scales_exist(patched_design_system):
     assert ds.REPORT_SCALE.body == 12
 
 
+def test_scale_table_precomputes_all_steps(patched_design_system, mock_db):
+    """Test that the table matches TypographyScale values for every scale step."""
+    pytest.importorskip("numpy")
+    ds = patched_design_system
+
+    table = ds.ScaleTable(font="Helvetica")
+
+    assert table.sizes.shape == (4, len(ds.SCALE_STEPS))
+    for name, scale in ds.NAMED_SCALES.items():
+        for step in ds.SCALE_STEPS:
+            values = table.get(name, step)
+            size = getattr(scale, step)
+            assert values['size'] == pytest.approx(size)
+            assert values['leading'] == pytest.approx(scale.leading(size))
+            assert values['baseline_offset'] == pytest.approx(size * 0.8)
+            assert values['descender'] == pytest.approx(size * -0.2)
+
+
+def test_scale_table_vectorized_lookup(patched_design_system):
+    """Test fancy-indexed lookups for many runs and custom ratios."""
+    np = pytest.importorskip("numpy")
+    ds = patched_design_system
+
+    table = ds.ScaleTable.from_ratios(10, {"tight": ds.MAJOR_SECOND, "golden": ds.GOLDEN_RATIO})
+    runs = table.lookup(["golden", "tight", "golden"] * 1000, ["title", "body", "caption"] * 1000)
+
+    assert set(runs) == {"size", "leading"}  # No font, no metrics
+    np.testing.assert_allclose(runs["size"][:3], [10 * 1.618 ** 4, 10, 10 / 1.618])
+    np.testing.assert_allclose(runs["leading"], runs["size"] * 1.5)
+    assert len(runs["size"]) == 3000
+
+    with pytest.raises(ValueError):
+        table.codes(["poster"], ["body"])
+    with pytest.raises(ValueError):
+        table.codes(["tight", "tight"], ["body"])
+    with pytest.raises(ValueError):
+        table.sizes[0, 0] = 1
+
+
 # ==================== TEXT WRAPPING TESTS ====================
 
 def test_wrap_text_simple(patched_design_system, mock_db):
@@ -176,6 +226,930 @@ def test_long_url_preserved(patched_design_system, mock_db):
     assert reconstructed == url, f"URL was truncated! Got: {reconstructed}"
 
 
+def test_wrap_measures_each_character_once(patched_design_system, mock_db):
+    """Test that word widths come from cached advances, not per-word textSize calls."""
+    ds = patched_design_system
+
+    measured = []
+    text_size = mock_db.textSize
+
+    def counting_text_size(text):
+        measured.append(text)
+        return text_size(text)
+
+    mock_db.textSize = counting_text_size
+
+    text = " ".join(["banana", "bandana", "cabana"] * 200)
+    lines = ds.wrap_text_to_width(text, 200, "Helvetica", 12)
+
+    assert " ".join(lines) == text
+    assert sorted(measured) == sorted(set("bancd") | {" "})
+
+    # A second wrap in the same style hits the cache entirely
+    measured.clear()
+    ds.wrap_text_to_width(text, 300, "Helvetica", 12)
+    assert measured == []
+
+
+def test_advance_cache_keyed_by_size(patched_design_system, mock_db):
+    """Test that each size gets its own advance table."""
+    ds = patched_design_system
+
+    small = ds._advance_table("Helvetica", 10)
+    large = ds._advance_table("Helvetica", 20)
+
+    assert small is not large
+    assert large.measure("abc") == pytest.approx(2 * small.measure("abc"))
+    assert ds._advance_table("Helvetica", 10) is small
+
+
+def test_text_functions_leave_style_set_on_cache_hit(patched_design_system, mock_db):
+    """Test that measuring from the cache still makes the style DrawBot's current one."""
+    ds = patched_design_system
+
+    ds.wrap_text_to_width("Hello world", 200, "Helvetica", 12)
+    ds.calculate_chars_per_line(300, "Helvetica", 12)
+    ds.get_text_metrics("Hello", "Helvetica", 12)
+
+    for measure in (
+        lambda: ds.wrap_text_to_width("Hello world", 200, "Helvetica", 12),
+        lambda: ds.calculate_chars_per_line(300, "Helvetica", 12),
+        lambda: ds.get_text_metrics("Hello", "Helvetica", 12),
+    ):
+        mock_db.font("Times")
+        mock_db.fontSize(30)
+        measure()
+        assert (mock_db._font, mock_db._size) == ("Helvetica", 12)
+
+
+def test_break_long_word_uses_logarithmic_search(patched_design_system, mock_db):
+    """Test that long tokens are broken without measuring every candidate prefix."""
+    ds = patched_design_system
+
+    measured = []
+    text_size = mock_db.textSize
+
+    def counting_text_size(text):
+        measured.append(text)
+        return text_size(text)
+
+    mock_db.textSize = counting_text_size
+
+    word = "0123456789abcdef" * 64
+    chunks = ds._break_long_word(word, 100, "Helvetica", 12)
+
+    assert "".join(c.rstrip("-") for c in chunks) == word
+    # 7.2pt per char, 7.2pt hyphen: 12 chars + hyphen fit in 100pt
+    assert all(len(c) == 13 for c in chunks[:-1])
+    # Only distinct characters (plus the hyphen) are ever measured
+    assert len(measured) == len(set(word)) + 1
+
+
+PATTERNS = ["hy3ph", "he2n", "hena4", "hen5at", "1na", "n2at", "1tio", "2io", "o2n"]
+
+
+def test_hyphenator_liang_patterns(patched_design_system):
+    """Test Liang pattern hyphenation and exceptions."""
+    ds = patched_design_system
+
+    hyphenator = ds.Hyphenator(PATTERNS, exceptions=["ta-ble"], right_min=2)
+
+    assert hyphenator.hyphenate("hyphenation") == ["hy", "phen", "ation"]
+    assert hyphenator.positions("Hyphenation") == [2, 6]
+    assert hyphenator.hyphenate("table") == ["ta", "ble"]
+    assert hyphenator.hyphenate("xyz") == ["xyz"]
+
+
+def test_hyphenator_from_tex_file(patched_design_system, tmp_path):
+    """Test loading patterns and exceptions from a TeX pattern file."""
+    ds = patched_design_system
+
+    path = tmp_path / "hyph-test.tex"
+    path.write_text(
+        "% test patterns\n"
+        "\\patterns{\n" + "\n".join(PATTERNS) + "\n}\n"
+        "\\hyphenation{ta-ble}\n"
+    )
+    hyphenator = ds.Hyphenator.from_file(path, right_min=2)
+
+    assert hyphenator.hyphenate("hyphenation") == ["hy", "phen", "ation"]
+    assert hyphenator.hyphenate("table") == ["ta", "ble"]
+
+
+def test_break_long_word_prefers_hyphenation_points(patched_design_system, mock_db):
+    """Test that long words break at dictionary points when one fits."""
+    ds = patched_design_system
+
+    hyphenator = ds.Hyphenator(PATTERNS)
+
+    # 7.2pt per char: "hyphen" + "-" = 50.4pt fits, "hyphena" would too,
+    # but the last valid hyphenation point that fits is after "hyphen"
+    chunks = ds._break_long_word("hyphenation", 60, "Helvetica", 12, hyphenator)
+    assert chunks == ["hyphen-", "ation"]
+
+    lines = ds.wrap_text_to_width("hyphenation", 60, "Helvetica", 12, hyphenator=hyphenator)
+    assert lines == ["hyphen-", "ation"]
+
+
+def test_optimal_wrap_evens_out_rag(patched_design_system, mock_db):
+    """Test that the Knuth-Plass mode avoids the short line greedy leaves behind."""
+    ds = patched_design_system
+
+    # 7.2pt per char: a 43.2pt line holds exactly 6 characters
+    text = "aaa bb cc ddddd"
+
+    greedy = ds.wrap_text_to_width(text, 43.2, "Helvetica", 12)
+    optimal = ds.wrap_text_to_width(text, 43.2, "Helvetica", 12, algorithm="optimal")
+
+    assert greedy == ["aaa bb", "cc", "ddddd"]
+    assert optimal == ["aaa", "bb cc", "ddddd"]
+
+
+def test_optimal_wrap_keeps_all_text(patched_design_system, mock_db):
+    """Test that optimal wrapping preserves words and breaks over-wide tokens."""
+    ds = patched_design_system
+
+    url = "https://example.com/very/long/path/to/resource"
+    text = f"see {url} for the full list of words " * 20
+    lines = ds.wrap_text_to_width(text, 120, "Helvetica", 12, algorithm="optimal")
+
+    assert all(len(line) * 7.2 <= 120 for line in lines)
+    rejoined = " ".join(lines).replace("- ", "")
+    assert rejoined.split() == text.split()
+
+
+def test_unknown_wrap_algorithm(patched_design_system, mock_db):
+    """Test that an unknown algorithm is rejected."""
+    ds = patched_design_system
+
+    with pytest.raises(ValueError):
+        ds.wrap_text_to_width("text", 100, "Helvetica", 12, algorithm="balanced")
+
+
+def test_draw_wrapped_text_reports_overflow(patched_design_system, mock_db):
+    """Test that overflowing lines are reported instead of silently dropped."""
+    ds = patched_design_system
+
+    drawn = []
+    mock_db.text = lambda txt, pos: drawn.append((txt, pos))
+
+    text = "alpha  beta gamma\ndelta epsilon zeta eta theta"
+    # 7.2pt per char, 100pt wide: two words per line; leading 18pt
+    # Room for 2 lines: 9.6 ascender + 18 leading + 2.4 descender = 30pt
+    result = ds.draw_wrapped_text(text, 10, 500, 100, 35, "Helvetica", 12)
+
+    assert result.lines == ["alpha beta", "gamma delta"]
+    assert [txt for txt, _ in drawn] == result.lines
+    assert result.overflowed
+    assert result.overflow_lines == ["epsilon zeta", "eta theta"]
+    assert result.overflow_offset == text.index("epsilon")
+    assert result.overflow_text == "epsilon zeta eta theta"
+    assert result.height == pytest.approx(30)
+    assert result.required_height == pytest.approx(9.6 + 3 * 18 + 2.4)
+    assert float(result) == pytest.approx(500 - 9.6 - 2 * 18)
+
+
+def test_draw_wrapped_text_overflow_offset_in_broken_word(patched_design_system, mock_db):
+    """Test the overflow offset when overflow starts inside a hyphenated word."""
+    ds = patched_design_system
+
+    text = "see abcdefghijklmnopqrstuvwxyz"
+    result = ds.draw_wrapped_text(text, 0, 500, 50, 12, "Helvetica", 12)
+
+    assert result.lines == ["see"]
+    assert result.overflow_text == "abcdefghijklmnopqrstuvwxyz"
+
+    result = ds.draw_wrapped_text(text, 0, 500, 50, 30, "Helvetica", 12)
+    assert result.lines == ["see", "abcde-"]
+    assert result.overflow_text == "fghijklmnopqrstuvwxyz"
+
+
+def test_draw_wrapped_text_without_overflow(patched_design_system, mock_db):
+    """Test the result when everything fits."""
+    ds = patched_design_system
+
+    result = ds.draw_wrapped_text("short text", 0, 500, 200, 200, "Helvetica", 12)
+
+    assert not result.overflowed
+    assert result.overflow_offset is None
+    assert result.overflow_text == ""
+    assert result.height == result.required_height == pytest.approx(12)
+
+
+def test_wrapped_text_behaves_like_float(patched_design_system, mock_db):
+    """Test that the result works wherever the old float y position did."""
+    import pickle
+    ds = patched_design_system
+
+    result = ds.draw_wrapped_text("alpha beta gamma", 0, 500, 100, 100, "Helvetica", 12)
+    y = result.y
+
+    assert isinstance(result, float)
+    assert result - 20 == y - 20
+    assert result < 500 and max(result, 10) == y
+    assert round(result) == round(y)
+    assert f"{result:.1f}" == f"{y:.1f}"
+
+    copy = pickle.loads(pickle.dumps(result))
+    assert copy == result and copy.lines == result.lines
+    assert copy.required_height == result.required_height
+
+
+def test_draw_wrapped_text_snaps_to_baseline_grid(patched_design_system, mock_db):
+    """Test that lines sit on grid lines with leading rounded up to whole lines."""
+    ds = patched_design_system
+    from drawbot_grid import BaselineGrid
+
+    drawn = []
+    mock_db.text = lambda txt, pos: drawn.append(pos[1])
+
+    grid = BaselineGrid((0, 0, 200, 700), line_height=10)
+    text = "word " * 40
+
+    # 12pt at 1.5 leading = 18pt, snapped to 2 grid lines; ascender 9.6
+    result = ds.draw_wrapped_text(text, 0, 695, 100, 100, "Helvetica", 12, baseline_grid=grid)
+
+    assert drawn[:3] == pytest.approx([680, 660, 640])
+    assert all(y == pytest.approx(10 * round(y / 10)) for y in drawn)
+    assert result.height == pytest.approx(695 - 680 + 2.4 + 20 * (len(drawn) - 1))
+    assert drawn[-1] - 20 - 2.4 < 595  # Next line would pass the box bottom
+    assert result.overflowed
+
+
+def test_text_flow_columns_share_baselines(patched_design_system, mock_db):
+    """Test that frames at different heights align to one baseline grid."""
+    ds = patched_design_system
+    from drawbot_grid import BaselineGrid
+
+    drawn = []
+    mock_db.text = lambda txt, pos: drawn.append(pos)
+
+    grid = BaselineGrid((0, 0, 300, 600), line_height=9)
+    flow = ds.TextFlow(["word " * 60], "Helvetica", 12, paragraph_spacing=5, baseline_grid=grid)
+    flow.fill((0, 300, 100, 200))
+    flow.fill((120, 307, 100, 150))
+
+    left = [y for x, y in drawn if x == 0]
+    right = [y for x, y in drawn if x == 120]
+    assert left and right
+    for y in left + right:
+        assert y == pytest.approx(600 - 9 * round((600 - y) / 9))
+    assert left[0] - left[1] == pytest.approx(18)  # 18pt leading = 2 grid lines
+
+
+def test_text_flow_fills_frames_across_pages(patched_design_system, mock_db):
+    """Test that paragraphs flow through frames and pages in order."""
+    ds = patched_design_system
+
+    drawn = []
+    mock_db.text = lambda txt, pos: drawn.append((txt, pos))
+
+    paragraphs = [f"paragraph {n} has a handful of words in it" for n in range(30)]
+    consumed = []
+
+    def paragraph_stream():
+        for paragraph in paragraphs:
+            consumed.append(paragraph)
+            yield paragraph
+
+    # Two 100pt-wide frames per page, each holding 5 lines of 18pt leading
+    frames = [(0, 0, 100, 84), (120, 0, 100, 84)]
+    flow = ds.TextFlow(paragraph_stream(), "Helvetica", 12)
+    pages = flow.pages(lambda number: frames)
+
+    first = next(pages)
+    assert first.number == 0
+    assert first.lines == 10
+    assert first.frames == frames
+    assert len(consumed) < len(paragraphs)  # Paragraphs are pulled lazily
+
+    rest = list(pages)
+    expected = [line for p in paragraphs for line in ds.wrap_text_to_width(p, 100, "Helvetica", 12)]
+    assert [txt for txt, _ in drawn] == expected
+    assert sum(page.lines for page in [first] + rest) == len(expected)
+    assert not flow.has_more
+
+    # Lines start at the top of each frame and step down by the leading
+    assert drawn[0][1] == (0, 84 - 9.6)
+    assert drawn[1][1] == (0, 84 - 9.6 - 18)
+    assert drawn[5][1] == (120, 84 - 9.6)
+
+
+def test_text_flow_rewraps_for_narrower_frame(patched_design_system, mock_db):
+    """Test that a paragraph continues at the new width when frame widths differ."""
+    ds = patched_design_system
+
+    drawn = []
+    mock_db.text = lambda txt, pos: drawn.append(txt)
+
+    text = "one two three four five six seven eight nine ten"
+    flow = ds.TextFlow([text], "Helvetica", 12)
+
+    assert flow.fill((0, 0, 200, 15)) == 1
+    assert flow.has_more
+    flow.fill((0, 0, 60, 500))
+    assert not flow.has_more
+
+    first = ds.wrap_text_to_width(text, 200, "Helvetica", 12)[0]
+    rest = text[len(first):].strip()
+    assert drawn == [first] + ds.wrap_text_to_width(rest, 60, "Helvetica", 12)
+
+
+def test_text_flow_rejects_frames_too_small(patched_design_system, mock_db):
+    """Test that pages too small for any line raise instead of looping forever."""
+    ds = patched_design_system
+
+    flow = ds.TextFlow(["some text"], "Helvetica", 12)
+    with pytest.raises(ValueError):
+        list(flow.pages(lambda number: [(0, 0, 100, 5)]))
+
+
+def test_fit_text_to_box_finds_largest_size(patched_design_system, mock_db):
+    """Test that the fit solver returns the largest size whose layout fits."""
+    ds = patched_design_system
+
+    text = "the quick brown fox jumps over the lazy dog"
+
+    def block_height(size, lines):
+        return size * 0.8 + size * 0.2 + (len(lines) - 1) * size * 1.5
+
+    size, lines = ds.fit_text_to_box(text, 200, 120, "Helvetica", 6, 72, precision=0.1)
+
+    assert 6 <= size < 72
+    assert lines == ds.wrap_text_to_width(text, 200, "Helvetica", size)
+    assert block_height(size, lines) <= 120
+
+    # A slightly larger size no longer fits
+    bigger = size + 0.2
+    bigger_lines = ds.wrap_text_to_width(text, 200, "Helvetica", bigger)
+    assert block_height(bigger, bigger_lines) > 120
+
+
+def test_fit_text_to_box_measures_only_reference_size(patched_design_system, mock_db):
+    """Test that bisection reuses advances measured at max_size."""
+    ds = patched_design_system
+
+    sizes = []
+    text_size = mock_db.textSize
+
+    def recording_text_size(text):
+        sizes.append(mock_db._size)
+        return text_size(text)
+
+    mock_db.textSize = recording_text_size
+
+    ds.fit_text_to_box("a headline that needs fitting", 150, 80, "Helvetica", 8, 96)
+    assert set(sizes) == {96}
+
+
+def test_fit_text_to_box_bounds(patched_design_system, mock_db):
+    """Test the solver at both ends of the size range."""
+    ds = patched_design_system
+
+    assert ds.fit_text_to_box("hi", 500, 500, "Helvetica", 8, 48) == (48, ["hi"])
+
+    size, lines = ds.fit_text_to_box("many words " * 50, 50, 20, "Helvetica", 8, 48)
+    assert size == 8
+    assert len(lines) > 1
+
+    with pytest.raises(ValueError):
+        ds.fit_text_to_box("hi", 100, 100, "Helvetica", 48, 8)
+
+
+def test_incremental_wrapper_matches_full_wrap(patched_design_system, mock_db):
+    """Test that incremental re-wraps give the same lines as wrapping from scratch."""
+    ds = patched_design_system
+
+    words = ("lorem ipsum dolor sit amet https://example.com/a/very/long/path "
+             "consectetur adipiscing elit sed do eiusmod tempor").split() * 20
+    wrapper = ds.IncrementalWrapper(120, "Helvetica", 12)
+
+    edits = [
+        lambda w: w,
+        lambda w: w[:50] + ["inserted", "words"] + w[50:],
+        lambda w: w[:10] + w[12:],
+        lambda w: w[:80] + ["x"] + w[81:],
+        lambda w: ["first"] + w,
+        lambda w: w + ["last", "words"],
+        lambda w: w[:100] + ["supercalifragilisticexpialidocious"] + w[101:],
+        lambda w: [],
+        lambda w: ["fresh", "start"],
+    ]
+    for edit in edits:
+        words = edit(words)
+        text = " ".join(words)
+        assert wrapper.wrap(text) == ds.wrap_text_to_width(text, 120, "Helvetica", 12)
+
+
+def test_incremental_wrapper_reflows_locally(patched_design_system, mock_db):
+    """Test that a one-word edit only re-breaks lines near the edit."""
+    ds = patched_design_system
+
+    words = ["word"] * 2000
+    wrapper = ds.IncrementalWrapper(120, "Helvetica", 12)
+    lines = wrapper.wrap(" ".join(words))
+    assert wrapper.reflowed_lines == len(lines)
+
+    # Shorter word: its line still holds three words, so breaks re-converge
+    words[1000] = "wrd"
+    assert wrapper.wrap(" ".join(words)) == ds.wrap_text_to_width(" ".join(words), 120, "Helvetica", 12)
+    assert wrapper.reflowed_lines <= 3
+
+    wrapper.wrap(" ".join(words))
+    assert wrapper.reflowed_lines == 0
+
+
+def test_draw_wrapped_text_rejects_mismatched_wrapper(patched_design_system, mock_db):
+    """Test that a wrapper built for another style or algorithm can't be used."""
+    ds = patched_design_system
+
+    wrapper = ds.IncrementalWrapper(120, "Helvetica", 12)
+    with pytest.raises(ValueError):
+        ds.draw_wrapped_text("text", 0, 500, 200, 200, "Helvetica", 12, wrapper=wrapper)
+
+    wrapper = ds.IncrementalWrapper(200, "Helvetica", 12)
+    with pytest.raises(ValueError, match="greedily"):
+        ds.draw_wrapped_text("text", 0, 500, 200, 200, "Helvetica", 12,
+                             algorithm="optimal", wrapper=wrapper)
+
+
+def test_incremental_wrapper_remeasures_after_variation_change(patched_design_system, mock_db, tmp_path):
+    """Test that kept widths are dropped when the variation location changes."""
+    ds = patched_design_system
+    mock_db.fontVariations = lambda **axes: None
+
+    path = _build_variable_font(tmp_path / "variable.ttf")
+    ds.set_measurement_backend(ds.FontToolsBackend({"Test Variable": str(path)}))
+
+    # "A" is 6pt wide at the default weight and 8pt at wght 900
+    wrapper = ds.IncrementalWrapper(25, "Test Variable", 10)
+    assert wrapper.wrap("A A A A") == ["A A A", "A"]
+    ds.set_font_variation(wght=900)
+    try:
+        assert wrapper.wrap("A A A A") == ["A A", "A A"]
+        assert wrapper.reflowed_lines == 2
+    finally:
+        ds.set_font_variation(resetVariations=True)
+
+
+# ==================== FONT FILE FIXTURES ====================
+
+def _build_test_font(path, kerning_fea="pos A V -80;", family="Test Sans", style="Regular",
+                     extra_fea=""):
+    """Build a tiny TrueType font with fixed advances and GPOS kerning."""
+    pytest.importorskip("fontTools")
+    from fontTools.fontBuilder import FontBuilder
+    from fontTools.feaLib.builder import addOpenTypeFeaturesFromString
+    from fontTools.pens.ttGlyphPen import TTGlyphPen
+
+    glyph_order = [".notdef", "space", "A", "V", "a", "o"]
+    advances = {".notdef": 500, "space": 250, "A": 600, "V": 600, "a": 500, "o": 500}
+
+    def box(width):
+        pen = TTGlyphPen(None)
+        pen.moveTo((50, 0))
+        pen.lineTo((50, 700))
+        pen.lineTo((width - 50, 700))
+        pen.lineTo((width - 50, 0))
+        pen.closePath()
+        return pen.glyph()
+
+    fb = FontBuilder(1000, isTTF=True)
+    fb.setupGlyphOrder(glyph_order)
+    fb.setupCharacterMap({0x20: "space", 0x41: "A", 0x56: "V", 0x61: "a", 0x6F: "o"})
+    fb.setupGlyf({name: box(width) for name, width in advances.items()})
+    fb.setupHorizontalMetrics({name: (width, 50) for name, width in advances.items()})
+    fb.setupHorizontalHeader(ascent=800, descent=-200)
+    fb.setupNameTable({"familyName": family, "styleName": style,
+                       "psName": f"{family}-{style}".replace(" ", "")})
+    fb.setupOS2(sTypoAscender=800, sTypoDescender=-200, sTypoLineGap=200,
+                usWinAscent=800, usWinDescent=200, sxHeight=500, sCapHeight=700)
+    fb.setupPost()
+    addOpenTypeFeaturesFromString(fb.font, f"feature kern {{ {kerning_fea} }} kern; {extra_fea}")
+    fb.save(str(path))
+    return path
+
+
+def _build_variable_font(path):
+    """Build a one-axis (wght 100-900) variable font where 'A' widens by 200 units."""
+    pytest.importorskip("fontTools")
+    from fontTools.fontBuilder import FontBuilder
+    from fontTools.pens.ttGlyphPen import TTGlyphPen
+    from fontTools.ttLib.tables.TupleVariation import TupleVariation
+
+    advances = {".notdef": 500, "space": 250, "A": 600}
+
+    def box(width):
+        pen = TTGlyphPen(None)
+        pen.moveTo((50, 0))
+        pen.lineTo((50, 700))
+        pen.lineTo((width - 50, 700))
+        pen.lineTo((width - 50, 0))
+        pen.closePath()
+        return pen.glyph()
+
+    fb = FontBuilder(1000, isTTF=True)
+    fb.setupGlyphOrder(list(advances))
+    fb.setupCharacterMap({0x20: "space", 0x41: "A"})
+    fb.setupGlyf({name: box(width) for name, width in advances.items()})
+    fb.setupHorizontalMetrics({name: (width, 50) for name, width in advances.items()})
+    fb.setupHorizontalHeader(ascent=800, descent=-200)
+    fb.setupNameTable({"familyName": "Test Variable", "styleName": "Regular"})
+    fb.setupOS2()
+    fb.setupPost()
+    fb.setupFvar([("wght", 100, 400, 900, "Weight")], [])
+    # Deltas for the 4 outline points, then the (left, right, top, bottom) phantoms
+    wide = [(0, 0)] * 4 + [(0, 0), (200, 0), (0, 0), (0, 0)]
+    fb.setupGvar({"A": [TupleVariation({"wght": (0, 1, 1)}, wide)]})
+    fb.save(str(path))
+    return path
+
+
+def test_kerning_pairs_read_from_gpos(patched_design_system, tmp_path):
+    """Test that GPOS pair kerning is read with fontTools, including class pairs."""
+    ds = patched_design_system
+
+    path = _build_test_font(
+        tmp_path / "kerned.ttf",
+        "pos A V -80; @ROUND = [a o]; pos V @ROUND -40;",
+    )
+    kerning = ds._kerning_pairs(str(path))
+
+    assert kerning.units_per_em == 1000
+    assert kerning.pair("A", "V") == -80
+    assert kerning.pair("V", "o") == -40
+    assert kerning.pair("V", "A") == 0
+    assert kerning.pair("A", "z") == 0
+
+
+def test_advance_table_applies_kerning(patched_design_system, mock_db, tmp_path):
+    """Test that measured word widths include kerning scaled to the point size."""
+    ds = patched_design_system
+
+    path = _build_test_font(tmp_path / "kerned.ttf")
+    mock_db.fontFilePath = lambda: str(path)
+
+    table = ds._advance_table("Test Sans", 10)
+    plain = 2 * 10 * 0.6
+
+    assert table.measure("AV") == pytest.approx(plain - 80 * 10 / 1000)
+    assert table.measure("VA") == pytest.approx(plain)
+
+
+def _build_test_collection(tmp_path):
+    """Build a .ttc with 'Test Sans Regular' (kern A V -80) and 'Test Sans Bold' (-30)."""
+    from fontTools.ttLib import TTCollection, TTFont
+
+    regular = _build_test_font(tmp_path / "regular.ttf", "pos A V -80;")
+    bold = _build_test_font(tmp_path / "bold.ttf", "pos A V -30;", style="Bold")
+    collection = TTCollection()
+    collection.fonts = [TTFont(str(regular)), TTFont(str(bold))]
+    path = tmp_path / "TestSans.ttc"
+    collection.save(str(path))
+    return path
+
+
+def test_kerning_uses_collection_face(patched_design_system, mock_db, tmp_path):
+    """Kerning for a face inside a .ttc comes from that face, not face 0."""
+    ds = patched_design_system
+
+    path = _build_test_collection(tmp_path)
+    mock_db.fontFilePath = lambda: str(path)
+
+    assert ds._face_index(str(path), "Test Sans Bold") == 1
+    assert ds._face_index(str(path), "TestSans-Regular") == 0
+    assert ds.DrawBotBackend().kerning("Test Sans Bold").pair("A", "V") == -30
+    assert ds.DrawBotBackend().kerning("Test Sans").pair("A", "V") == -80
+    assert ds.DrawBotBackend().kerning("Helvetica Bold") is None
+
+    backend = ds.FontToolsBackend({"Test Sans Bold": str(path)})
+    assert backend.font_face("Test Sans Bold") == (str(path), 1)
+    assert backend.kerning("Test Sans Bold").pair("A", "V") == -30
+
+
+class NoDrawBot:
+    """Stand-in that fails loudly if anything touches DrawBot."""
+
+    def __getattr__(self, name):
+        raise AssertionError(f"DrawBot used in headless mode: db.{name}")
+
+
+def test_fonttools_backend_measures_headless(patched_design_system, tmp_path):
+    """Test that wrapping and metrics run from font tables alone."""
+    ds = patched_design_system
+    ds.db = NoDrawBot()
+
+    path = _build_test_font(tmp_path / "kerned.ttf")
+    ds.set_measurement_backend(ds.FontToolsBackend({"Test Sans": str(path)}))
+
+    # hmtx advances: A/V 600 units, space 250 units, kern A V -80 units
+    advances = ds._advance_table("Test Sans", 10)
+    assert advances.measure("AV") == pytest.approx(11.2)
+    assert advances.advance(" ") == pytest.approx(2.5)
+    assert advances.advance("?") == pytest.approx(5.0)  # .notdef
+
+    lines = ds.wrap_text_to_width("AV AV AV", 25, "Test Sans", 10)
+    assert lines == ["AV AV", "AV"]
+
+    metrics = ds.get_text_metrics("AV", "Test Sans", 10)
+    assert metrics['width'] == pytest.approx(11.2)
+    assert metrics['ascender'] == pytest.approx(8)
+    assert metrics['descender'] == pytest.approx(-2)
+    assert metrics['x_height'] == pytest.approx(5)
+    assert metrics['cap_height'] == pytest.approx(7)
+
+    assert ds.calculate_chars_per_line(100, "Test Sans", 10) == 20
+
+
+def test_fonttools_backend_measures_variable_instances(patched_design_system, mock_db, tmp_path):
+    """Test that advances follow the active axis location, one instance per location."""
+    ds = patched_design_system
+    mock_db.fontVariations = lambda **axes: None
+
+    path = _build_variable_font(tmp_path / "variable.ttf")
+    ds.set_measurement_backend(ds.FontToolsBackend({"Test Variable": str(path)}))
+
+    assert ds._advance_table("Test Variable", 10).advance("A") == pytest.approx(6.0)
+
+    ds.set_font_variation(wght=900)
+    assert ds._advance_table("Test Variable", 10).advance("A") == pytest.approx(8.0)
+    assert ds._advance_table("Test Variable", 20).advance("A") == pytest.approx(16.0)
+    assert len(ds._instance_cache) == 1
+
+    ds.set_font_variation(wght=650)
+    assert ds._advance_table("Test Variable", 10).advance("A") == pytest.approx(7.0)
+
+    # Out-of-range values clamp to the axis; unknown axes are ignored
+    ds.set_font_variation(wght=2000, wdth=50)
+    assert ds._advance_table("Test Variable", 10).advance("A") == pytest.approx(8.0)
+    assert len(ds._instance_cache) == 2
+
+    ds.set_font_variation(resetVariations=True)
+
+
+def test_instance_cache_is_bounded_by_memory(patched_design_system):
+    """Test that the least recently used instances are evicted over budget."""
+    ds = patched_design_system
+
+    cache = ds._InstanceCache(max_bytes=1)
+    table = {"A": 600}
+    built = []
+
+    def build(location):
+        built.append(location)
+        return dict(table)
+
+    cache.get(("font", (("wght", 500),)), build)
+    cache.get(("font", (("wght", 500),)), build)
+    assert len(built) == 1
+
+    cache.get(("font", (("wght", 600),)), build)
+    assert len(cache) == 1
+    cache.get(("font", (("wght", 500),)), build)
+    assert len(built) == 3
+
+
+def test_variation_axes_queried_once(patched_design_system, tmp_path):
+    """Test that get_font_variation_axes caches per font and returns copies."""
+    ds = patched_design_system
+    ds.db = NoDrawBot()
+
+    path = _build_variable_font(tmp_path / "variable.ttf")
+    backend = ds.FontToolsBackend({"Test Variable": str(path)})
+    ds.set_measurement_backend(backend)
+
+    calls = []
+    axes_for = backend.variation_axes
+    backend.variation_axes = lambda font: calls.append(font) or axes_for(font)
+
+    axes = ds.get_font_variation_axes("Test Variable")
+    assert axes == {"wght": {"minValue": 100, "defaultValue": 400, "maxValue": 900}}
+
+    axes["wght"]["maxValue"] = 0
+    assert ds.get_font_variation_axes("Test Variable")["wght"]["maxValue"] == 900
+    assert calls == ["Test Variable"]
+
+
+def test_variation_axes_set_the_font_on_cache_hit(patched_design_system, mock_db):
+    """Test that a cached axes query still makes the font DrawBot's current one."""
+    ds = patched_design_system
+    mock_db.listFontVariations = lambda: {"wght": {"minValue": 100, "defaultValue": 400, "maxValue": 900}}
+
+    ds.get_font_variation_axes("Test Variable")
+    mock_db.font("Helvetica")
+    assert "wght" in ds.get_font_variation_axes("Test Variable")
+    assert mock_db._font == "Test Variable"
+
+
+def test_fonttools_backend_accepts_paths_and_resolver(patched_design_system, tmp_path):
+    """Test font name resolution for the headless backend."""
+    ds = patched_design_system
+
+    path = str(_build_test_font(tmp_path / "kerned.ttf"))
+
+    backend = ds.FontToolsBackend(resolver=lambda name: path if name == "Test" else None)
+    assert backend.font_path(path) == path
+    assert backend.font_path("Test") == path
+
+    with pytest.raises(ValueError):
+        backend.font_path("Missing Font")
+
+
+def test_harfbuzz_backend_shapes_runs(patched_design_system, tmp_path):
+    """Test that shaped widths apply GPOS kerning and honour feature toggles."""
+    pytest.importorskip("uharfbuzz")
+    ds = patched_design_system
+    ds.db = NoDrawBot()
+
+    path = _build_test_font(tmp_path / "kerned.ttf")
+    backend = ds.HarfBuzzBackend({"Test Sans": str(path)})
+    ds.set_measurement_backend(backend)
+
+    assert backend.kerning("Test Sans") is None
+    assert ds._advance_table("Test Sans", 10).measure("AV") == pytest.approx(11.2)
+    assert ds.wrap_text_to_width("AV AV AV", 25, "Test Sans", 10) == ["AV AV", "AV"]
+
+    unkerned = backend.run_width("Test Sans", 10, "AV", (("kern", False),), ())
+    assert unkerned == pytest.approx(12.0)
+
+
+def test_harfbuzz_char_width_applies_active_features(patched_design_system, mock_db, tmp_path):
+    """Test that per-character advances are shaped with the active features."""
+    pytest.importorskip("uharfbuzz")
+    ds = patched_design_system
+    mock_db.openTypeFeatures = lambda **features: None
+
+    # smcp maps A (600 units) to a (500 units)
+    path = _build_test_font(tmp_path / "smcp.ttf", extra_fea="feature smcp { sub A by a; } smcp;")
+    backend = ds.HarfBuzzBackend({"Test Sans": str(path)})
+    ds.set_measurement_backend(backend)
+
+    assert backend.char_width("Test Sans", 10, "A") == pytest.approx(6.0)
+    ds.set_opentype_features(["smcp"])
+    try:
+        assert backend.char_width("Test Sans", 10, "A") == pytest.approx(5.0)
+        assert ds._advance_table("Test Sans", 10).advance("A") == pytest.approx(
+            ds._advance_table("Test Sans", 10).measure("A")
+        )
+    finally:
+        ds._active_features.clear()
+
+
+def test_harfbuzz_backend_caches_shaped_runs(patched_design_system, tmp_path):
+    """Test that repeated runs are shaped once and the cache stays bounded."""
+    hb = pytest.importorskip("uharfbuzz")
+    ds = patched_design_system
+
+    path = _build_test_font(tmp_path / "kerned.ttf")
+    backend = ds.HarfBuzzBackend({"Test Sans": str(path)}, cache_size=2)
+
+    shaped = []
+    shape = hb.shape
+
+    def counting_shape(*args, **kwargs):
+        shaped.append(args)
+        return shape(*args, **kwargs)
+
+    with patch.object(hb, "shape", counting_shape):
+        for size in (10, 12, 10):
+            backend.run_width("Test Sans", size, "AV", (), ())
+        assert len(shaped) == 1
+
+        backend.run_width("Test Sans", 10, "VA", (), ())
+        backend.run_width("Test Sans", 10, "AA", (), ())
+        assert len(backend._runs) == 2
+        backend.run_width("Test Sans", 10, "AV", (), ())
+        assert len(shaped) == 4
+
+
+def test_font_index_resolves_names(patched_design_system, tmp_path):
+    """Test lookups by family, 'Family Style' and PostScript name."""
+    ds = patched_design_system
+
+    fonts = tmp_path / "fonts"
+    fonts.mkdir()
+    regular = str(_build_test_font(fonts / "TestSans.ttf"))
+    bold = str(_build_test_font(fonts / "TestSans-Bold.ttf", style="Bold"))
+
+    index = ds.FontIndex([fonts], tmp_path / "fonts.sqlite3")
+
+    assert len(index) == 2
+    assert index.resolve("Test Sans") == regular
+    assert index.resolve("Test Sans Bold") == bold
+    assert index.resolve("TestSans-Bold") == bold
+    assert index.resolve("Missing Font") is None
+    assert index.families() == ["Test Sans"]
+
+    record = index.lookup("test sans bold")
+    assert (record.family, record.style, record.units_per_em) == ("Test Sans", "Bold", 1000)
+    assert (record.ascender, record.cap_height, record.x_height) == (800, 700, 500)
+
+
+def test_font_index_persists_between_processes(patched_design_system, tmp_path):
+    """Test that a reopened index resolves without parsing unchanged files."""
+    ds = patched_design_system
+
+    fonts = tmp_path / "fonts"
+    fonts.mkdir()
+    path = str(_build_test_font(fonts / "TestSans.ttf"))
+    ds.FontIndex([fonts], tmp_path / "fonts.sqlite3").close()
+
+    parsed = []
+    index_file = ds.FontIndex._index_file
+
+    def counting_index_file(self, file_path, stat):
+        parsed.append(file_path)
+        index_file(self, file_path, stat)
+
+    with patch.object(ds.FontIndex, "_index_file", counting_index_file):
+        index = ds.FontIndex([fonts], tmp_path / "fonts.sqlite3")
+        assert index.resolve("Test Sans") == path
+        assert parsed == []
+
+        # New fonts are only picked up by an explicit refresh
+        added = str(_build_test_font(fonts / "Other.ttf", family="Other Serif"))
+        assert index.resolve("Other Serif") is None
+        assert parsed == []
+        assert index.refresh() == 1
+        assert index.resolve("Other Serif") == added
+        assert parsed == [added]
+
+        # Changed files are parsed again; removed files are forgotten
+        stat = os.stat(path)
+        os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+        os.remove(added)
+        assert index.refresh() == 1
+        assert index.resolve("Other Serif") is None
+
+
+def test_wrap_many_dedupes_and_keeps_order(patched_design_system, mock_db):
+    """Test that identical blocks are wrapped once and results keep input order."""
+    ds = patched_design_system
+
+    wrapped = []
+    wrap = ds.wrap_text_to_width
+
+    def counting_wrap(text, *args, **kwargs):
+        wrapped.append(text)
+        return wrap(text, *args, **kwargs)
+
+    ds.wrap_text_to_width = counting_wrap
+
+    blocks = [
+        ("hello world", 50, "Helvetica", 12),
+        ("hi", 100, "Helvetica", 12),
+        ("hello world", 50, "Helvetica", 12),
+        ("hello world", 200, "Helvetica", 12),
+    ]
+    results = ds.wrap_many(blocks)
+
+    assert results == [["hello", "world"], ["hi"], ["hello", "world"], ["hello world"]]
+    assert results[0] is not results[2]
+    assert len(wrapped) == 3
+
+
+def test_wrap_many_process_pool(patched_design_system, tmp_path):
+    """Test that headless backends fan out to worker processes."""
+    ds = patched_design_system
+
+    path = _build_test_font(tmp_path / "kerned.ttf")
+    ds.set_measurement_backend(ds.FontToolsBackend({"Test Sans": str(path)}))
+
+    blocks = [("AV " * n, 25 + n, "Test Sans", 10) for n in range(1, 9)]
+    expected = [ds.wrap_text_to_width(*block) for block in blocks]
+
+    assert ds.wrap_many(blocks, workers=2) == expected
+
+
+def test_wrap_many_workers_use_active_style(patched_design_system, monkeypatch, tmp_path):
+    """Spawned workers wrap with the caller's variations and a FontIndex resolver."""
+    import concurrent.futures
+    import functools
+    import multiprocessing
+    ds = patched_design_system
+    ds.db.fontVariations = lambda **axes: None
+
+    _build_variable_font(tmp_path / "variable.ttf")
+    index = ds.FontIndex([tmp_path], tmp_path / "index.sqlite3")
+    ds.set_measurement_backend(ds.FontToolsBackend(resolver=index.resolve))
+
+    # Spawned workers start from a fresh module: nothing inherited by fork
+    monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", functools.partial(
+        concurrent.futures.ProcessPoolExecutor, mp_context=multiprocessing.get_context("spawn")
+    ))
+
+    # "A" is 6pt wide at the default weight and 8pt at wght 900
+    blocks = [("A A A A", 25, "Test Variable", 10), ("A A A", 25, "Test Variable", 10)]
+    ds.set_font_variation(wght=900)
+    try:
+        expected = [ds.wrap_text_to_width(*block) for block in blocks]
+        assert expected[0] == ["A A", "A A"]
+        assert ds.wrap_many(blocks, workers=2) == expected
+    finally:
+        ds.set_font_variation(resetVariations=True)
+        index.close()
+
+
 # ==================== LAYOUT VALIDATION TESTS ====================
 
 def test_validate_layout_fit_success(patched_design_system):
@@ -247,6 +1221,190 @@ def test_validate_empty_layout(patched_design_system):
     assert error is None
 
 
+def test_validate_layout_reports_non_adjacent_overlaps(patched_design_system):
+    """Overlaps are found between any pair, and all of them are reported."""
+    ds = patched_design_system
+
+    elements = [
+        {'y': 700, 'height': 500, 'x': 40, 'width': 100, 'name': 'Sidebar'},
+        {'y': 650, 'height': 50, 'x': 200, 'width': 300, 'name': 'Title'},
+        {'y': 500, 'height': 50, 'x': 200, 'width': 300, 'name': 'Intro'},
+        {'y': 300, 'height': 100, 'x': 100, 'width': 300, 'name': 'Figure'},
+        {'y': 900, 'height': 100, 'name': 'Masthead'},
+    ]
+
+    fits, error = ds.validate_layout_fit(elements, page_height=800, page_width=600)
+
+    assert fits is False
+    lines = error.split("\n")
+    assert lines[0] == "Masthead extends 100.0pt above page top"
+    assert "Sidebar overlaps Figure by 100.0pt" in lines
+    assert len(lines) == 2
+    assert ds.find_overlaps(elements, page_width=600) == [(0, 3, 100.0)]
+
+
+def test_find_overlaps_side_by_side_and_touching(patched_design_system):
+    """Elements separated in x, or only sharing an edge, do not overlap."""
+    ds = patched_design_system
+
+    columns = [{'y': 700, 'height': 600, 'x': 50 + i * 100, 'width': 100} for i in range(5)]
+    assert ds.find_overlaps(columns) == []
+
+    full_width = [{'y': 700, 'height': 100}, {'y': 650, 'height': 10}]
+    overlaps = ds.find_overlaps(columns + full_width)
+    assert overlaps[:2] == [(0, 5, 100.0), (0, 6, 10.0)]
+    assert overlaps[-1] == (5, 6, 10.0)
+    assert len(overlaps) == 11
+
+
+def test_find_overlaps_matches_pairwise_scan(patched_design_system):
+    """The sweep finds exactly the pairs a brute-force comparison finds."""
+    import random
+    ds = patched_design_system
+
+    rng = random.Random(7)
+    elements = [
+        {'x': rng.randrange(0, 500), 'y': rng.randrange(50, 800),
+         'width': rng.randrange(1, 80), 'height': rng.randrange(1, 50)}
+        for _ in range(300)
+    ]
+    # Tall columns in reverse x order, touching edge to edge
+    elements += [{'x': 600 - 10 * i, 'y': 800, 'width': 10, 'height': 750} for i in range(60)]
+
+    expected = set()
+    for i, a in enumerate(elements):
+        for j, b in enumerate(elements[:i]):
+            if (a['x'] < b['x'] + b['width'] and b['x'] < a['x'] + a['width']
+                    and a['y'] - a['height'] < b['y'] and b['y'] - b['height'] < a['y']):
+                expected.add(frozenset((i, j)))
+
+    found = {frozenset((a, b)) for a, b, _ in ds.find_overlaps(elements)}
+    assert found == expected
+
+
+def test_layout_tracker_raises_at_offending_element(patched_design_system):
+    """A strict tracker stops at the first element that breaks the layout."""
+    ds = patched_design_system
+
+    tracker = ds.LayoutTracker(600, 800)
+    tracker.rect(0, 0, 600, 800, name="Background")
+    tracker.text(50, 600, 500, 100, name="Headline")
+    tracker.oval(400, 550, 100, 100, name="Badge")  # shapes sit on no layer
+    tracker.text(50, 400, 500, 150, name="Body")
+    tracker.image(0, 350, 600, 450, name="Photo")  # images sit on their own layer
+
+    with pytest.raises(ds.LayoutError) as excinfo:
+        tracker.text(300, 450, 200, 200, name="Pull quote")
+
+    assert isinstance(excinfo.value, ValueError)
+    assert excinfo.value.issues == [
+        "Headline overlaps Pull quote by 50.0pt",
+        "Pull quote overlaps Body by 100.0pt",
+    ]
+    assert len(tracker) == 6
+    with pytest.raises(ds.LayoutError, match="Photo overlaps Inset"):
+        tracker.image(100, 500, 100, 100, name="Inset")
+
+
+def test_layout_tracker_collects_issues(patched_design_system):
+    """Non-strict trackers collect boundary and overlap issues like validate_layout_fit."""
+    ds = patched_design_system
+
+    tracker = ds.LayoutTracker(600, 800, strict=False, cell_size=50)
+    assert tracker.rect(-20, 700, 100, 150, name="Bar") == [
+        "Bar extends 50.0pt above page top",
+        "Bar extends 20.0pt past left edge",
+    ]
+    assert tracker.text(0, 0, 300, 200, name="Left") == []
+    assert tracker.text(300, 0, 300, 200, name="Right") == []
+    assert tracker.text(250, 150, 100, 100, name="Note", layer="notes") == []
+    tracker.text(290, 100, 20, 20, name="Pull quote")
+
+    fits, error = tracker.validate()
+    expected = [elem for elem in tracker.elements if elem['layer'] == 'content']
+    assert fits is False
+    assert error.split("\n")[2:] == [
+        "Left overlaps Pull quote by 20.0pt",
+        "Right overlaps Pull quote by 20.0pt",
+    ]
+    assert ds.validate_layout_fit(expected, 800, 600)[1] == "\n".join(error.split("\n")[2:])
+
+    tracker.new_page()
+    assert len(tracker) == 0 and tracker.validate() == (True, None)
+
+
+def test_layout_tracker_bleed(patched_design_system):
+    """Elements may run into the bleed without being flagged."""
+    ds = patched_design_system
+
+    tracker = ds.LayoutTracker(600, 800, bleed=9)
+    tracker.rect(-9, -9, 618, 818)
+    with pytest.raises(ds.LayoutError, match="1.0pt past right edge"):
+        tracker.image(500, 100, 110, 100)
+
+
+def test_validate_layouts_report(patched_design_system):
+    """Batch validation yields one ordered record per page, including bad ones."""
+    import json
+    ds = patched_design_system
+
+    pages = [
+        [{'y': 700, 'height': 100}, {'y': 500, 'height': 100}],
+        json.dumps({'page': 'cover', 'page_height': 400,
+                    'elements': [{'y': 450, 'height': 100, 'name': 'Logo'}]}),
+        '{"elements": [{"height": 10}]}',
+        'not json',
+    ]
+
+    report = list(ds.validate_layouts(pages, page_height=800, workers=0, chunksize=3))
+
+    assert [r['page'] for r in report] == [0, 'cover', 2, 3]
+    assert [r['fits'] for r in report] == [True, False, False, False]
+    assert report[0]['issues'] == [] and report[0]['elements'] == 2
+    assert report[1]['issues'] == ["Logo extends 50.0pt above page top"]
+    assert report[2]['error'] == "missing key 'y'"
+    assert 'error' in report[3]
+    assert all(r['ms'] >= 0 for r in report)
+
+
+def test_validate_layouts_process_pool(patched_design_system):
+    """Worker processes give the same results as in-process validation."""
+    ds = patched_design_system
+
+    pages = [
+        [{'y': 700 - i, 'height': 100, 'x': 0, 'width': 50},
+         {'y': 650, 'height': 100, 'x': i, 'width': 50}]
+        for i in range(0, 100, 5)
+    ]
+
+    def strip(report):
+        return [{k: v for k, v in r.items() if k != 'ms'} for r in report]
+
+    serial = strip(ds.validate_layouts(pages, page_height=800, workers=1))
+    parallel = strip(ds.validate_layouts(pages, page_height=800, workers=2, chunksize=4))
+
+    assert parallel == serial
+    assert sum(not r['fits'] for r in serial) == 10
+
+
+def test_validate_layouts_malformed_records(patched_design_system):
+    """Records of the wrong shape fail their own page, not the whole stream."""
+    ds = patched_design_system
+
+    pages = ['[1]', '"x"', '{"elements": {"y": 10}}', [{'y': 10, 'height': 5}, 'text'],
+             [{'y': 700, 'height': 100}]]
+
+    for workers in (0, 2):
+        report = list(ds.validate_layouts(pages, page_height=800, workers=workers, chunksize=2))
+        assert [r['fits'] for r in report] == [False, False, False, False, True]
+        assert [r.get('error') for r in report[:4]] == [
+            "element 0 must be an object, got int",
+            "elements must be a list, got str",
+            "elements must be a list, got dict",
+            "element 1 must be an object, got str",
+        ]
+
+
 # ==================== METRICS TESTS ====================
 
 def test_descender_is_negative(patched_design_system, mock_db):
@@ -270,6 +1428,126 @@ def test_get_text_metrics_structure(patched_design_system, mock_db):
         assert key in metrics, f"Missing key: {key}"
 
 
+def test_font_metrics_queried_once_per_style(patched_design_system, mock_db):
+    """Test that font-wide metrics are cached per (font, size, variations)."""
+    ds = patched_design_system
+
+    queries = []
+    ascender = mock_db.fontAscender
+
+    def counting_ascender():
+        queries.append(mock_db._size)
+        return ascender()
+
+    mock_db.fontAscender = counting_ascender
+    mock_db.fontVariations = lambda **axes: None
+
+    for _ in range(10):
+        ds.get_text_metrics("test", "Helvetica", 12)
+        ds.draw_wrapped_text("some words", 0, 500, 200, 200, "Helvetica", 12)
+    assert queries == [12]
+
+    ds.get_text_metrics("test", "Helvetica", 24)
+    ds.set_font_variation(wght=700)
+    ds.get_text_metrics("test", "Helvetica", 24)
+    assert queries == [12, 24, 24]
+
+    ds.clear_font_caches()
+    ds.get_text_metrics("test", "Helvetica", 24)
+    assert queries == [12, 24, 24, 24]
+
+
+def test_cached_metrics_are_not_shared_with_callers(patched_design_system, mock_db):
+    """Test that mutating a returned metrics dict doesn't poison the cache."""
+    ds = patched_design_system
+
+    metrics = ds.get_text_metrics("test", "Helvetica", 12)
+    metrics['ascender'] = 0
+
+    assert ds.get_text_metrics("test", "Helvetica", 12)['ascender'] == pytest.approx(9.6)
+
+
+# ==================== COLOR HARMONY TESTS ====================
+
+def test_vectorized_palettes_match_scalar(patched_design_system):
+    """generate_color_palettes matches generate_color_palette for every harmony."""
+    np = pytest.importorskip("numpy")
+    ds = patched_design_system
+
+    rng = np.random.default_rng(11)
+    base = np.vstack([
+        rng.random((200, 3)),
+        [[0.5, 0.5, 0.5], [0, 0, 0], [1, 1, 1], [1, 0, 0], [0, 1, 1]],
+    ])
+
+    for harmony in ds.HARMONIES:
+        palettes = ds.generate_color_palettes(base, harmony)
+        expected = [ds.generate_color_palette(tuple(c), harmony, as_dict=False) for c in base]
+        assert palettes.shape == (len(base), len(expected[0]), 3)
+        np.testing.assert_allclose(palettes, expected, atol=1e-12)
+
+    np.testing.assert_allclose(
+        ds.adjust_lightness_array(base, -0.4),
+        [ds.adjust_lightness(*c, -0.4) for c in base], atol=1e-12
+    )
+
+    with pytest.raises(ValueError, match="Unknown harmony"):
+        ds.generate_color_palettes(base, "clashing")
+    with pytest.raises(ValueError, match="shape"):
+        ds.generate_color_palettes(base[0], "triadic")
+
+
+def test_hls_array_round_trip(patched_design_system):
+    """Vectorized HLS conversion agrees with colorsys and round-trips."""
+    import colorsys
+    np = pytest.importorskip("numpy")
+    ds = patched_design_system
+
+    rgb = np.random.default_rng(5).random((4, 50, 3))
+    hls = ds.rgb_to_hls_array(rgb)
+
+    np.testing.assert_allclose(hls[1, 7], colorsys.rgb_to_hls(*rgb[1, 7]), atol=1e-12)
+    np.testing.assert_allclose(ds.hls_to_rgb_array(hls), rgb, atol=1e-12)
+
+def test_contrast_matrix_matches_pairwise(patched_design_system):
+    """contrast_matrix agrees with check_contrast_ratio for every pair."""
+    np = pytest.importorskip("numpy")
+    ds = patched_design_system
+
+    colors = np.vstack([np.random.default_rng(2).random((40, 3)), [[0, 0, 0], [1, 1, 1]]])
+    ratios, levels = ds.contrast_matrix(colors)
+
+    assert ratios.shape == levels.shape == (42, 42)
+    assert ratios[-2, -1] == pytest.approx(21.0)
+    for i in range(0, 42, 5):
+        for j in range(42):
+            ratio, level = ds.check_contrast_ratio(tuple(colors[i]), tuple(colors[j]))
+            assert ratios[i, j] == pytest.approx(ratio)
+            assert levels[i, j] == level
+
+    backgrounds = colors[:3]
+    rect, _ = ds.contrast_matrix(colors, backgrounds)
+    np.testing.assert_allclose(rect, ratios[:, :3])
+
+
+def test_find_accessible_pairs(patched_design_system):
+    """Only pairs meeting the level are returned, best contrast first."""
+    pytest.importorskip("numpy")
+    ds = patched_design_system
+
+    palette = [(0, 0, 0), (1, 1, 1), (0.5, 0.5, 0.5), (0.95, 0.95, 0.9)]
+
+    pairs = ds.find_accessible_pairs(palette, level="AAA")
+    assert [(i, j) for i, j, _ in pairs] == [(0, 1), (1, 0), (0, 3), (3, 0)]
+    assert pairs[0][2] == pytest.approx(21.0)
+
+    on_white = ds.find_accessible_pairs(palette, backgrounds=[(1, 1, 1)], level="AA-large")
+    assert [i for i, _, _ in on_white] == [0, 2]
+
+    with pytest.raises(ValueError, match="Unknown WCAG level"):
+        ds.find_accessible_pairs(palette, level="A")
+
+
 # ==================== PATH TESTS ====================
 
 def test_output_path_is_absolute(patched_design_system):
@@ -288,3 +1566,108 @@ def test_repo_root_exists(patched_design_system):
 
     assert ds.REPO_ROOT.exists()
     assert ds.REPO_ROOT.is_dir()
+
+
+# ==================== TEXT OUTLINE TESTS ====================
+
+def test_outline_text_places_glyphs(patched_design_system, tmp_path):
+    """Test that outlines are scaled, kerned and translated to the origin."""
+    ds = patched_design_system
+    ds.db = NoDrawBot()
+
+    path = _build_test_font(tmp_path / "kerned.ttf")
+    ds.set_measurement_backend(ds.FontToolsBackend({"Test Sans": str(path)}))
+
+    outlined = ds.outline_text("AVa", "Test Sans", 10, 100, 50)
+    contours = list(outlined.contours())
+
+    assert outlined.width == pytest.approx(16.2)  # (600 - 80 + 600 + 500) units
+    assert len(contours) == 3
+    assert contours[0][0] == pytest.approx((100.5, 50))
+    assert contours[1][0] == pytest.approx((105.7, 50))  # after kerned A V
+    assert max(y for _, y in contours[2]) == pytest.approx(57)
+
+
+def test_outline_text_reuses_cached_glyphs(patched_design_system, tmp_path):
+    """Test that each glyph is flattened once, whatever the size or position."""
+    ds = patched_design_system
+
+    path = _build_test_font(tmp_path / "kerned.ttf")
+    ds.set_measurement_backend(ds.FontToolsBackend({"Test Sans": str(path)}))
+
+    ds.outline_text("AVAV " * 100, "Test Sans", 10)
+    ds.outline_text("AV", "Test Sans", 24, 300, 300)
+
+    assert ds._glyph_outline.cache_info().misses == 3
+
+
+def test_outline_text_uses_collection_face(patched_design_system, mock_db, tmp_path):
+    """Test that faces inside a .ttc are outlined from that face, not face 0."""
+    ds = patched_design_system
+
+    path = _build_test_collection(tmp_path)
+    mock_db.fontFilePath = lambda: str(path)
+
+    # Faces differ in kerning: A V is -80 units in Regular, -30 in Bold
+    assert ds.outline_text("AV", "Test Sans", 10).width == pytest.approx(11.2)
+    assert ds.outline_text("AV", "Test Sans Bold", 10).width == pytest.approx(11.7)
+    with pytest.raises(ValueError, match="Cannot find face"):
+        ds.outline_text("AV", "Test Sans Black", 10)
+
+
+def test_outline_text_follows_variation_location(patched_design_system, mock_db, tmp_path):
+    """Test that glyph advances come from the active variable-font instance."""
+    ds = patched_design_system
+    mock_db.fontVariations = lambda **axes: None
+
+    path = _build_variable_font(tmp_path / "variable.ttf")
+    ds.set_measurement_backend(ds.FontToolsBackend({"Test Variable": str(path)}))
+
+    assert ds.outline_text("AA", "Test Variable", 10).width == pytest.approx(12)
+    ds.set_font_variation(wght=900)
+    assert ds.outline_text("AA", "Test Variable", 10).width == pytest.approx(16)
+    ds.set_font_variation(resetVariations=True)
+
+
+def test_flattened_curves_stay_within_tolerance(patched_design_system):
+    """Test that curve flattening keeps points on the true curve."""
+    ds = patched_design_system
+
+    # Quarter circle of radius 1000 as a cubic (kappa approximation)
+    kappa = 0.5523 * 1000
+    pen = ds._FlattenPen(0.5)
+    pen.moveTo((1000, 0))
+    pen.curveTo((1000, kappa), (kappa, 1000), (0, 1000))
+    pen.closePath()
+
+    points = list(zip(pen.points[::2], pen.points[1::2]))
+    assert len(points) > 10
+    assert list(pen.contour_ends) == [len(points)]
+    for x, y in points:
+        assert math.hypot(x, y) == pytest.approx(1000, abs=1.0)
+
+
+def test_outline_text_rejects_unresolved_font(patched_design_system, mock_db):
+    """Test a clear error when DrawBot has no font file for the name."""
+    ds = patched_design_system
+    mock_db.fontFilePath = lambda: None
+
+    with pytest.raises(ValueError, match="can't find a font file for 'Missing Font'"):
+        ds.outline_text("A", "Missing Font", 12)
+
+
+def test_outlined_text_builds_one_bezier_path(patched_design_system, mock_db, tmp_path):
+    """Test that all contours go into a single BezierPath."""
+    ds = patched_design_system
+
+    path = _build_test_font(tmp_path / "kerned.ttf")
+    ds.set_measurement_backend(ds.FontToolsBackend({"Test Sans": str(path)}))
+    mock_db.BezierPath = MagicMock
+    mock_db.drawPath = MagicMock()
+
+    outlined = ds.draw_outlined_text("AV", 0, 0, "Test Sans", 10)
+    bezier = mock_db.drawPath.call_args[0][0]
+
+    assert bezier.moveTo.call_count == 2
+    assert bezier.closePath.call_count == 2
+    assert bezier.lineTo.call_count == len(outlined.points) // 2 - 2
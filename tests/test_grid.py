@@ -0,0 +1,308 @@
+"""
+Tests for drawbot_grid.py
+
+Grid geometry is pure arithmetic, so grids are built from explicit
+(x, y, width, height) boxes and tested without DrawBot.
+"""
+
+import sys
+from pathlib import Path
+import pytest
+
+# Add lib to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+from drawbot_grid import BaselineGrid, FrozenGrid, Grid
+
+
+def _scan_index_below(grid, y):
+    """Reference implementation: walk the baselines from the top."""
+    for i, line in enumerate(grid):
+        if y >= line:
+            return i
+    return None
+
+
+def _scan_line_below(grid, y):
+    index = _scan_index_below(grid, y)
+    return None if index is None else grid[index]
+
+
+def _scan_line_above(grid, y):
+    for line in grid:
+        if y > line:
+            return line + grid.line_height
+    return None
+
+
+PROBES = [800, 756, 755.9, 742.8, 742.80001, 500, 100.3, 37, 36, 35, -10]
+
+
+# ==================== BASELINE GRID TESTS ====================
+
+def test_baseline_grid_lines_run_top_down():
+    """Test that index 0 is the top line and lines step by line_height."""
+    grid = BaselineGrid((50, 50, 500, 700), line_height=12)
+
+    assert grid[0] == 750
+    assert grid[1] == 738
+    assert len(grid) == 700 // 12 + 1
+    assert grid.bottom == grid[-1]
+
+
+def test_closest_line_below_matches_scan():
+    """Test the closed-form lookup against a linear scan, including exact hits."""
+    grid = BaselineGrid((36, 36, 540, 720), line_height=13.2)
+
+    for y in PROBES + list(grid):
+        assert grid.closest_line_below_coordinate(y) == _scan_line_below(grid, y), y
+
+
+def test_baseline_index_and_line_above_match_scan():
+    """Test the other closed-form queries against linear scans."""
+    grid = BaselineGrid((36, 36, 540, 720), line_height=13.2)
+
+    for y in PROBES + list(grid):
+        assert grid.baseline_index_from_coordinate(y) == _scan_index_below(grid, y), y
+        assert grid.closest_line_above_coordinate(y) == _scan_line_above(grid, y), y
+
+
+def test_baseline_geometry_follows_line_height():
+    """Test that cached geometry is recomputed when line_height changes."""
+    grid = BaselineGrid((0, 0, 100, 100), line_height=10)
+    assert len(grid) == 11
+
+    grid.line_height = 25
+    assert len(grid) == 5
+    assert grid[-1] == 0
+    assert grid.closest_line_below_coordinate(60) == 50
+
+
+def test_vectorized_baseline_queries():
+    """Test array queries against the scalar versions."""
+    np = pytest.importorskip("numpy")
+    grid = BaselineGrid((36, 36, 540, 720), line_height=13.2)
+
+    ys = np.array(PROBES + list(grid))
+    indices = grid.baseline_indices_from_coordinates(ys)
+    lines = grid.closest_lines_below_coordinates(ys)
+
+    for y, index, line in zip(ys.tolist(), indices.tolist(), lines.tolist()):
+        expected = grid.baseline_index_from_coordinate(y)
+        assert index == (-1 if expected is None else expected)
+        if expected is None:
+            assert np.isnan(line)
+        else:
+            assert line == grid[expected]
+
+
+# ==================== FROZEN GRID TESTS ====================
+
+GRID_ARGS = ((50, 40, 512, 712), 12, 8, 10, 12)
+
+
+def test_frozen_grid_matches_grid():
+    """Test positions and spans (incl. negative and out-of-range) against Grid."""
+    grid = Grid(*GRID_ARGS)
+    frozen = grid.freeze()
+
+    for col in range(-14, 15):
+        for row in range(-9, 10):
+            assert frozen[(col, row)] == grid[(col, row)]
+    for span in [0, 1, 2, 5.5, 12, 13, -1, -2.5]:
+        assert frozen * (span, span) == grid * (span, span)
+    assert frozen.column_width == grid.column_width
+    assert frozen.row_height == grid.row_height
+    assert list(frozen) == list(grid)
+    assert len(frozen) == len(grid)
+
+
+def test_frozen_grid_is_immutable_and_hashable():
+    """Test that frozen grids reject mutation and compare by geometry."""
+    frozen = FrozenGrid(*GRID_ARGS)
+
+    with pytest.raises(AttributeError):
+        frozen.width = 100
+    with pytest.raises(AttributeError):
+        frozen.extra = 1
+    assert frozen == Grid(*GRID_ARGS).freeze()
+    assert len({frozen, FrozenGrid(*GRID_ARGS)}) == 1
+    assert frozen.thaw()[(3, 2)] == frozen[(3, 2)]
+
+
+def test_frozen_grid_exposes_grid_attributes():
+    """Test that edges and column/row grids read the same as on Grid."""
+    grid = Grid(*GRID_ARGS)
+    frozen = grid.freeze()
+
+    for name in ('top', 'bottom', 'left', 'right', 'center', 'subdivision_dimension'):
+        assert getattr(frozen, name) == getattr(grid, name)
+    assert list(frozen.columns) == list(grid.columns)
+    assert list(frozen.rows) == list(grid.rows)
+    assert frozen.columns * 3 == grid.columns * 3
+    assert frozen.rows.row_height == grid.rows.row_height
+
+    frozen.columns.subdivisions = 2
+    assert frozen.column_subdivisions == 12
+    with pytest.raises(AttributeError):
+        frozen.top = 0
+
+
+def test_frozen_grid_cells():
+    """Test bulk rect lookups against scalar rects."""
+    np = pytest.importorskip("numpy")
+    frozen = FrozenGrid(*GRID_ARGS)
+
+    blocks = [(0, 0, 12, 1), (3, 2, 4, 2), (-1, -2, 1.5, 1), (11, 7, 1, 1)]
+    rects = frozen.cells(blocks)
+    assert rects.shape == (4, 4)
+    for block, rect in zip(blocks, rects.tolist()):
+        assert rect == pytest.approx(frozen.rect(*block))
+
+    single = frozen.cells(np.array([[2, 3]]))
+    assert single.tolist() == [list(frozen.rect(2, 3))]
+
+    with pytest.raises(ValueError):
+        frozen.cells([(1, 2, 3)])
+
+
+# ==================== GRID AREA TESTS ====================
+
+def test_grid_area_resolves_through_parent():
+    """Test that area indexes map onto the parent's cells and edges."""
+    grid = Grid(*GRID_ARGS)
+    body = grid.area(4, 1, 8, 6)
+
+    assert body[(0, 0)] == grid[(4, 1)]
+    assert body[(3, 5)] == grid[(7, 6)]
+    assert body * (2, 3) == grid * (2, 3)
+    assert body.possize == (*grid[(4, 1)], *grid * (8, 6))
+    assert len(body) == 48
+
+    # Negative indexes count from the area's far edges, like Grid
+    assert body[(-1, -1)] == pytest.approx((body.x + body.width, body.y + body.height))
+    whole = grid.area(0, 0, 12, 8)
+    for index in [(-1, -1), (-3, -2)]:
+        assert whole[index] == pytest.approx(grid[index])
+
+
+def test_nested_areas_share_parent():
+    """Test that nested areas resolve against the root grid, not a copy."""
+    grid = FrozenGrid(*GRID_ARGS)
+    inner = grid.area(4, 0, 8, 8).area(2, 2, 3, 2)
+
+    assert inner.parent is grid
+    assert inner == grid.area(6, 2, 3, 2)
+    assert inner.rect(1, 1, 2, 1) == grid.rect(7, 3, 2, 1)
+
+    with pytest.raises(ValueError):
+        grid.area(0, 0, 0, 1)
+
+
+def test_subgrid_divides_area():
+    """Test a 3-column grid inside columns 4-11."""
+    grid = FrozenGrid(*GRID_ARGS)
+    body = grid.area(4, 0, 8, 8)
+    inner = body.subgrid(column_subdivisions=3)
+
+    assert inner.possize == body.possize
+    assert inner.column_subdivisions == 3
+    assert inner.row_subdivisions == 8
+    assert inner.column_gutter == grid.column_gutter
+    assert inner[(0, 0)] == body[(0, 0)]
+    assert inner[(2, 0)][0] + inner.column_width == pytest.approx(body.x + body.width)
+    assert body.subgrid(column_subdivisions=3) is inner  # Shared per configuration
+
+
+def test_grid_area_cells():
+    """Test bulk rects offset into the parent grid."""
+    pytest.importorskip("numpy")
+    grid = FrozenGrid(*GRID_ARGS)
+    body = grid.area(4, 2, 8, 6)
+
+    rects = body.cells([(0, 0, 2, 1), (7, 5, 1, 1)])
+    assert rects.tolist() == [list(grid.rect(4, 2, 2, 1)), list(grid.rect(11, 7, 1, 1))]
+
+
+def test_grid_area_cells_negative_indexes():
+    """Test that negative indexes count from the area's far edge, as in rect()."""
+    pytest.importorskip("numpy")
+    body = FrozenGrid(*GRID_ARGS).area(2, 1, 6, 4)
+
+    blocks = [(-1, -1, 1, 1), (-3, 2, 2, 1), (1, -4, 1, 2), (0, 0, -1, -1)]
+    rects = body.cells(blocks)
+    for block, rect in zip(blocks, rects.tolist()):
+        assert rect == pytest.approx(body.rect(*block))
+    assert rects[0, 0] == pytest.approx(body.x + body.width)
+
+
+# ==================== DEBUG OVERLAY TESTS ====================
+
+class RecordingPath:
+    """Stand-in for db.BezierPath that records the shapes added to it."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append(name)
+
+
+class RecordingDrawBot:
+    """Records drawing calls made by grid overlays."""
+
+    def __init__(self):
+        self.calls = []
+        self.paths_built = 0
+
+    def BezierPath(self):
+        self.paths_built += 1
+        return RecordingPath()
+
+    def savedState(self):
+        from contextlib import nullcontext
+        return nullcontext()
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append((name, args))
+
+
+@pytest.fixture
+def recording_db(monkeypatch):
+    import drawbot_grid
+    recorder = RecordingDrawBot()
+    monkeypatch.setattr(drawbot_grid, "db", recorder)
+    drawbot_grid.clear_overlay_cache()
+    yield recorder
+    drawbot_grid.clear_overlay_cache()
+
+
+def test_grid_overlay_is_one_cached_path(recording_db):
+    """Test that a 24x24 overlay is one drawPath per layer and built once."""
+    grid = Grid((0, 0, 600, 600), 24, 24)
+
+    grid.draw(show_index=True)
+    draws = [args[0] for name, args in recording_db.calls if name == "drawPath"]
+    assert len(draws) == 2
+    assert draws[0].calls.count("rect") == 48
+    assert draws[1].calls.count("text") == 48
+    assert not any(name in ("rect", "text") for name, _ in recording_db.calls)
+
+    # Re-render (new Grid object, same geometry) reuses both paths
+    Grid((0, 0, 600, 600), 24, 24).draw(show_index=True)
+    FrozenGrid((0, 0, 600, 600), 24, 24).draw(show_index=True)
+    assert recording_db.paths_built == 2
+
+
+def test_grid_overlay_rebuilt_when_geometry_changes(recording_db):
+    """Test that changed geometry gets its own overlay."""
+    baselines = BaselineGrid((0, 0, 100, 100), line_height=10)
+    baselines.draw()
+    baselines.draw()
+    assert recording_db.paths_built == 1
+
+    baselines.line_height = 20
+    baselines.draw()
+    assert recording_db.paths_built == 2
+    path = [args[0] for name, args in recording_db.calls if name == "drawPath"][-1]
+    assert path.calls.count("line") == 6